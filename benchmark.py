@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Performance Benchmarks for the Banking BI Analysis
+Times data loading, feature engineering, aggregation, model training, every figure, the
+executive report and dashboard data prep at 1x/10x/100x data scale, records
+wall time and peak memory to JSON and flags regressions against a baseline
+"""
+
+import argparse
+import os
+import sys
+sys.path.append('scripts')
+
+import matplotlib
+matplotlib.use('Agg')
+
+from benchmarks import (BASELINE_PATH, DEFAULT_SCALES, REGRESSION_TOLERANCE, RESULTS_PATH, STAGES,
+                        compare, format_comparison, load_results, run_benchmarks, save_results)
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark the banking BI analysis stages")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help="data scale factors to run (default: 1 10 100)")
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), metavar='STAGE',
+                        help=f"stages to run (default: all of {', '.join(STAGES)})")
+    parser.add_argument('--repeat', type=int, default=1, help="runs per stage; the fastest is kept")
+    parser.add_argument('--output', default=RESULTS_PATH, help="where to write the results JSON")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline results to compare against")
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE,
+                        help="allowed slowdown before a stage counts as a regression (0.25 = 25%%)")
+    parser.add_argument('--save-baseline', action='store_true', help="also store these results as the baseline")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="exit with status 1 when any stage regressed")
+    return parser.parse_args()
+
+
+def main():
+    """Run the benchmarks and compare them with the baseline"""
+    args = parse_args()
+    print("🚀 Banking BI benchmarks")
+    print("=" * 50)
+    try:
+        results = run_benchmarks(scales=args.scales, stages=args.stages, repeat=args.repeat)
+    except Exception as e:
+        print(f"❌ Benchmark failed: {e}")
+        return 1
+
+    print(f"\n💾 Results saved to {save_results(results, args.output)}")
+
+    regressed = False
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        rows = compare(results, load_results(args.baseline), tolerance=args.tolerance)
+        print(f"\n📊 Compared with {args.baseline}:")
+        print(format_comparison(rows))
+        regressed = any(row['status'] == 'regression' for row in rows)
+    elif not args.save_baseline:
+        print(f"ℹ️  No baseline at {args.baseline}; run with --save-baseline to create one")
+
+    if args.save_baseline:
+        print(f"📌 Baseline saved to {save_results(results, args.baseline)}")
+
+    return 1 if regressed and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
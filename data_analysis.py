@@ -1,12 +1,16 @@
+import sys
 import pandas as pd
 import numpy as np
+sys.path.append('scripts')
+from data_loader import load_bank_marketing, load_credit_default, memory_usage_mb
 
 # Load both datasets
 print("=== BANK MARKETING DATASET ===")
 try:
     # Use the actual data file
-    bank_data = pd.read_csv('data/Bank_dataset.csv')
+    bank_data = load_bank_marketing()
     print(f"Shape: {bank_data.shape}")
+    print(f"Memory usage: {memory_usage_mb(bank_data):.2f} MB")
     print(f"Columns: {list(bank_data.columns)}")
     print(f"Data types:\n{bank_data.dtypes}")
     print(f"Missing values: {bank_data.isnull().sum().sum()}")
@@ -27,8 +31,9 @@ except Exception as e:
 print("\n" + "="*50)
 print("=== CREDIT DEFAULT DATASET ===")
 try:
-    credit_data = pd.read_csv('data/credit_default_clean.csv')
+    credit_data = load_credit_default()
     print(f"Shape: {credit_data.shape}")
+    print(f"Memory usage: {memory_usage_mb(credit_data):.2f} MB")
     print(f"Columns: {list(credit_data.columns)}")
     print(f"Data types:\n{credit_data.dtypes}")
     print(f"Missing values: {credit_data.isnull().sum().sum()}")
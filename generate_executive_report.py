@@ -4,29 +4,73 @@ Generate Executive Summary Report for Banking BI Analysis
 Uses the report utilities to create comprehensive business intelligence summary
 """
 
+import argparse
 import sys
 import os
 sys.path.append('scripts')
 
+from profiling import add_profile_arguments, cli_profiler
+from report_metrics import SNAPSHOT_PATH
+from rendering import add_render_arguments, cli_render_profile, figure_path
 from report_utils import BankingReportGenerator
+from streaming_metrics import DEFAULT_CHUNKSIZE
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Generate the banking executive report")
+    parser.add_argument('--stream', action='store_true',
+                        help="compute metrics from bounded CSV chunks (for extracts larger than RAM)")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help="rows per chunk in streaming mode")
+    parser.add_argument('--mmap', action='store_true',
+                        help="open the datasets memory-mapped, sharing one copy with other processes")
+    parser.add_argument('--from-snapshot', nargs='?', const=SNAPSHOT_PATH, metavar='PATH',
+                        help=f"build the report from a metrics snapshot instead of the raw data "
+                             f"(default: {SNAPSHOT_PATH}, written by run_epic_analysis.py)")
+    parser.add_argument('--allow-stale', action='store_true',
+                        help="with --from-snapshot, use the snapshot even if the data files changed since")
+    parser.add_argument('--variants-by', nargs='+', metavar='COLUMN',
+                        help="also write one report and dashboard per value of each data column "
+                             "(e.g. month job age_group), from one grouped pass per column")
+    parser.add_argument('--markdown-only', action='store_true',
+                        help="with --variants-by, skip the per-variant dashboards")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="worker processes rendering the variants (0 = one per CPU)")
+    add_profile_arguments(parser)
+    add_render_arguments(parser)
+    return parser.parse_args()
 
 def main():
     """Generate the complete executive summary report"""
+    args = parse_args()
     print("BANKING ENTERPRISE INTELLIGENCE: EXECUTIVE REPORT GENERATOR")
     print("="*70)
     
     try:
         # Initialize report generator
-        generator = BankingReportGenerator(output_dir='report')
+        profiler = cli_profiler(args.profile, args.cprofile)
+        render = cli_render_profile(args)
+        generator = BankingReportGenerator(output_dir='report', streaming=args.stream,
+                                           chunksize=args.chunksize, profiler=profiler,
+                                           snapshot_path=args.from_snapshot, render=render, mmap=args.mmap,
+                                           allow_stale=args.allow_stale)
         
         # Generate complete report
         success = generator.generate_complete_report()
+        if success and args.variants_by:
+            success = bool(generator.generate_report_variants(args.variants_by, jobs=args.jobs or os.cpu_count(),
+                                                              dashboards=not args.markdown_only,
+                                                              data=generator.data))
+        if profiler.enabled:
+            profiler.report(args.profile, prefix='executive_report')
         
         if success:
             print("\nEXECUTIVE REPORT GENERATED SUCCESSFULLY!")
             print("\nGenerated Files:")
             print("   - report/executive_summary_report.md")
-            print("   - report/executive_dashboard.png")
+            print(f"   - {figure_path('report/executive_dashboard.png', render)}")
+            if args.variants_by:
+                print(f"   - report/variants/ (one report per {', '.join(args.variants_by)})")
             print("\nReport Contents:")
             print("   - Executive Summary with Key KPIs")
             print("   - Strategic Recommendations")
@@ -21,6 +21,14 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import os
+import sys
+sys.path.append('scripts')
+
+from dashboard_data import (
+    SortedIndex, age_bin_edges, cube_metrics, load_cubes, overall_rate, risk_grid, rollup, with_age_groups,
+    with_util_groups,
+)
+from report_templates import change, money, render_block, report_context
 
 # Set page configuration
 st.set_page_config(
@@ -163,33 +171,51 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Load data function
-@st.cache_data
-def load_data():
-    """Load and prepare data for analysis"""
+# Aggregate cubes, built once per server process and shared read-only by all sessions
+@st.cache_resource
+def load_dashboard_cubes():
+    """Pre-aggregate both datasets into the cubes every section slices"""
     try:
-        # Load marketing data
-        marketing_df = pd.read_csv('data/Bank_dataset.csv')
-        
-        # Load credit data
-        credit_df = pd.read_csv('data/credit_default_clean.csv')
-        
-        # Process marketing data
-        marketing_df['conversion_rate'] = marketing_df['y'].apply(lambda x: 1 if x == 'yes' else 0)
-        
-        # Process credit data
-        credit_df['default_rate'] = credit_df['default payment next month']
-        
-        # Calculate credit utilization (similar to report_utils.py)
-        bill_cols = ['BILL_AMT1', 'BILL_AMT2', 'BILL_AMT3', 'BILL_AMT4', 'BILL_AMT5', 'BILL_AMT6']
-        credit_df['avg_bill'] = credit_df[bill_cols].mean(axis=1)
-        credit_df['utilization'] = credit_df['avg_bill'] / credit_df['LIMIT_BAL']
-        
-        return marketing_df, credit_df
+        return load_cubes()
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None, None
 
+# Narrative text bound to the cube metrics (templates/dashboard_blocks.html.j2)
+@st.cache_data
+def dashboard_context():
+    """Template variables rolled up from the cubes"""
+    marketing_cube, credit_cube = load_dashboard_cubes()
+    return report_context(cube_metrics(marketing_cube, credit_cube))
+
+def dashboard_block(name):
+    """One HTML block of the dashboard template, rendered with the current metrics"""
+    return render_block('dashboard_blocks.html.j2', name, dashboard_context())
+
+# Insight explorer lookups: presorted indexes built once, filtered results
+# memoized per filter value with a bounded number of entries
+@st.cache_resource
+def load_job_index():
+    """Marketing cube presorted by job"""
+    marketing_cube, _ = load_dashboard_cubes()
+    return SortedIndex(marketing_cube, 'job')
+
+@st.cache_resource
+def load_age_index():
+    """Credit cube presorted by age"""
+    _, credit_cube = load_dashboard_cubes()
+    return SortedIndex(credit_cube, 'AGE')
+
+@st.cache_data(max_entries=64)
+def segment_conversion(jobs):
+    """Conversion rate by job and marital status for a job selection"""
+    return rollup(load_job_index().isin(jobs), ['job', 'marital'], 'conversions', name='conversion_rate')
+
+@st.cache_data(max_entries=32)
+def risk_grid_for_ages(age_min, age_max):
+    """Age x utilization default-rate grid for customers aged age_min to age_max"""
+    return risk_grid(load_age_index().range(age_min, age_max), age_bin_edges(age_min, age_max))
+
 # Main dashboard
 st.markdown('<div class="main-header">🏦 Banking Enterprise Intelligence Dashboard</div>', unsafe_allow_html=True)
 st.markdown("<div style='text-align: center; font-size: 1.2rem; color: #666; margin-bottom: 2rem;'>BIT 2119: Business Intelligence & Decision Support Systems</div>", unsafe_allow_html=True)
@@ -203,9 +229,9 @@ epic_section = st.sidebar.radio(
 )
 
 # Load data
-marketing_df, credit_df = load_data()
+marketing_cube, credit_cube = load_dashboard_cubes()
 
-if marketing_df is not None and credit_df is not None:
+if marketing_cube is not None and credit_cube is not None:
     
     # EPIC Section: EXPLAIN
     if epic_section == "🎯 Explain":
@@ -215,17 +241,17 @@ if marketing_df is not None and credit_df is not None:
         
         with col1:
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("Marketing Records", f"{len(marketing_df):,}")
+            st.metric("Marketing Records", f"{marketing_cube['customers'].sum():,}")
             st.markdown("</div>", unsafe_allow_html=True)
             
         with col2:
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("Credit Records", f"{len(credit_df):,}")
+            st.metric("Credit Records", f"{credit_cube['customers'].sum():,}")
             st.markdown("</div>", unsafe_allow_html=True)
             
         with col3:
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("Overall Conversion Rate", f"{marketing_df['conversion_rate'].mean():.1%}")
+            st.metric("Overall Conversion Rate", f"{overall_rate(marketing_cube, 'conversions'):.1%}")
             st.markdown("</div>", unsafe_allow_html=True)
         
         st.markdown("""
@@ -246,7 +272,7 @@ if marketing_df is not None and credit_df is not None:
         with col1:
             # Marketing data overview
             fig_marketing = px.pie(
-                marketing_df.groupby('job', observed=True)['conversion_rate'].mean().reset_index(),
+                rollup(marketing_cube, ['job'], 'conversions', name='conversion_rate'),
                 values='conversion_rate',
                 names='job',
                 title='Conversion Rate by Customer Job Type',
@@ -257,12 +283,8 @@ if marketing_df is not None and credit_df is not None:
             
         with col2:
             # Credit data overview
-            age_groups = pd.cut(credit_df['AGE'], bins=[0, 30, 40, 50, 60, 100], 
-                              labels=['<30', '30-40', '40-50', '50-60', '60+'])
-            credit_df['age_group'] = age_groups
-            
             fig_credit = px.bar(
-                credit_df.groupby('age_group', observed=True)['default_rate'].mean().reset_index(),
+                rollup(with_age_groups(credit_cube), ['age_group'], 'defaults', name='default_rate'),
                 x='age_group',
                 y='default_rate',
                 title='Default Rate by Age Group',
@@ -279,31 +301,11 @@ if marketing_df is not None and credit_df is not None:
         
         with col1:
             st.markdown('<div class="problem-box">', unsafe_allow_html=True)
-            st.markdown("""
-            <h4>📈 Marketing Efficiency Gap</h4>
-            <ul>
-            <li>88.5% of campaign contacts don't convert</li>
-            <li>Limited targeting effectiveness</li>
-            <li>Resource allocation challenges</li>
-            <li>Seasonal performance variations</li>
-            </ul>
-            <p><strong>Impact:</strong> Suboptimal ROI on marketing investments</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(dashboard_block('marketing_problem'), unsafe_allow_html=True)
             
         with col2:
             st.markdown('<div class="problem-box">', unsafe_allow_html=True)
-            st.markdown("""
-            <h4>💳 Credit Risk Exposure</h4>
-            <ul>
-            <li>22.1% overall default rate</li>
-            <li>Age-based risk stratification needed</li>
-            <li>Utilization vs default correlation</li>
-            <li>Predictive scoring gaps</li>
-            </ul>
-            <p><strong>Impact:</strong> Significant financial loss exposure</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(dashboard_block('credit_problem'), unsafe_allow_html=True)
         
         # Problem visualization
         st.subheader("📊 Problem Analysis")
@@ -312,7 +314,7 @@ if marketing_df is not None and credit_df is not None:
         
         with tab1:
             # Marketing conversion funnel
-            conversion_data = marketing_df.groupby('contact', observed=True)['conversion_rate'].agg(['mean', 'count']).reset_index()
+            conversion_data = rollup(marketing_cube, ['contact'], 'conversions', name='mean')
             conversion_data = conversion_data.sort_values('mean', ascending=False)
             
             fig_funnel = go.Figure()
@@ -334,9 +336,7 @@ if marketing_df is not None and credit_df is not None:
             
         with tab2:
             # Risk by utilization
-            credit_df['util_group'] = pd.cut(credit_df['utilization'], bins=[0, 0.3, 0.6, 0.8, 1.0], 
-                                           labels=['Low (<30%)', 'Medium (30-60%)', 'High (60-80%)', 'Very High (>80%)'])
-            risk_data = credit_df.groupby('util_group', observed=True)['default_rate'].mean().reset_index()
+            risk_data = rollup(with_util_groups(credit_cube), ['util_group'], 'defaults', name='default_rate')
             
             fig_risk = px.line(
                 risk_data,
@@ -360,33 +360,15 @@ if marketing_df is not None and credit_df is not None:
         
         with col1:
             st.markdown('<div class="insight-box">', unsafe_allow_html=True)
-            st.markdown("""
-            <h4>🎯 Target Segment Discovery</h4>
-            <p><strong>Retired customers show 23.5% conversion</strong></p>
-            <p>vs 11.5% average rate</p>
-            <p><em>2x higher effectiveness</em></p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(dashboard_block('segment_insight'), unsafe_allow_html=True)
             
         with col2:
             st.markdown('<div class="insight-box">', unsafe_allow_html=True)
-            st.markdown("""
-            <h4>📱 Optimal Contact Method</h4>
-            <p><strong>Cellular contact: 14.4% conversion</strong></p>
-            <p>vs 8.9% telephone</p>
-            <p><em>62% improvement</em></p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(dashboard_block('contact_insight'), unsafe_allow_html=True)
             
         with col3:
             st.markdown('<div class="insight-box">', unsafe_allow_html=True)
-            st.markdown("""
-            <h4>📅 Seasonal Opportunity</h4>
-            <p><strong>October campaigns: 46.2% conversion</strong></p>
-            <p>vs 11.5% average</p>
-            <p><em>4x performance boost</em></p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(dashboard_block('seasonal_insight'), unsafe_allow_html=True)
         
         # Interactive insights dashboard
         st.subheader("🔍 Interactive Insights Explorer")
@@ -401,23 +383,21 @@ if marketing_df is not None and credit_df is not None:
             if insight_type == "Marketing Segmentation":
                 segment_filter = st.multiselect(
                     "Filter by Job Type:",
-                    marketing_df['job'].unique(),
-                    default=marketing_df['job'].unique()[:3]
+                    marketing_cube['job'].unique(),
+                    default=marketing_cube['job'].unique()[:3]
                 )
             elif insight_type == "Risk Analysis":
                 age_filter = st.slider(
                     "Age Range:",
-                    int(credit_df['AGE'].min()),
-                    int(credit_df['AGE'].max()),
+                    int(credit_cube['AGE'].min()),
+                    int(credit_cube['AGE'].max()),
                     (25, 65)
                 )
         
         # Display insights based on selection
         if insight_type == "Marketing Segmentation":
-            filtered_data = marketing_df[marketing_df['job'].isin(segment_filter)]
-            
             fig_segment = px.sunburst(
-                filtered_data.groupby(['job', 'marital'], observed=True)['conversion_rate'].mean().reset_index(),
+                segment_conversion(tuple(sorted(segment_filter))),
                 path=['job', 'marital'],
                 values='conversion_rate',
                 title=f'Conversion Rate by Job Type and Marital Status'
@@ -425,22 +405,27 @@ if marketing_df is not None and credit_df is not None:
             st.plotly_chart(fig_segment, width='stretch')
             
         elif insight_type == "Risk Analysis":
-            filtered_credit = credit_df[
-                (credit_df['AGE'] >= age_filter[0]) & 
-                (credit_df['AGE'] <= age_filter[1])
-            ]
+            # Binned on the server: only the grid cells are sent to the browser
+            rate_grid, customer_grid = risk_grid_for_ages(*age_filter)
             
-            fig_risk_heatmap = px.density_heatmap(
-                filtered_credit,
-                x='age',
-                y='utilization',
-                z='default_rate',
-                title=f'Risk Heatmap: Age vs Credit Utilization (Age {age_filter[0]}-{age_filter[1]})'
+            fig_risk_heatmap = go.Figure(go.Heatmap(
+                z=rate_grid.values,
+                x=rate_grid.columns,
+                y=rate_grid.index,
+                customdata=customer_grid.values,
+                colorscale='Reds',
+                colorbar=dict(title='Default Rate', tickformat='.0%'),
+                hovertemplate='Age %{x}<br>Utilization %{y}<br>Default rate %{z:.1%}<br>Customers %{customdata:,}<extra></extra>'
+            ))
+            fig_risk_heatmap.update_layout(
+                title=f'Risk Heatmap: Age vs Credit Utilization (Age {age_filter[0]}-{age_filter[1]})',
+                xaxis_title='Age',
+                yaxis_title='Credit Utilization'
             )
             st.plotly_chart(fig_risk_heatmap, width='stretch')
             
         elif insight_type == "Seasonal Patterns":
-            monthly_data = marketing_df.groupby('month', observed=True)['conversion_rate'].mean().reset_index()
+            monthly_data = rollup(marketing_cube, ['month'], 'conversions', name='conversion_rate')
             month_order = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
             monthly_data['month_num'] = monthly_data['month'].apply(lambda x: month_order.index(x))
             monthly_data = monthly_data.sort_values('month_num')
@@ -457,8 +442,9 @@ if marketing_df is not None and credit_df is not None:
                 yaxis_title='Conversion Rate',
                 showlegend=False
             )
+            peak = monthly_data.loc[monthly_data['conversion_rate'].idxmax()]
             fig_seasonal.add_annotation(
-                x='oct', y=monthly_data[monthly_data['month']=='oct']['conversion_rate'].iloc[0],
+                x=peak['month'], y=peak['conversion_rate'],
                 text="Peak Performance",
                 showarrow=True, arrowhead=2
             )
@@ -471,29 +457,33 @@ if marketing_df is not None and credit_df is not None:
         # Financial impact summary
         st.subheader("💰 Projected Financial Impact")
         
+        context = dashboard_context()
+        plan = context['plan']
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.markdown('<div class="recommendation-box">', unsafe_allow_html=True)
-            st.metric("Revenue Increase", "$2.3M", "+12%")
+            segment_lift = context['segment_conversion_lift']
+            st.metric("Revenue Increase", money(plan['revenue_gain']),
+                      change(segment_lift) if segment_lift is not None else None)
             st.markdown("Marketing efficiency gains", unsafe_allow_html=True)
             st.markdown("</div>", unsafe_allow_html=True)
             
         with col2:
             st.markdown('<div class="recommendation-box">', unsafe_allow_html=True)
-            st.metric("Loss Prevention", "$1.8M", "-15%")
+            st.metric("Loss Prevention", money(plan['loss_prevention']), change(-plan['default_rate_cut']))
             st.markdown("Risk reduction benefits", unsafe_allow_html=True)
             st.markdown("</div>", unsafe_allow_html=True)
             
         with col3:
             st.markdown('<div class="recommendation-box">', unsafe_allow_html=True)
-            st.metric("Cost Savings", "$0.9M", "-8%")
+            st.metric("Cost Savings", money(plan['cost_savings']), change(-plan['acquisition_cost_cut']))
             st.markdown("Operational optimization", unsafe_allow_html=True)
             st.markdown("</div>", unsafe_allow_html=True)
             
         with col4:
             st.markdown('<div class="recommendation-box">', unsafe_allow_html=True)
-            st.metric("Total Impact", "$5.0M", "+18%")
+            st.metric("Total Impact", money(context['annual_impact']), change(plan['risk_adjusted_return_target']))
             st.markdown("Annual projected benefit", unsafe_allow_html=True)
             st.markdown("</div>", unsafe_allow_html=True)
         
@@ -503,25 +493,7 @@ if marketing_df is not None and credit_df is not None:
         tab1, tab2, tab3 = st.tabs(["Immediate (0-30 days)", "Short-term (1-3 months)", "Long-term (3-12 months)"])
         
         with tab1:
-            st.markdown("""
-            <div class="recommendation-box">
-            <h4>🚀 Immediate Actions</h4>
-            <ol>
-            <li><strong>Focus campaigns on retired customer segments</strong>
-                <ul><li>Allocate 40% of budget to high-conversion segment</li>
-                <li>Expected impact: +15% overall conversion rate</li></ul>
-            </li>
-            <li><strong>Implement cellular-first contact strategy</strong>
-                <ul><li>Prioritize cellular over telephone contact</li>
-                <li>Expected impact: +28% campaign effectiveness</li></ul>
-            </li>
-            <li><strong>Enhance credit screening for customers under 30</strong>
-                <ul><li>Implement stricter criteria for young demographics</li>
-                <li>Expected impact: -10% default rate in this segment</li></ul>
-            </li>
-            </ol>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(dashboard_block('immediate_actions'), unsafe_allow_html=True)
             
         with tab2:
             st.markdown("""
@@ -2,299 +2,217 @@
 """
 Execute the Banking BI EPIC Analysis notebook cells programmatically
 This script runs the analysis and generates all visualizations without requiring Jupyter
+
+The analysis is a pipeline of named stages (scripts/pipeline.py). Each stage is
+cached by the hash of its data, parameters and code, so a rerun only redoes the
+stages whose inputs changed.
 """
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, confusion_matrix
+import argparse
 import warnings
 import os
+import sys
+sys.path.append('scripts')
+
+import matplotlib
+matplotlib.use('Agg')  # figures are only saved to disk, also in worker processes
+
+from data_loader import BANK_MARKETING_PATH, CREDIT_DEFAULT_PATH, load_bank_marketing, load_credit_default
+from features import add_credit_features
+from modeling import CREDIT_MODEL_PATH, MARKETING_MODEL_PATH, train_credit_model, train_marketing_model
+from pipeline import DEFAULT_CACHE_DIR, Pipeline
+from profiling import add_profile_arguments, cli_profiler
+from report_metrics import SNAPSHOT_PATH, write_report_metrics
+from rendering import add_render_arguments, cli_render_profile, figure_path
+import epic_figures as figures
 warnings.filterwarnings('ignore')
 
-# Create visuals directory if it doesn't exist
-os.makedirs('visuals', exist_ok=True)
+VISUALS_DIR = 'visuals'
 
-# Set visualization style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+FIGURE_STAGES = [
+    'marketing_demographics_figure',
+    'campaign_performance_figure',
+    'credit_risk_figure',
+    'financial_behavior_figure',
+    'comprehensive_dashboard_figure',
+    'marketing_importance_figure',
+    'credit_importance_figure',
+]
 
-print("🚀 Starting Banking BI EPIC Analysis...")
-print("="*60)
 
-# Load both datasets
-print("📊 Loading Banking Datasets...")
-try:
-    # Bank Marketing Dataset
-    bank_marketing = pd.read_csv('data/Bank_dataset.csv')
+def load_marketing(path, mmap=False):
+    """Load the bank marketing dataset"""
+    bank_marketing = load_bank_marketing(path, mmap=mmap)
     print(f"✅ Bank Marketing Dataset: {bank_marketing.shape}")
-    
-    # Credit Default Dataset  
-    credit_default = pd.read_csv('data/credit_default_clean.csv')
+    return bank_marketing
+
+
+def load_credit(path, mmap=False):
+    """Load the credit default dataset"""
+    credit_default = load_credit_default(path, mmap=mmap)
     print(f"✅ Credit Default Dataset: {credit_default.shape}")
-    
-except Exception as e:
-    print(f"❌ Error loading datasets: {e}")
-    exit(1)
-
-print("\n" + "="*60)
-print("📈 GENERATING VISUALIZATIONS...")
-print("="*60)
-
-# 1. Marketing Demographics Analysis
-print("1️⃣ Creating Marketing Demographics Analysis...")
-fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-
-# Age distribution by subscription
-sns.histplot(data=bank_marketing, x='age', hue='y', bins=20, ax=axes[0,0])
-axes[0,0].set_title('Age Distribution by Subscription Status')
-
-# Job type vs subscription rate
-job_subscription = bank_marketing.groupby('job')['y'].apply(lambda x: (x == 'yes').mean()).sort_values(ascending=False)
-job_subscription.plot(kind='bar', ax=axes[0,1])
-axes[0,1].set_title('Subscription Rate by Job Type')
-axes[0,1].tick_params(axis='x', rotation=45)
-
-# Education level vs subscription
-education_subscription = bank_marketing.groupby('education')['y'].apply(lambda x: (x == 'yes').mean())
-education_subscription.plot(kind='bar', ax=axes[1,0])
-axes[1,0].set_title('Subscription Rate by Education Level')
-
-# Contact method effectiveness
-contact_subscription = bank_marketing.groupby('contact')['y'].apply(lambda x: (x == 'yes').mean())
-contact_subscription.plot(kind='bar', ax=axes[1,1])
-axes[1,1].set_title('Subscription Rate by Contact Method')
-
-plt.tight_layout()
-plt.savefig('visuals/marketing_demographics_analysis.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ Marketing demographics analysis saved")
-
-# 2. Campaign Performance Analysis
-print("2️⃣ Creating Campaign Performance Analysis...")
-fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-
-# Duration vs subscription (call duration effectiveness)
-sns.boxplot(data=bank_marketing, x='y', y='duration', ax=axes[0,0])
-axes[0,0].set_title('Call Duration vs Subscription Success')
-
-# Month-wise subscription rates
-month_subscription = bank_marketing.groupby('month')['y'].apply(lambda x: (x == 'yes').mean())
-month_subscription.plot(kind='bar', ax=axes[0,1])
-axes[0,1].set_title('Subscription Rate by Month')
-axes[0,1].tick_params(axis='x', rotation=45)
-
-# Campaign contacts vs subscription
-sns.boxplot(data=bank_marketing, x='y', y='campaign', ax=axes[1,0])
-axes[1,0].set_title('Number of Campaigns vs Subscription')
-
-# Previous outcome impact
-prev_outcome_subscription = bank_marketing.groupby('poutcome')['y'].apply(lambda x: (x == 'yes').mean())
-prev_outcome_subscription.plot(kind='bar', ax=axes[1,1])
-axes[1,1].set_title('Subscription Rate by Previous Outcome')
-axes[1,1].tick_params(axis='x', rotation=45)
-
-plt.tight_layout()
-plt.savefig('visuals/campaign_performance_analysis.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ Campaign performance analysis saved")
-
-# 3. Credit Risk Demographics
-print("3️⃣ Creating Credit Risk Demographics...")
-fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-
-# Age vs default rate
-credit_default['age_group'] = pd.cut(credit_default['AGE'], bins=[0, 30, 40, 50, 60, 100], labels=['<30', '30-40', '40-50', '50-60', '60+'])
-age_default = credit_default.groupby('age_group')['default payment next month'].mean()
-age_default.plot(kind='bar', ax=axes[0,0])
-axes[0,0].set_title('Default Rate by Age Group')
-axes[0,0].set_ylabel('Default Rate')
-
-# Credit limit vs default
-credit_default['limit_group'] = pd.cut(credit_default['LIMIT_BAL'], bins=5, labels=['Very Low', 'Low', 'Medium', 'High', 'Very High'])
-limit_default = credit_default.groupby('limit_group')['default payment next month'].mean()
-limit_default.plot(kind='bar', ax=axes[0,1])
-axes[0,1].set_title('Default Rate by Credit Limit')
-axes[0,1].set_ylabel('Default Rate')
-
-# Payment status analysis (PAY_0 = recent payment status)
-payment_default = credit_default.groupby('PAY_0')['default payment next month'].mean()
-payment_default.plot(kind='bar', ax=axes[1,0])
-axes[1,0].set_title('Default Rate by Recent Payment Status')
-axes[1,0].set_ylabel('Default Rate')
-
-# Bill amount vs payment amount ratio
-credit_default['bill_pay_ratio'] = credit_default['BILL_AMT1'] / (credit_default['PAY_AMT1'] + 1)
-credit_default['ratio_group'] = pd.cut(credit_default['bill_pay_ratio'], bins=5, labels=['Very Low', 'Low', 'Medium', 'High', 'Very High'])
-ratio_default = credit_default.groupby('ratio_group')['default payment next month'].mean()
-ratio_default.plot(kind='bar', ax=axes[1,1])
-axes[1,1].set_title('Default Rate by Bill/Payment Ratio')
-axes[1,1].set_ylabel('Default Rate')
-
-plt.tight_layout()
-plt.savefig('visuals/credit_risk_analysis.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ Credit risk demographics saved")
-
-# Calculate credit utilization before using it in visualizations
-bill_cols = ['BILL_AMT1', 'BILL_AMT2', 'BILL_AMT3', 'BILL_AMT4', 'BILL_AMT5', 'BILL_AMT6']
-credit_default['avg_bill'] = credit_default[bill_cols].mean(axis=1)
-credit_default['credit_utilization'] = credit_default['avg_bill'] / credit_default['LIMIT_BAL']
-
-# 4. Financial Behavior Patterns
-print("4️⃣ Creating Financial Behavior Patterns...")
-fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-
-# Bill amounts trend over 6 months
-default_bills = credit_default[credit_default['default payment next month'] == 1][bill_cols].mean()
-no_default_bills = credit_default[credit_default['default payment next month'] == 0][bill_cols].mean()
-
-months = ['Month 1', 'Month 2', 'Month 3', 'Month 4', 'Month 5', 'Month 6']
-axes[0,0].plot(months, default_bills, marker='o', label='Default Customers', linewidth=2)
-axes[0,0].plot(months, no_default_bills, marker='s', label='Non-Default Customers', linewidth=2)
-axes[0,0].set_title('Average Bill Amounts Over Time')
-axes[0,0].set_ylabel('Average Bill Amount')
-axes[0,0].legend()
-axes[0,0].tick_params(axis='x', rotation=45)
-
-# Payment amounts trend
-pay_cols = ['PAY_AMT1', 'PAY_AMT2', 'PAY_AMT3', 'PAY_AMT4', 'PAY_AMT5', 'PAY_AMT6']
-default_pays = credit_default[credit_default['default payment next month'] == 1][pay_cols].mean()
-no_default_pays = credit_default[credit_default['default payment next month'] == 0][pay_cols].mean()
-
-axes[0,1].plot(months, default_pays, marker='o', label='Default Customers', linewidth=2)
-axes[0,1].plot(months, no_default_pays, marker='s', label='Non-Default Customers', linewidth=2)
-axes[0,1].set_title('Average Payment Amounts Over Time')
-axes[0,1].set_ylabel('Average Payment Amount')
-axes[0,1].legend()
-axes[0,1].tick_params(axis='x', rotation=45)
-
-# Credit utilization analysis
-credit_default['util_group'] = pd.cut(credit_default['credit_utilization'], bins=5, labels=['Very Low', 'Low', 'Medium', 'High', 'Very High'])
-util_default = credit_default.groupby('util_group')['default payment next month'].mean()
-util_default.plot(kind='bar', ax=axes[1,0])
-axes[1,0].set_title('Default Rate by Credit Utilization')
-axes[1,0].set_ylabel('Default Rate')
-
-# Correlation heatmap of key financial metrics
-financial_cols = ['LIMIT_BAL', 'AGE', 'BILL_AMT1', 'PAY_AMT1', 'default payment next month']
-correlation_matrix = credit_default[financial_cols].corr()
-sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0, ax=axes[1,1])
-axes[1,1].set_title('Correlation Matrix: Financial Metrics')
-
-plt.tight_layout()
-plt.savefig('visuals/financial_behavior_analysis.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ Financial behavior patterns saved")
-
-# Create risk profiles for credit data (before using it)
-def create_risk_profile(row):
-    if row['default payment next month'] == 1:
-        return 'High Risk'
-    elif row['PAY_0'] > 1 or row['credit_utilization'] > 0.8:
-        return 'Medium Risk'
-    else:
-        return 'Low Risk'
-
-credit_default['risk_profile'] = credit_default.apply(create_risk_profile, axis=1)
-
-# 5. Comprehensive Business Intelligence Dashboard
-print("5️⃣ Creating Comprehensive Business Intelligence Dashboard...")
-fig, axes = plt.subplots(2, 3, figsize=(18, 12))
-
-# 1. Marketing conversion rates by segment
-job_conversion = bank_marketing.groupby('job')['y'].apply(lambda x: (x == 'yes').mean()).sort_values(ascending=False)
-job_conversion.plot(kind='bar', ax=axes[0,0])
-axes[0,0].set_title('Marketing Conversion by Job Type')
-axes[0,0].tick_params(axis='x', rotation=45)
-
-# 2. Risk distribution
-risk_dist = credit_default['risk_profile'].value_counts()
-axes[0,1].pie(risk_dist.values, labels=risk_dist.index, autopct='%1.1f%%')
-axes[0,1].set_title('Customer Risk Distribution')
-
-# 3. Campaign timing effectiveness
-month_order = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-month_conversion = month_subscription.reindex(month_order)
-month_conversion.plot(kind='line', marker='o', ax=axes[0,2])
-axes[0,2].set_title('Monthly Campaign Effectiveness')
-axes[0,2].tick_params(axis='x', rotation=45)
-
-# 4. Age vs risk relationship
-age_risk = credit_default.groupby('age_group')['default payment next month'].mean()
-age_risk.plot(kind='bar', ax=axes[1,0])
-axes[1,0].set_title('Default Rate by Age Group')
-axes[1,0].set_ylabel('Default Rate')
-
-# 5. Contact method effectiveness
-contact_effectiveness = bank_marketing.groupby('contact')['y'].apply(lambda x: (x == 'yes').mean())
-contact_effectiveness.plot(kind='bar', ax=axes[1,1])
-axes[1,1].set_title('Contact Method Effectiveness')
-
-# 6. Credit utilization vs default
-util_risk = credit_default.groupby('util_group')['default payment next month'].mean()
-util_risk.plot(kind='bar', ax=axes[1,2])
-axes[1,2].set_title('Default Rate by Credit Utilization')
-axes[1,2].set_ylabel('Default Rate')
-
-plt.tight_layout()
-plt.savefig('visuals/comprehensive_banking_dashboard.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ Comprehensive banking dashboard saved")
-
-# 6. Feature Importance Analysis
-print("6️⃣ Creating Feature Importance Analysis...")
-
-# Marketing model feature importance (simplified demonstration)
-marketing_features = ['age', 'duration', 'campaign', 'previous', 'balance']
-marketing_importance = [0.25, 0.35, 0.15, 0.15, 0.10]  # Simulated based on our analysis
-
-plt.figure(figsize=(12, 8))
-plt.barh(marketing_features, marketing_importance)
-plt.title('Key Factors for Marketing Campaign Success')
-plt.xlabel('Relative Importance')
-plt.tight_layout()
-plt.savefig('visuals/marketing_feature_importance.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# Credit risk factors
-credit_features = ['PAY_0', 'credit_utilization', 'LIMIT_BAL', 'AGE', 'BILL_AMT1']
-credit_importance = [0.30, 0.25, 0.20, 0.15, 0.10]  # Based on our analysis
-
-plt.figure(figsize=(12, 8))
-plt.barh(credit_features, credit_importance)
-plt.title('Key Factors for Credit Risk Assessment')
-plt.xlabel('Relative Importance')
-plt.tight_layout()
-plt.savefig('visuals/credit_feature_importance.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✅ Feature importance analysis saved")
-
-print("\n" + "="*60)
-print("📊 ANALYSIS SUMMARY")
-print("="*60)
-
-# Key metrics summary
-print("🔍 KEY FINDINGS:")
-print(f"📈 Marketing Conversion Rate: {(bank_marketing['y'] == 'yes').mean():.1%}")
-print(f"⚠️  Credit Default Rate: {credit_default['default payment next month'].mean():.1%}")
-print(f"👥 Total Bank Marketing Records: {len(bank_marketing):,}")
-print(f"💳 Total Credit Default Records: {len(credit_default):,}")
-
-print(f"\n🎯 TOP MARKETING INSIGHTS:")
-print(f"   • Best performing job: {job_conversion.index[0]} ({job_conversion.iloc[0]:.1%} conversion)")
-print(f"   • Best contact method: {contact_effectiveness.index[0]} ({contact_effectiveness.iloc[0]:.1%} conversion)")
-print(f"   • Peak campaign month: {month_conversion.idxmax()} ({month_conversion.max():.1%} conversion)")
-
-print(f"\n⚡ TOP RISK INSIGHTS:")
-print(f"   • Highest risk age group: {age_risk.idxmax()} ({age_risk.max():.1%} default rate)")
-print(f"   • Critical utilization threshold: >80% shows {util_risk.iloc[-1]:.1%} default rate")
-
-print("\n" + "="*60)
-print("✅ ALL VISUALIZATIONS GENERATED SUCCESSFULLY!")
-print("📁 Check the 'visuals/' folder for all generated charts")
-print("🎯 Next: Create presentation summary and executive report")
-print("="*60)
\ No newline at end of file
+    return credit_default
+
+
+def collect_kpis(marketing, credit):
+    """Headline numbers for the analysis summary"""
+    job_conversion = marketing['job_conversion']
+    contact_effectiveness = marketing['rates']['contact']
+    month_conversion = marketing['month_conversion']
+    age_risk = credit['rates']['age_group']
+    util_risk = credit['rates']['util_group']
+    return {
+        'marketing_conversion': marketing['conversion_rate'],
+        'credit_default_rate': credit['default_rate'],
+        'marketing_records': marketing['records'],
+        'credit_records': credit['records'],
+        'best_job': (job_conversion.index[0], job_conversion.iloc[0]),
+        'best_contact': (contact_effectiveness.index[0], contact_effectiveness.iloc[0]),
+        'peak_month': (month_conversion.idxmax(), month_conversion.max()),
+        'riskiest_age_group': (age_risk.idxmax(), age_risk.max()),
+        'top_utilization_default_rate': util_risk.iloc[-1],
+    }
+
+
+def build_pipeline(cache_dir=DEFAULT_CACHE_DIR, force=False, profiler=None, render=None, mmap=False):
+    """Declare the analysis stages and their dependencies.
+
+    render is the figure render profile (see rendering.py); figures are
+    written with its file extension and rerendered when it changes. With
+    mmap the datasets are opened from their shared memory-mapped column
+    stores (see data_loader.py).
+    """
+    pipeline = Pipeline(cache_dir=cache_dir, force=force, profiler=profiler)
+
+    def visual(name):
+        return figure_path(os.path.join(VISUALS_DIR, name), render)
+
+    # Data (the loaders keep their own binary cache, so results are not persisted here).
+    # mmap only enters the parameters when set, so default runs keep their cache keys
+    mapped = {'mmap': True} if mmap else {}
+    pipeline.add('bank_marketing', load_marketing, params={'path': BANK_MARKETING_PATH, **mapped},
+                 files=[BANK_MARKETING_PATH], cache=False)
+    pipeline.add('credit_default', load_credit, params={'path': CREDIT_DEFAULT_PATH, **mapped},
+                 files=[CREDIT_DEFAULT_PATH], cache=False)
+
+    # Derived columns and aggregates
+    pipeline.add('credit_features', add_credit_features, inputs=['credit_default'])
+    pipeline.add('marketing_summary', figures.summarize_marketing, inputs=['bank_marketing'])
+    pipeline.add('credit_summary', figures.summarize_credit, inputs=['credit_features'])
+    pipeline.add('kpis', collect_kpis, inputs=['marketing_summary', 'credit_summary'])
+    # Metrics snapshot the executive report can be rebuilt from without the raw data
+    pipeline.add('report_metrics', write_report_metrics, inputs=['bank_marketing', 'credit_features'],
+                 params={'path': SNAPSHOT_PATH, 'sources': [BANK_MARKETING_PATH, CREDIT_DEFAULT_PATH]},
+                 outputs=[SNAPSHOT_PATH])
+
+    # Models (the fitted bundles are also written to models/ for scoring)
+    pipeline.add('marketing_model', train_marketing_model, inputs=['bank_marketing'],
+                 params={'path': MARKETING_MODEL_PATH}, outputs=[MARKETING_MODEL_PATH])
+    pipeline.add('credit_model', train_credit_model, inputs=['credit_default'],
+                 params={'path': CREDIT_MODEL_PATH}, outputs=[CREDIT_MODEL_PATH])
+
+    # Figures
+    figure_specs = [
+        ('marketing_demographics_figure', figures.render_marketing_demographics,
+         ['marketing_summary'], 'marketing_demographics_analysis.png'),
+        ('campaign_performance_figure', figures.render_campaign_performance,
+         ['marketing_summary'], 'campaign_performance_analysis.png'),
+        ('credit_risk_figure', figures.render_credit_risk,
+         ['credit_summary'], 'credit_risk_analysis.png'),
+        ('financial_behavior_figure', figures.render_financial_behavior,
+         ['credit_summary'], 'financial_behavior_analysis.png'),
+        ('comprehensive_dashboard_figure', figures.render_comprehensive_dashboard,
+         ['marketing_summary', 'credit_summary'], 'comprehensive_banking_dashboard.png'),
+    ]
+    for name, func, inputs, filename in figure_specs:
+        pipeline.add(name, func, inputs=inputs, params={'path': visual(filename), 'render': render},
+                     outputs=[visual(filename)])
+
+    pipeline.add('marketing_importance_figure', figures.render_model_importance, inputs=['marketing_model'],
+                 params={'title': 'Key Factors for Marketing Campaign Success',
+                         'path': visual('marketing_feature_importance.png'), 'render': render},
+                 outputs=[visual('marketing_feature_importance.png')])
+    pipeline.add('credit_importance_figure', figures.render_model_importance, inputs=['credit_model'],
+                 params={'title': 'Key Factors for Credit Risk Assessment',
+                         'path': visual('credit_feature_importance.png'), 'render': render},
+                 outputs=[visual('credit_feature_importance.png')])
+
+    return pipeline
+
+
+def print_summary(kpis):
+    """Print the key findings of the analysis"""
+    print("\n" + "="*60)
+    print("📊 ANALYSIS SUMMARY")
+    print("="*60)
+
+    # Key metrics summary
+    print("🔍 KEY FINDINGS:")
+    print(f"📈 Marketing Conversion Rate: {kpis['marketing_conversion']:.1%}")
+    print(f"⚠️  Credit Default Rate: {kpis['credit_default_rate']:.1%}")
+    print(f"👥 Total Bank Marketing Records: {kpis['marketing_records']:,}")
+    print(f"💳 Total Credit Default Records: {kpis['credit_records']:,}")
+
+    print(f"\n🎯 TOP MARKETING INSIGHTS:")
+    print(f"   • Best performing job: {kpis['best_job'][0]} ({kpis['best_job'][1]:.1%} conversion)")
+    print(f"   • Best contact method: {kpis['best_contact'][0]} ({kpis['best_contact'][1]:.1%} conversion)")
+    print(f"   • Peak campaign month: {kpis['peak_month'][0]} ({kpis['peak_month'][1]:.1%} conversion)")
+
+    print(f"\n⚡ TOP RISK INSIGHTS:")
+    print(f"   • Highest risk age group: {kpis['riskiest_age_group'][0]} ({kpis['riskiest_age_group'][1]:.1%} default rate)")
+    print(f"   • Critical utilization threshold: >80% shows {kpis['top_utilization_default_rate']:.1%} default rate")
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Run the Banking BI EPIC analysis")
+    parser.add_argument('stages', nargs='*',
+                        help="stages to bring up to date (default: all figures and the summary)")
+    parser.add_argument('--force', action='store_true', help="ignore cached results and rerun every stage")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="where stage results are cached")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="render figures in N worker processes (0: one per CPU core)")
+    parser.add_argument('--mmap', action='store_true',
+                        help="open the datasets memory-mapped, sharing one copy with other processes")
+    add_profile_arguments(parser)
+    add_render_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    """Run the analysis pipeline and print the summary"""
+    args = parse_args()
+    os.makedirs(VISUALS_DIR, exist_ok=True)
+
+    print("🚀 Starting Banking BI EPIC Analysis...")
+    print("="*60)
+
+    profiler = cli_profiler(args.profile, args.cprofile)
+    pipeline = build_pipeline(cache_dir=args.cache_dir, force=args.force, profiler=profiler,
+                              render=cli_render_profile(args), mmap=args.mmap)
+    targets = args.stages or FIGURE_STAGES + ['report_metrics', 'kpis']
+    jobs = args.jobs or os.cpu_count()
+
+    print(f"📈 GENERATING VISUALIZATIONS{f' ({jobs} workers)' if jobs > 1 else ''}...")
+    try:
+        status = pipeline.run(targets, jobs=jobs)
+    except Exception as e:
+        print(f"❌ Analysis failed: {e}")
+        return 1
+
+    if 'kpis' in status:
+        print_summary(pipeline.value('kpis'))
+
+    rerun = sum(1 for state in status.values() if state == 'ran')
+    print("\n" + "="*60)
+    print(f"✅ ANALYSIS COMPLETE ({rerun} of {len(status)} stages rerun, the rest were up to date)")
+    print("📁 Check the 'visuals/' folder for all generated charts")
+    print("🎯 Next: Create presentation summary and executive report")
+    print("="*60)
+    if profiler.enabled:
+        profiler.report(args.profile, prefix='epic_analysis')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Headless Notebook Runner
+Executes the EPIC analysis notebook without Jupyter, replaying the cached
+outputs of unchanged cells, and runs parameterized copies (e.g. one per
+month) on a pool of worker processes
+"""
+
+import argparse
+import ast
+import os
+import sys
+sys.path.append('scripts')
+
+from data_loader import load_bank_marketing, load_credit_default
+from notebook_runner import (EXECUTED_DIR, NOTEBOOK_CACHE_DIR, NOTEBOOK_PATH, copy_path, run_copies,
+                             run_notebook)
+
+
+def parse_value(text):
+    """A parameter value as a Python literal if it is one, else as a string"""
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Execute a notebook headlessly with cached cell outputs")
+    parser.add_argument('notebook', nargs='?', default=NOTEBOOK_PATH, help="notebook to execute")
+    parser.add_argument('-o', '--output', help=f"executed notebook path (default: under {EXECUTED_DIR}/)")
+    parser.add_argument('-p', '--parameter', action='append', default=[], metavar='NAME=VALUE',
+                        help="set a parameter of the notebook's 'parameters' cell (repeatable)")
+    parser.add_argument('--segment', metavar='COLUMN',
+                        help="run one copy per value of a data column (sets segment_column/segment_value)")
+    parser.add_argument('--values', nargs='+', metavar='VALUE', help="with --segment, only these values")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="worker processes running copies (0 = one per CPU)")
+    parser.add_argument('--force', action='store_true', help="ignore cached cell outputs and run every cell")
+    parser.add_argument('--cache-dir', default=NOTEBOOK_CACHE_DIR, help="where cell outputs are cached")
+    return parser.parse_args()
+
+
+def segment_values(column):
+    """Distinct values of a marketing or credit column, in sorted order"""
+    for load in (load_bank_marketing, load_credit_default):
+        data = load()
+        if column in data.columns:
+            return sorted(data[column].dropna().unique().tolist())
+    raise ValueError(f"Unknown segment column: {column}")
+
+
+def main():
+    """Execute the notebook (or its parameterized copies)"""
+    args = parse_args()
+    try:
+        parameters = {}
+        for assignment in args.parameter:
+            name, _, value = assignment.partition('=')
+            parameters[name.strip()] = parse_value(value)
+
+        if not args.segment:
+            output = args.output or copy_path(args.notebook, parameters)
+            print(f"📓 Executing {args.notebook}")
+            summaries = [run_notebook(args.notebook, output, parameters, cache_dir=args.cache_dir, force=args.force)]
+        else:
+            values = [parse_value(value) for value in args.values] if args.values else segment_values(args.segment)
+            jobs = args.jobs or os.cpu_count()
+            print(f"📓 Executing {len(values)} copies of {args.notebook} by {args.segment} ({jobs} workers)")
+            parameter_sets = [{**parameters, 'segment_column': args.segment, 'segment_value': value}
+                              for value in values]
+            summaries = run_copies(args.notebook, parameter_sets, out_dir=args.output or EXECUTED_DIR,
+                                   cache_dir=args.cache_dir, jobs=jobs, force=args.force)
+    except Exception as e:
+        print(f"❌ Notebook run failed: {e}")
+        return 1
+
+    failed = [summary for summary in summaries if summary['error']]
+    executed = sum(summary['executed'] for summary in summaries)
+    cached = sum(summary['cached'] for summary in summaries)
+    print(f"\n{'⚠️ ' if failed else '✅'} {len(summaries) - len(failed)} of {len(summaries)} notebooks ran "
+          f"({executed} cells executed, {cached} replayed from cache)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Batch Scoring for Credit Default and Campaign Propensity
+Scores a CSV or Parquet file of customers with a model trained by
+run_epic_analysis.py and writes the scores next to the customer IDs
+"""
+
+import argparse
+import os
+import sys
+sys.path.append('scripts')
+
+from modeling import CREDIT_MODEL_PATH, MARKETING_MODEL_PATH, load_model
+from scoring import DEFAULT_THRESHOLD, SCORE_BATCH_SIZE, score_file
+
+MODEL_PATHS = {'credit': CREDIT_MODEL_PATH, 'marketing': MARKETING_MODEL_PATH}
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Score customers with a trained banking model")
+    parser.add_argument('input', help="CSV or Parquet file with the model's input columns")
+    parser.add_argument('output', help="where to write the scores (.csv or .parquet)")
+    parser.add_argument('--model', choices=sorted(MODEL_PATHS), default='credit',
+                        help="which model to score with (default: credit)")
+    parser.add_argument('--model-path', help="model bundle to load (default: the trained model in models/)")
+    parser.add_argument('--batch-size', type=int, default=SCORE_BATCH_SIZE, help="rows scored per batch")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="probability at which a customer counts as a predicted positive")
+    return parser.parse_args()
+
+
+def main():
+    """Load the model and score the input file"""
+    args = parse_args()
+    model_path = args.model_path or MODEL_PATHS[args.model]
+    if not os.path.exists(model_path):
+        print(f"❌ No model at {model_path}. Run 'python run_epic_analysis.py {args.model}_model' first.")
+        return 1
+
+    bundle = load_model(model_path)
+    print(f"🤖 Scoring {args.input} with {bundle['name']} (ROC AUC {bundle['metrics']['roc_auc']:.3f})")
+    try:
+        stats = score_file(bundle, args.input, args.output, batch_size=args.batch_size, threshold=args.threshold)
+    except Exception as e:
+        print(f"❌ Scoring failed: {e}")
+        return 1
+
+    print(f"✅ {stats['rows']:,} rows scored in {stats['seconds']:.1f}s "
+          f"({stats['rows_per_sec']:,.0f} rows/sec) -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
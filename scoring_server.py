@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Online Credit Scoring API
+Serves the trained credit default model over local HTTP for low-latency
+origination decisions
+
+Endpoints:
+- POST /score    one customer, a list of customers or {"customers": [...]}
+- GET  /metrics  p50/p99 latency and micro-batching statistics
+- GET  /health   liveness check
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+sys.path.append('scripts')
+
+from modeling import CREDIT_MODEL_PATH, load_model
+from scoring import DEFAULT_THRESHOLD
+from scoring_service import MAX_BATCH_SIZE, MAX_REQUEST_ROWS, MAX_WAIT_MS, make_app
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Run the credit scoring API")
+    parser.add_argument('--port', type=int, default=8765, help="port to listen on")
+    parser.add_argument('--address', default='127.0.0.1', help="interface to bind")
+    parser.add_argument('--model-path', default=CREDIT_MODEL_PATH, help="credit model bundle to serve")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="probability at which a customer counts as a predicted default")
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH_SIZE,
+                        help="most customers scored in one model call")
+    parser.add_argument('--max-wait-ms', type=float, default=MAX_WAIT_MS,
+                        help="how long a batch waits for more requests before scoring")
+    parser.add_argument('--max-request-rows', type=int, default=MAX_REQUEST_ROWS,
+                        help="most customers accepted in one request (larger ones get 413)")
+    return parser.parse_args()
+
+
+async def serve(args):
+    """Load the model, start the server and run until interrupted"""
+    bundle = load_model(args.model_path)
+    app = make_app(bundle, threshold=args.threshold, max_batch_size=args.max_batch,
+                   max_wait_ms=args.max_wait_ms, max_request_rows=args.max_request_rows)
+    app.listen(args.port, address=args.address)
+    print(f"🤖 Serving {bundle['name']} (ROC AUC {bundle['metrics']['roc_auc']:.3f})")
+    print(f"🚀 Listening on http://{args.address}:{args.port} (POST /score, GET /metrics)")
+    await asyncio.Event().wait()
+
+
+def main():
+    """Run the scoring API"""
+    args = parse_args()
+    if not os.path.exists(args.model_path):
+        print(f"❌ No model at {args.model_path}. Run 'python run_epic_analysis.py credit_model' first.")
+        return 1
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("\n👋 Scoring API stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
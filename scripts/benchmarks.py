@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Benchmark Harness for Banking BI Analysis
+Times the load, feature, aggregate, model, render, report and dashboard stages at
+several data scales. Each stage runs in a forked child process that inherits
+the prepared inputs, so its wall time, CPU time and peak RSS are measured in
+isolation. Results are written as JSON and compared against a stored baseline
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import psutil
+
+from data_loader import BANK_MARKETING_PATH, CREDIT_DEFAULT_PATH, load_bank_marketing, load_credit_default
+from dashboard_data import build_credit_cube, build_marketing_cube
+from features import add_credit_features, risk_profile
+from metrics import conversion_rates, default_rates
+from modeling import marketing_features, train_credit_model, train_marketing_model
+from profiling import PeakRSS
+from rendering import render_profile
+from report_metrics import report_metrics
+from report_utils import BankingReportGenerator, render_dashboard
+from synthetic import DEFAULT_SEED, LOADERS, write_synthetic
+import epic_figures as figures
+
+BENCHMARK_DIR = 'benchmarks'
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, 'results.json')
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+SCALED_DATA_DIR = os.path.join('.cache', 'benchmarks')
+
+DEFAULT_SCALES = [1, 10, 100]
+REGRESSION_TOLERANCE = 0.25
+# Importance figures draw the top features of a model fitted (unmeasured) on a
+# sample this size; the drawing itself does not depend on the data scale
+IMPORTANCE_SAMPLE_ROWS = 5000
+
+
+# Scaled inputs
+
+def scaled_dataset(kind, path, scale, out_dir, seed=DEFAULT_SEED):
+    """Synthetic copy of a dataset with scale times its rows (reused if present).
+
+    Scale 1 is the shipped file itself.
+    """
+    if scale == 1:
+        return path
+    target = os.path.join(out_dir, f'scale_{scale}_seed_{seed}', os.path.basename(path))
+    if not os.path.exists(target):
+        rows = len(LOADERS[kind](path)) * scale
+        write_synthetic(kind, rows, target, seed=seed, jobs=os.cpu_count(), source=path,
+                        log=lambda message: None)
+    return target
+
+
+def prepare_scale(scale, data_dir=SCALED_DATA_DIR):
+    """Paths and loaded inputs shared (copy-on-write) by every stage at one scale"""
+    marketing_path = scaled_dataset('marketing', BANK_MARKETING_PATH, scale, data_dir)
+    credit_path = scaled_dataset('credit', CREDIT_DEFAULT_PATH, scale, data_dir)
+    bank_marketing = load_bank_marketing(marketing_path)
+    credit_default = load_credit_default(credit_path)
+    featured = add_credit_features(credit_default.copy())
+    return {
+        'scale': scale,
+        'marketing_path': marketing_path,
+        'credit_path': credit_path,
+        'bank_marketing': bank_marketing,
+        'credit_default': credit_default,
+        'credit_features': featured,
+        'marketing_summary': figures.summarize_marketing(bank_marketing),
+        'credit_summary': figures.summarize_credit(featured),
+        'rows': len(bank_marketing) + len(credit_default),
+    }
+
+
+# Stages: name -> (setup, run). setup(context, workdir) returns the args of
+# run(*args) and is not measured; run returns the number of rows it handled.
+
+def _load_csv(marketing_path, credit_path):
+    return (len(load_bank_marketing(marketing_path, use_cache=False))
+            + len(load_credit_default(credit_path, use_cache=False)))
+
+
+def _load_cached(marketing_path, credit_path):
+    return len(load_bank_marketing(marketing_path)) + len(load_credit_default(credit_path))
+
+
+def _credit_features(credit_default):
+    return len(add_credit_features(credit_default))
+
+
+def _marketing_features(bank_marketing):
+    return len(marketing_features(bank_marketing))
+
+
+def _group_metrics(bank_marketing, credit_features):
+    conversion_rates(bank_marketing, figures.MARKETING_KEYS)
+    default_rates(credit_features, figures.CREDIT_KEYS)
+    return len(bank_marketing) + len(credit_features)
+
+
+def _risk_profile(credit_default):
+    return len(risk_profile(credit_default))
+
+
+def _train(train, data, path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        train(data, path=path)
+    return len(data)
+
+
+def _model_stage(train, data):
+    def setup(context, workdir):
+        return [train, context[data], os.path.join(workdir, f'{data}_model.joblib')]
+    return setup, _train
+
+
+def _figure(render, *args):
+    render(*args)
+    return 0
+
+
+def _report(generator):
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not generator.generate_complete_report():
+            raise RuntimeError("report generation failed")
+    return 0
+
+
+def _report_dashboard(metrics, path, render):
+    render_dashboard(metrics, path, render=render)
+    return 0
+
+
+def _report_dashboard_stage(profile):
+    def setup(context, workdir):
+        metrics = report_metrics(context['bank_marketing'].copy(), context['credit_features'])
+        return [metrics, os.path.join(workdir, 'executive_dashboard.png'), render_profile(profile)]
+    return setup, _report_dashboard
+
+
+def _dashboard_prep(bank_marketing, credit_default):
+    build_marketing_cube(bank_marketing)
+    build_credit_cube(credit_default)
+    return len(bank_marketing) + len(credit_default)
+
+
+def _figure_stage(render, inputs, filename):
+    def setup(context, workdir):
+        return [render] + [context[name] for name in inputs] + [os.path.join(workdir, filename)]
+    return setup, _figure
+
+
+def _importance_figure_stage(train, data, title, filename):
+    def setup(context, workdir):
+        sample = context[data].head(IMPORTANCE_SAMPLE_ROWS)
+        with contextlib.redirect_stdout(io.StringIO()):
+            model = train(sample, path=os.path.join(workdir, f'{data}_sample_model.joblib'))
+        return [figures.render_model_importance, model, title, os.path.join(workdir, filename)]
+    return setup, _figure
+
+
+STAGES = {
+    'load_csv': (lambda c, w: [c['marketing_path'], c['credit_path']], _load_csv),
+    'load_cached': (lambda c, w: [c['marketing_path'], c['credit_path']], _load_cached),
+    'credit_features': (lambda c, w: [c['credit_default'].copy()], _credit_features),
+    'marketing_features': (lambda c, w: [c['bank_marketing']], _marketing_features),
+    'group_metrics': (lambda c, w: [c['bank_marketing'].copy(), c['credit_features']], _group_metrics),
+    'risk_profile': (lambda c, w: [c['credit_features']], _risk_profile),
+    'marketing_model': _model_stage(train_marketing_model, 'bank_marketing'),
+    'credit_model': _model_stage(train_credit_model, 'credit_default'),
+    'figure_marketing_demographics': _figure_stage(figures.render_marketing_demographics,
+                                                   ['marketing_summary'], 'marketing_demographics.png'),
+    'figure_campaign_performance': _figure_stage(figures.render_campaign_performance,
+                                                 ['marketing_summary'], 'campaign_performance.png'),
+    'figure_credit_risk': _figure_stage(figures.render_credit_risk, ['credit_summary'], 'credit_risk.png'),
+    'figure_financial_behavior': _figure_stage(figures.render_financial_behavior,
+                                               ['credit_summary'], 'financial_behavior.png'),
+    'figure_comprehensive_dashboard': _figure_stage(figures.render_comprehensive_dashboard,
+                                                    ['marketing_summary', 'credit_summary'], 'dashboard.png'),
+    'figure_marketing_importance': _importance_figure_stage(train_marketing_model, 'bank_marketing',
+                                                            'Key Factors for Marketing Campaign Success',
+                                                            'marketing_importance.png'),
+    'figure_credit_importance': _importance_figure_stage(train_credit_model, 'credit_default',
+                                                         'Key Factors for Credit Risk Assessment',
+                                                         'credit_importance.png'),
+    'report': (lambda c, w: [BankingReportGenerator(output_dir=w, marketing_path=c['marketing_path'],
+                                                    credit_path=c['credit_path'])], _report),
+    'report_dashboard': _report_dashboard_stage('print'),
+    'report_dashboard_draft': _report_dashboard_stage('draft'),
+    'report_dashboard_svg': _report_dashboard_stage('svg'),
+    'dashboard_prep': (lambda c, w: [c['bank_marketing'].copy(), c['credit_default']], _dashboard_prep),
+}
+
+
+# Measurement
+
+def measure(run, args):
+    """Wall time, CPU time and peak RSS of run(*args) in the current process"""
+    process = psutil.Process()
+    with PeakRSS() as rss:
+        cpu_started = process.cpu_times()
+        started = time.perf_counter()
+        rows = run(*args)
+        seconds = time.perf_counter() - started
+        cpu_finished = process.cpu_times()
+
+    return {
+        'seconds': seconds,
+        'cpu_seconds': (cpu_finished.user - cpu_started.user) + (cpu_finished.system - cpu_started.system),
+        'peak_rss_mb': rss.peak_mb,
+        'rss_delta_mb': rss.delta_mb,
+        'rows': rows,
+    }
+
+
+def _run_stage(name, context, workdir):
+    setup, run = STAGES[name]
+    return measure(run, setup(context, workdir))
+
+
+def _child(connection, name, context, workdir):
+    try:
+        connection.send(('ok', _run_stage(name, context, workdir)))
+    except Exception as e:
+        connection.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        connection.close()
+
+
+def run_isolated(name, context, workdir):
+    """Run one stage in a forked child so its memory is measured on its own.
+
+    Falls back to the current process where fork is unavailable.
+    """
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return _run_stage(name, context, workdir)
+    fork = multiprocessing.get_context('fork')
+    receiver, sender = fork.Pipe(duplex=False)
+    child = fork.Process(target=_child, args=(sender, name, context, workdir))
+    child.start()
+    sender.close()
+    status, payload = receiver.recv()
+    child.join()
+    if status != 'ok':
+        raise RuntimeError(f"Stage '{name}' failed: {payload}")
+    return payload
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, stages=None, repeat=1, data_dir=SCALED_DATA_DIR, log=print):
+    """Benchmark the stages at every scale; keeps the fastest of repeat runs"""
+    stages = stages or list(STAGES)
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(unknown)}")
+
+    results = []
+    workdir = tempfile.mkdtemp(prefix='banking_bench_')
+    try:
+        for scale in scales:
+            log(f"📦 Preparing {scale}x data...")
+            context = prepare_scale(scale, data_dir)
+            for name in stages:
+                runs = [run_isolated(name, context, workdir) for _ in range(repeat)]
+                best = min(runs, key=lambda result: result['seconds'])
+                best.update({'scale': scale, 'stage': name, 'input_rows': context['rows']})
+                results.append(best)
+                log(f"⏱️  {scale:>4}x {name:<32} {best['seconds']:8.3f}s  "
+                    f"cpu {best['cpu_seconds']:7.3f}s  peak {best['peak_rss_mb']:8.1f} MB")
+            del context
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'host': {'platform': platform.platform(), 'python': platform.python_version(),
+                 'cpu_count': os.cpu_count()},
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+# Persistence and comparison
+
+def save_results(results, path=RESULTS_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(current, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Per stage and scale time ratios against a baseline run.
+
+    A stage is a 'regression' when it got slower by more than tolerance,
+    'faster' when it improved by more than tolerance, and 'ok' otherwise.
+    """
+    reference = {(r['scale'], r['stage']): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        before = reference.get((result['scale'], result['stage']))
+        if before is None:
+            continue
+        ratio = result['seconds'] / before['seconds'] if before['seconds'] else float('inf')
+        status = 'regression' if ratio > 1 + tolerance else 'faster' if ratio < 1 - tolerance else 'ok'
+        rows.append({
+            'scale': result['scale'], 'stage': result['stage'],
+            'baseline_seconds': before['seconds'], 'seconds': result['seconds'], 'ratio': ratio,
+            'baseline_peak_rss_mb': before['peak_rss_mb'], 'peak_rss_mb': result['peak_rss_mb'],
+            'status': status,
+        })
+    return rows
+
+
+def format_comparison(rows):
+    """Plain-text table of a comparison"""
+    lines = [f"{'scale':>6}  {'stage':<32} {'baseline':>9} {'current':>9} {'ratio':>7}  status"]
+    for row in rows:
+        marker = {'regression': '❌', 'faster': '🚀', 'ok': '✅'}[row['status']]
+        lines.append(f"{row['scale']:>5}x  {row['stage']:<32} {row['baseline_seconds']:8.3f}s "
+                     f"{row['seconds']:8.3f}s {row['ratio']:6.2f}x  {marker} {row['status']}")
+    return "\n".join(lines)
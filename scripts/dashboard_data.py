@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Dashboard Aggregate Cubes for Banking BI Analysis
+Counts and outcome totals pre-aggregated over the dimensions the dashboard
+slices by. The cubes are built once per process and every chart rolls them
+up instead of regrouping the raw rows on each Streamlit rerun
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_loader import TARGET_COL, load_bank_marketing, load_credit_default
+from features import AGE_BINS, AGE_LABELS, credit_utilization
+from metrics import conversion_flag
+
+MARKETING_DIMENSIONS = ['job', 'marital', 'contact', 'month']
+CREDIT_DIMENSIONS = ['AGE', 'util_bucket', 'PAY_0']
+
+# Right-closed utilization buckets 0.1 wide, with overflow buckets on both
+# sides; util_bucket i covers (UTIL_EDGES[i], UTIL_EDGES[i + 1]]
+UTIL_EDGES = np.concatenate([[-np.inf], np.round(np.arange(11) / 10, 1), [np.inf]])
+
+UTIL_BUCKET_LABELS = ['<=0%'] + [f'{i * 10}-{(i + 1) * 10}%' for i in range(10)] + ['>100%']
+
+UTIL_GROUP_BINS = [0, 0.3, 0.6, 0.8, 1.0]
+UTIL_GROUP_LABELS = ['Low (<30%)', 'Medium (30-60%)', 'High (60-80%)', 'Very High (>80%)']
+
+
+def build_marketing_cube(bank_marketing):
+    """Customers and conversions per job x marital x contact x month"""
+    keys = [bank_marketing[dimension] for dimension in MARKETING_DIMENSIONS]
+    cube = (conversion_flag(bank_marketing).groupby(keys, observed=True)
+            .agg(customers='count', conversions='sum'))
+    return cube.reset_index()
+
+
+def util_buckets(utilization):
+    """Index of the UTIL_EDGES bucket each utilization value falls in"""
+    return (np.searchsorted(UTIL_EDGES, utilization, side='left') - 1).astype('int8')
+
+
+def build_credit_cube(credit_default):
+    """Customers and defaults per exact age x utilization bucket x PAY_0"""
+    utilization = credit_utilization(credit_default)
+    keys = pd.DataFrame({
+        'AGE': credit_default['AGE'],
+        'util_bucket': util_buckets(utilization.to_numpy()),
+        'PAY_0': credit_default['PAY_0'],
+        'defaulted': credit_default[TARGET_COL],
+    })
+    cube = (keys.groupby(CREDIT_DIMENSIONS, observed=True)['defaulted']
+            .agg(customers='count', defaults='sum'))
+    return cube.reset_index()
+
+
+def load_cubes():
+    """Load both datasets and reduce them to their dashboard cubes"""
+    return build_marketing_cube(load_bank_marketing()), build_credit_cube(load_credit_default())
+
+
+def rollup(cube, keys, total, name='rate'):
+    """Sum a cube over everything but keys and add the rate total / customers.
+
+    Returns a DataFrame with the key columns, customers, the total and the
+    rate column (named by name).
+    """
+    rolled = cube.groupby(keys, observed=True)[['customers', total]].sum().reset_index()
+    rolled[name] = rolled[total] / rolled['customers']
+    return rolled
+
+
+def overall_rate(cube, total):
+    """Rate of the total over all customers in a cube (or cube slice)"""
+    return cube[total].sum() / cube['customers'].sum()
+
+
+def with_age_groups(credit_cube):
+    """Credit cube with the analysis age bands added as 'age_group'"""
+    return credit_cube.assign(age_group=pd.cut(credit_cube['AGE'], bins=AGE_BINS, labels=AGE_LABELS))
+
+
+def with_util_groups(credit_cube):
+    """Credit cube with the coarse utilization levels added as 'util_group'.
+
+    Every coarse bin edge is a bucket edge, so each bucket maps to exactly one
+    level; buckets outside (0, 1] get no level, as with pd.cut on raw values.
+    """
+    upper = UTIL_EDGES[1:][credit_cube['util_bucket'].to_numpy()]
+    return credit_cube.assign(util_group=pd.cut(upper, bins=UTIL_GROUP_BINS, labels=UTIL_GROUP_LABELS))
+
+
+def cube_metrics(marketing_cube, credit_cube):
+    """The headline metrics of report_metrics.report_metrics, rolled up from the cubes"""
+    def rates(cube, key, total):
+        rolled = rollup(cube, [key], total)
+        return pd.Series(rolled['rate'].to_numpy(), index=rolled[key].astype(str))
+
+    return {
+        'marketing_records': int(marketing_cube['customers'].sum()),
+        'credit_records': int(credit_cube['customers'].sum()),
+        'marketing_conversion': overall_rate(marketing_cube, 'conversions'),
+        'credit_default_rate': overall_rate(credit_cube, 'defaults'),
+        'job_conversion': rates(marketing_cube, 'job', 'conversions').sort_values(ascending=False),
+        'contact_effectiveness': rates(marketing_cube, 'contact', 'conversions'),
+        'month_conversion': rates(marketing_cube, 'month', 'conversions'),
+        'age_risk': rates(with_age_groups(credit_cube), 'age_group', 'defaults'),
+    }
+
+
+def age_bin_edges(age_min, age_max, width=5):
+    """Integer age bin edges of the given width covering [age_min, age_max]"""
+    return np.append(np.arange(age_min, age_max + 1, width), age_max + 1)
+
+
+def risk_grid(credit_cube, age_edges):
+    """Default rate on an age x utilization bucket grid, weighted by customers.
+
+    Bins the cube rows with np.histogram2d (ages in [edge, next edge)), so
+    the result size depends only on the number of bins. Returns DataFrames of
+    default rates and customer counts with utilization buckets as rows and
+    age bins as columns; empty cells have a NaN rate.
+    """
+    ages = credit_cube['AGE'].to_numpy()
+    buckets = credit_cube['util_bucket'].to_numpy()
+    bins = [age_edges, np.arange(len(UTIL_BUCKET_LABELS) + 1) - 0.5]
+
+    customers = np.histogram2d(ages, buckets, bins=bins, weights=credit_cube['customers'])[0].T
+    defaults = np.histogram2d(ages, buckets, bins=bins, weights=credit_cube['defaults'])[0].T
+    rates = np.divide(defaults, customers, out=np.full_like(customers, np.nan), where=customers > 0)
+
+    columns = [f'{lo}-{hi - 1}' if hi - 1 > lo else f'{lo}' for lo, hi in zip(age_edges[:-1], age_edges[1:])]
+    return (pd.DataFrame(rates, index=UTIL_BUCKET_LABELS, columns=columns),
+            pd.DataFrame(customers.astype('int64'), index=UTIL_BUCKET_LABELS, columns=columns))
+
+
+class SortedIndex:
+    """Rows of a frame presorted by one column for range and set lookups.
+
+    Lookups binary-search the sorted keys, so selecting k rows costs
+    O(log n + k) instead of a boolean mask over every row. Categorical
+    columns are indexed by their integer codes.
+    """
+
+    def __init__(self, frame, column):
+        values = frame[column]
+        self.categories = values.cat.categories if isinstance(values.dtype, pd.CategoricalDtype) else None
+        keys = values.cat.codes.to_numpy() if self.categories is not None else values.to_numpy()
+        order = np.argsort(keys, kind='stable')
+        self.frame = frame.iloc[order].reset_index(drop=True)
+        self.keys = keys[order]
+
+    def _key(self, value):
+        return self.categories.get_loc(value) if self.categories is not None else value
+
+    def range(self, lo, hi):
+        """Rows whose key lies in the closed interval [lo, hi]"""
+        start = np.searchsorted(self.keys, self._key(lo), side='left')
+        stop = np.searchsorted(self.keys, self._key(hi), side='right')
+        return self.frame.iloc[start:stop]
+
+    def isin(self, values):
+        """Rows whose key is one of values, grouped by key in index order"""
+        keys = sorted(self._key(value) for value in values)
+        blocks = [self.frame.iloc[np.searchsorted(self.keys, key, side='left'):
+                                  np.searchsorted(self.keys, key, side='right')] for key in keys]
+        return pd.concat(blocks) if blocks else self.frame.iloc[:0]
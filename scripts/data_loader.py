@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Data Loading Layer for Banking BI Analysis
+Reads both banking datasets with explicit column types and keeps a binary
+Feather sidecar next to each CSV so repeated runs skip CSV parsing. On
+request the data is also kept as a column store (one .npy file per column)
+that is opened memory-mapped, so any number of processes share a single copy
+of the pages in the OS cache instead of each holding its own frame
+"""
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+BANK_MARKETING_PATH = 'data/Bank_dataset.csv'
+CREDIT_DEFAULT_PATH = 'data/credit_default_clean.csv'
+# Sidecars live in a .cache folder beside the CSV they were built from
+CACHE_DIRNAME = '.cache'
+
+# Bump when a schema below changes so existing sidecars are rebuilt
+SCHEMA_VERSION = 1
+
+BANK_MARKETING_SCHEMA = {
+    'age': 'int16',
+    'job': 'category',
+    'marital': 'category',
+    'education': 'category',
+    'default': 'category',
+    'balance': 'int32',
+    'housing': 'category',
+    'loan': 'category',
+    'contact': 'category',
+    'day': 'int8',
+    'month': 'category',
+    'duration': 'int32',
+    'campaign': 'int16',
+    'pdays': 'int16',
+    'previous': 'int16',
+    'poutcome': 'category',
+    'y': 'category',
+}
+
+BILL_COLS = ['BILL_AMT1', 'BILL_AMT2', 'BILL_AMT3', 'BILL_AMT4', 'BILL_AMT5', 'BILL_AMT6']
+PAY_AMT_COLS = ['PAY_AMT1', 'PAY_AMT2', 'PAY_AMT3', 'PAY_AMT4', 'PAY_AMT5', 'PAY_AMT6']
+PAY_STATUS_COLS = ['PAY_0', 'PAY_2', 'PAY_3', 'PAY_4', 'PAY_5', 'PAY_6']
+TARGET_COL = 'default payment next month'
+
+CREDIT_DEFAULT_SCHEMA = {
+    'ID': 'int32',
+    'LIMIT_BAL': 'int32',
+    'SEX': 'int8',
+    'EDUCATION': 'int8',
+    'MARRIAGE': 'int8',
+    'AGE': 'int8',
+    **{col: 'int8' for col in PAY_STATUS_COLS},
+    **{col: 'float32' for col in BILL_COLS},
+    **{col: 'float32' for col in PAY_AMT_COLS},
+    TARGET_COL: 'int8',
+}
+
+
+def file_digest(path, block_size=1 << 20):
+    """Return the SHA-256 hex digest of a file, read in fixed-size blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _sidecar_paths(csv_path, cache_dir=None):
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(csv_path), CACHE_DIRNAME)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return (os.path.join(cache_dir, stem + '.feather'),
+            os.path.join(cache_dir, stem + '.meta.json'))
+
+
+def _store_paths(csv_path, cache_dir=None):
+    feather_path, _ = _sidecar_paths(csv_path, cache_dir)
+    store_dir = os.path.splitext(feather_path)[0] + '.columns'
+    return store_dir, os.path.join(store_dir, 'meta.json')
+
+
+def _schema_token(schema):
+    payload = json.dumps({'version': SCHEMA_VERSION, 'schema': schema}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _sidecar_is_fresh(csv_path, meta_path, schema):
+    """Check a sidecar against the CSV it was built from.
+
+    A matching size and mtime is trusted without rehashing; if only the
+    mtime moved (e.g. a fresh checkout) the CSV is hashed and the sidecar
+    is kept when the content is unchanged.
+    """
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return False
+    if meta.get('schema') != _schema_token(schema):
+        return False
+
+    stat = os.stat(csv_path)
+    if meta.get('size') != stat.st_size:
+        return False
+    if meta.get('mtime_ns') == stat.st_mtime_ns:
+        return True
+    if meta.get('sha256') != file_digest(csv_path):
+        return False
+
+    meta['mtime_ns'] = stat.st_mtime_ns
+    try:
+        _write_json(meta_path, meta)
+    except OSError:
+        pass  # the content matched; only the mtime shortcut is lost
+    return True
+
+
+def _write_atomically(path, write):
+    """Call write(tmp_path) on a temp file beside path, then move it into place.
+
+    Readers see either the old file or the complete new one, never a partly
+    written file.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                    dir=os.path.dirname(path) or '.')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_json(path, data):
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+    _write_atomically(path, write)
+
+
+def read_csv_typed(csv_path, schema, **kwargs):
+    """Read a CSV applying the dtypes of any schema columns it contains"""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {col: dtype for col, dtype in schema.items() if col in header}
+    return pd.read_csv(csv_path, dtype=dtypes, **kwargs)
+
+
+def _source_meta(csv_path, schema, rows):
+    """Sidecar metadata identifying the CSV and schema a cached copy was built from"""
+    stat = os.stat(csv_path)
+    return {
+        'source': csv_path,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_digest(csv_path),
+        'schema': _schema_token(schema),
+        'rows': rows,
+    }
+
+
+def write_column_store(df, store_dir, meta=None):
+    """Write a frame as one .npy file per column plus a meta.json describing them.
+
+    Categorical columns are stored as their integer codes with the
+    categories in meta.json. The store is written to a private directory
+    beside its final place and swapped in when complete, so readers never
+    see a partial one and concurrent writers do not collide; a writer that
+    finds another's store already in place keeps that one.
+    """
+    parent = os.path.dirname(store_dir) or '.'
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=os.path.basename(store_dir) + '.', suffix='.tmp', dir=parent)
+    try:
+        columns = []
+        for i, col in enumerate(df.columns):
+            entry = {'name': col, 'file': f'{i}.npy'}
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                entry['categories'] = df[col].cat.categories.tolist()
+                entry['ordered'] = bool(df[col].cat.ordered)
+                values = df[col].cat.codes.to_numpy()
+            else:
+                values = df[col].to_numpy()
+                if values.dtype == object:
+                    raise ValueError(f"Column '{col}' has no fixed-width dtype to store")
+            np.save(os.path.join(tmp_dir, entry['file']), np.ascontiguousarray(values))
+            columns.append(entry)
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({**(meta or {}), 'rows': len(df), 'columns': columns}, f, indent=2)
+        _swap_in(tmp_dir, store_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _swap_in(new_dir, store_dir):
+    """Move new_dir to store_dir, deleting the store it replaces.
+
+    The old store is renamed aside first (a directory cannot be replaced
+    while it has files). Processes that mapped its columns keep reading
+    them after it is deleted.
+    """
+    old_dir = new_dir + '.old'
+    try:
+        os.rename(store_dir, old_dir)
+    except FileNotFoundError:
+        old_dir = None
+    try:
+        os.replace(new_dir, store_dir)
+    except OSError as e:
+        # Another writer swapped its store in between; it holds the same data
+        if e.errno not in (errno.EEXIST, errno.ENOTEMPTY):
+            raise
+    if old_dir:
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def open_column_store(store_dir):
+    """Open a column store as a DataFrame over read-only memory-mapped columns.
+
+    No column is copied into the process: pages are read from the OS cache
+    on first touch and shared with every other process that opened the
+    store. New columns can be added to the frame; the stored ones cannot be
+    modified in place.
+    """
+    with open(os.path.join(store_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    data = {}
+    for entry in meta['columns']:
+        # A plain ndarray view of the mapping, so derived arrays are ordinary arrays
+        values = np.load(os.path.join(store_dir, entry['file']), mmap_mode='r').view(np.ndarray)
+        if 'categories' in entry:
+            values = pd.Categorical.from_codes(values, categories=entry['categories'], ordered=entry['ordered'])
+        data[entry['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def load_dataset(csv_path, schema, use_cache=True, cache_dir=None, mmap=False):
+    """Load a dataset, reusing its Feather sidecar while the CSV is unchanged.
+
+    With mmap the frame is opened from the dataset's column store, which is
+    (re)built first when missing or stale.
+    """
+    if mmap:
+        return _load_mapped(csv_path, schema, use_cache, cache_dir)
+    if not use_cache:
+        return read_csv_typed(csv_path, schema)
+
+    feather_path, meta_path = _sidecar_paths(csv_path, cache_dir)
+    if os.path.exists(feather_path) and _sidecar_is_fresh(csv_path, meta_path, schema):
+        return pd.read_feather(feather_path)
+
+    df = read_csv_typed(csv_path, schema)
+
+    try:
+        os.makedirs(os.path.dirname(feather_path), exist_ok=True)
+        # The meta goes in last: it is what marks the sidecar as fresh
+        _write_atomically(feather_path, df.to_feather)
+        _write_json(meta_path, _source_meta(csv_path, schema, len(df)))
+    except OSError as e:
+        # A read-only checkout still works, it just parses the CSV every time
+        print(f"Warning: could not write data cache for {csv_path}: {e}")
+
+    return df
+
+
+def _load_mapped(csv_path, schema, use_cache=True, cache_dir=None):
+    store_dir, meta_path = _store_paths(csv_path, cache_dir)
+    if use_cache and _sidecar_is_fresh(csv_path, meta_path, schema):
+        try:
+            return open_column_store(store_dir)
+        except (FileNotFoundError, ValueError):
+            pass  # another writer swapped the store out after the check; rebuild it
+
+    df = load_dataset(csv_path, schema, use_cache=use_cache, cache_dir=cache_dir)
+    try:
+        write_column_store(df, store_dir, _source_meta(csv_path, schema, len(df)))
+    except OSError as e:
+        print(f"Warning: could not write column store for {csv_path}: {e}")
+        return df
+    try:
+        return open_column_store(store_dir)
+    except (FileNotFoundError, ValueError):
+        return df  # swapped out again while opening; the loaded frame holds the same data
+
+
+def load_bank_marketing(path=BANK_MARKETING_PATH, use_cache=True, mmap=False):
+    """Load the bank marketing dataset with categorical string columns"""
+    return load_dataset(path, BANK_MARKETING_SCHEMA, use_cache=use_cache, mmap=mmap)
+
+
+def load_credit_default(path=CREDIT_DEFAULT_PATH, use_cache=True, mmap=False):
+    """Load the credit default dataset with compact numeric columns"""
+    return load_dataset(path, CREDIT_DEFAULT_SCHEMA, use_cache=use_cache, mmap=mmap)
+
+
+def load_datasets(use_cache=True, mmap=False):
+    """Load both banking datasets as (bank_marketing, credit_default)"""
+    return load_bank_marketing(use_cache=use_cache, mmap=mmap), load_credit_default(use_cache=use_cache, mmap=mmap)
+
+
+def is_parquet(path):
+    """True for paths with a Parquet extension (anything else is read as CSV)"""
+    return os.path.splitext(path)[1].lower() in ('.parquet', '.pq')
+
+
+class ChunkWriter:
+    """Append DataFrame chunks to a CSV or Parquet file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = is_parquet(path)
+        self._writer = None
+        self._started = False
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def write(self, frame):
+        if self.parquet:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode='a' if self._started else 'w', header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def memory_usage_mb(df):
+    """Deep memory usage of a DataFrame in megabytes"""
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
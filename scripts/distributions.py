@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Distribution Summaries for Banking BI Analysis
+Histogram bin counts and box-plot statistics computed once from per-group
+value counts, so charts draw from a few hundred numbers instead of rescanning
+the raw rows. Value counts can be added chunk by chunk, which keeps the
+summaries the same size however large the dataset grows
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def value_counts_by_group(values, groups):
+    """Distinct values and their counts for each group, sorted by value.
+
+    Returns a dict mapping each observed group label to (values, counts);
+    categorical groups keep their category order.
+    """
+    groups = groups if isinstance(groups, pd.Series) else pd.Series(groups)
+    if isinstance(groups.dtype, pd.CategoricalDtype):
+        codes = groups.cat.codes.to_numpy()
+        categories = groups.cat.categories
+    else:
+        codes, categories = pd.factorize(groups, sort=True)
+
+    values = np.asarray(values)
+    distributions = {}
+    for code, label in enumerate(categories):
+        uniques, counts = np.unique(values[codes == code], return_counts=True)
+        if len(counts):
+            distributions[label] = (uniques, counts)
+    return distributions
+
+
+def histogram_counts(distributions, bins=20):
+    """Counts per group on shared equal-width bins spanning every group.
+
+    Uses the same edges as np.histogram (and seaborn's histplot) would on the
+    raw values. Returns (edges, {group: counts}).
+    """
+    lo = min(values[0] for values, _ in distributions.values())
+    hi = max(values[-1] for values, _ in distributions.values())
+    edges = np.histogram_bin_edges([lo, hi], bins=bins)
+    counts = {
+        label: np.histogram(values, bins=edges, weights=weights)[0].astype('int64')
+        for label, (values, weights) in distributions.items()
+    }
+    return edges, counts
+
+
+def _quantile(values, cumulative, q):
+    """Linearly interpolated quantile (np.percentile's default) of a counted sample"""
+    position = q * (cumulative[-1] - 1)
+    lower, upper = int(np.floor(position)), int(np.ceil(position))
+    below = values[np.searchsorted(cumulative, lower, side='right')]
+    above = values[np.searchsorted(cumulative, upper, side='right')]
+    return below + (above - below) * (position - lower)
+
+
+def box_stats(values, counts, label=None, whis=1.5):
+    """Box-plot statistics of a counted sample, in the format Axes.bxp draws.
+
+    Matches matplotlib's boxplot_stats on the expanded sample, except that
+    each distinct outlier value is listed once.
+    """
+    values = np.asarray(values, dtype='float64')
+    cumulative = np.cumsum(counts)
+    q1, med, q3 = (_quantile(values, cumulative, q) for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+
+    inside = values[(values >= q1 - whis * iqr) & (values <= q3 + whis * iqr)]
+    whislo = min(inside.min(), q1) if len(inside) else q1
+    whishi = max(inside.max(), q3) if len(inside) else q3
+
+    return {
+        'label': label,
+        'n': int(cumulative[-1]),
+        'mean': float(np.dot(values, counts) / cumulative[-1]),
+        'q1': q1, 'med': med, 'q3': q3,
+        'whislo': whislo, 'whishi': whishi,
+        'fliers': values[(values < whislo) | (values > whishi)],
+    }
+
+
+def box_stats_by_group(values, groups, whis=1.5):
+    """Box-plot statistics of values for every group, in group order"""
+    return [box_stats(uniques, counts, label=label, whis=whis)
+            for label, (uniques, counts) in value_counts_by_group(values, groups).items()]
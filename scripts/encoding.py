@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Categorical Encoding for Banking BI Models
+Turns a frame into the numeric matrix a model is trained on in one pass:
+categorical columns become integer codes (taken straight from pandas
+categoricals where the column already is one), yes/no columns become 0/1
+flags and numeric columns are copied in as they are. The matrix is a single
+C-contiguous float32 array, which is the dtype the tree models work in, so
+it reaches them without another conversion copy. The vocabulary fitted at
+training time is saved with the model so scoring encodes alike
+"""
+
+import numpy as np
+import pandas as pd
+
+FEATURE_DTYPE = 'float32'
+
+
+def fit_codes(values):
+    """Integer codes of a column and its sorted vocabulary, in a single pass"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), list(values.cat.categories)
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes, list(uniques)
+
+
+def category_codes(values, categories):
+    """Integer codes of a column against a fixed vocabulary (unseen values get -1)"""
+    if isinstance(values.dtype, pd.CategoricalDtype) and list(values.cat.categories) == list(categories):
+        return values.cat.codes.to_numpy()
+    return pd.Categorical(values, categories=categories).codes
+
+
+def fit_vocabulary(frame, columns):
+    """Vocabulary of every categorical column, in code order"""
+    return {col: fit_codes(frame[col])[1] for col in columns}
+
+
+def encode_features(frame, features, categorical=(), flags=(), vocabulary=None, dtype=FEATURE_DTYPE):
+    """Model input matrix with one column per feature, in features order.
+
+    Columns in categorical are encoded against vocabulary; without one, the
+    vocabulary is fitted from the same pass that derives the codes. Columns
+    in flags become 1 where the value is 'yes'. Returns (X, vocabulary),
+    where X is C-contiguous.
+    """
+    fitted = vocabulary is None
+    vocabulary = {} if fitted else vocabulary
+    X = np.empty((len(frame), len(features)), dtype=dtype)
+    for j, col in enumerate(features):
+        if col in categorical:
+            if fitted:
+                codes, vocabulary[col] = fit_codes(frame[col])
+            else:
+                codes = category_codes(frame[col], vocabulary[col])
+            X[:, j] = codes
+        elif col in flags:
+            X[:, j] = (frame[col] == 'yes').to_numpy()
+        else:
+            X[:, j] = frame[col].to_numpy()
+    return X, vocabulary
+
+
+def feature_frame(X, features, index=None):
+    """Wrap an encoded matrix as a DataFrame without copying it"""
+    return pd.DataFrame(X, columns=features, index=index, copy=False)
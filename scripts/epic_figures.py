@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+EPIC Analysis Figures
+One function per chart produced by run_epic_analysis.py. Each renders from
+the aggregated summaries alone (never the raw rows), saves the figure with a
+render profile (see rendering.py) and returns the written path
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+from data_loader import BILL_COLS, PAY_AMT_COLS, TARGET_COL
+from distributions import box_stats_by_group, histogram_counts, value_counts_by_group
+from metrics import conversion_flag, conversion_rates, default_rates
+from rendering import save_figure
+
+# Set visualization style
+plt.style.use('seaborn-v0_8')
+sns.set_palette("husl")
+
+MARKETING_KEYS = ['job', 'education', 'contact', 'month', 'poutcome']
+CREDIT_KEYS = ['age_group', 'limit_group', 'PAY_0', 'ratio_group', 'util_group']
+MONTH_ORDER = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+STATEMENT_MONTHS = ['Month 1', 'Month 2', 'Month 3', 'Month 4', 'Month 5', 'Month 6']
+FINANCIAL_COLS = ['LIMIT_BAL', 'AGE', 'BILL_AMT1', 'PAY_AMT1', TARGET_COL]
+
+
+def summarize_marketing(bank_marketing):
+    """Conversion KPIs, per-segment rates and distribution summaries for the marketing charts"""
+    rates = conversion_rates(bank_marketing, MARKETING_KEYS)
+    subscribed = bank_marketing['y']
+    return {
+        'records': len(bank_marketing),
+        'conversion_rate': conversion_flag(bank_marketing).mean(),
+        'rates': rates,
+        'job_conversion': rates['job'].sort_values(ascending=False),
+        'month_conversion': rates['month'].reindex(MONTH_ORDER),
+        'age_histogram': histogram_counts(value_counts_by_group(bank_marketing['age'], subscribed), bins=20),
+        'duration_box': box_stats_by_group(bank_marketing['duration'], subscribed),
+        'campaign_box': box_stats_by_group(bank_marketing['campaign'], subscribed),
+    }
+
+
+def summarize_credit(credit_default):
+    """Default-rate KPIs and group summaries for the credit charts.
+
+    Expects the columns added by features.add_credit_features.
+    """
+    defaulted = credit_default[TARGET_COL] == 1
+    return {
+        'records': len(credit_default),
+        'default_rate': credit_default[TARGET_COL].mean(),
+        'rates': default_rates(credit_default, CREDIT_KEYS),
+        'default_bills': credit_default.loc[defaulted, BILL_COLS].mean(),
+        'no_default_bills': credit_default.loc[~defaulted, BILL_COLS].mean(),
+        'default_pays': credit_default.loc[defaulted, PAY_AMT_COLS].mean(),
+        'no_default_pays': credit_default.loc[~defaulted, PAY_AMT_COLS].mean(),
+        'correlation_matrix': credit_default[FINANCIAL_COLS].corr(),
+        'risk_dist': credit_default['risk_profile'].value_counts(),
+    }
+
+
+def _histogram(ax, histogram, xlabel, legend_title):
+    """Layered histogram from precomputed bin counts, one layer per group"""
+    edges, counts = histogram
+    for label, values in counts.items():
+        ax.bar(edges[:-1], values, width=np.diff(edges), align='edge', alpha=0.5, label=label)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('Count')
+    ax.legend(title=legend_title)
+
+
+def _boxplot(ax, stats, xlabel, ylabel):
+    """Box plot from precomputed quartiles, whiskers and outliers"""
+    ax.bxp(stats, patch_artist=True, boxprops={'facecolor': 'C0'}, medianprops={'color': 'black'})
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+
+def _save(path, render=None):
+    plt.tight_layout()
+    path = save_figure(plt.gcf(), path, render)
+    plt.close()
+    return path
+
+
+def render_marketing_demographics(marketing, path, render=None):
+    """Age distribution and subscription rate by job, education and contact"""
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+
+    # Age distribution by subscription
+    _histogram(axes[0,0], marketing['age_histogram'], 'age', 'y')
+    axes[0,0].set_title('Age Distribution by Subscription Status')
+
+    # Job type vs subscription rate
+    marketing['job_conversion'].plot(kind='bar', ax=axes[0,1])
+    axes[0,1].set_title('Subscription Rate by Job Type')
+    axes[0,1].tick_params(axis='x', rotation=45)
+
+    # Education level vs subscription
+    marketing['rates']['education'].plot(kind='bar', ax=axes[1,0])
+    axes[1,0].set_title('Subscription Rate by Education Level')
+
+    # Contact method effectiveness
+    marketing['rates']['contact'].plot(kind='bar', ax=axes[1,1])
+    axes[1,1].set_title('Subscription Rate by Contact Method')
+
+    return _save(path, render)
+
+
+def render_campaign_performance(marketing, path, render=None):
+    """Call duration, timing, contact count and previous outcome effects"""
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+
+    # Duration vs subscription (call duration effectiveness)
+    _boxplot(axes[0,0], marketing['duration_box'], 'y', 'duration')
+    axes[0,0].set_title('Call Duration vs Subscription Success')
+
+    # Month-wise subscription rates
+    marketing['rates']['month'].plot(kind='bar', ax=axes[0,1])
+    axes[0,1].set_title('Subscription Rate by Month')
+    axes[0,1].tick_params(axis='x', rotation=45)
+
+    # Campaign contacts vs subscription
+    _boxplot(axes[1,0], marketing['campaign_box'], 'y', 'campaign')
+    axes[1,0].set_title('Number of Campaigns vs Subscription')
+
+    # Previous outcome impact
+    marketing['rates']['poutcome'].plot(kind='bar', ax=axes[1,1])
+    axes[1,1].set_title('Subscription Rate by Previous Outcome')
+    axes[1,1].tick_params(axis='x', rotation=45)
+
+    return _save(path, render)
+
+
+def render_credit_risk(credit, path, render=None):
+    """Default rate by age, credit limit, payment status and bill/pay ratio"""
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    rates = credit['rates']
+
+    panels = [
+        (axes[0,0], 'age_group', 'Default Rate by Age Group'),
+        (axes[0,1], 'limit_group', 'Default Rate by Credit Limit'),
+        (axes[1,0], 'PAY_0', 'Default Rate by Recent Payment Status'),
+        (axes[1,1], 'ratio_group', 'Default Rate by Bill/Payment Ratio'),
+    ]
+    for ax, key, title in panels:
+        rates[key].plot(kind='bar', ax=ax)
+        ax.set_title(title)
+        ax.set_ylabel('Default Rate')
+
+    return _save(path, render)
+
+
+def render_financial_behavior(credit, path, render=None):
+    """Bill and payment trends, utilization risk and financial correlations"""
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+
+    # Bill amounts trend over 6 months
+    axes[0,0].plot(STATEMENT_MONTHS, credit['default_bills'], marker='o', label='Default Customers', linewidth=2)
+    axes[0,0].plot(STATEMENT_MONTHS, credit['no_default_bills'], marker='s', label='Non-Default Customers', linewidth=2)
+    axes[0,0].set_title('Average Bill Amounts Over Time')
+    axes[0,0].set_ylabel('Average Bill Amount')
+    axes[0,0].legend()
+    axes[0,0].tick_params(axis='x', rotation=45)
+
+    # Payment amounts trend
+    axes[0,1].plot(STATEMENT_MONTHS, credit['default_pays'], marker='o', label='Default Customers', linewidth=2)
+    axes[0,1].plot(STATEMENT_MONTHS, credit['no_default_pays'], marker='s', label='Non-Default Customers', linewidth=2)
+    axes[0,1].set_title('Average Payment Amounts Over Time')
+    axes[0,1].set_ylabel('Average Payment Amount')
+    axes[0,1].legend()
+    axes[0,1].tick_params(axis='x', rotation=45)
+
+    # Credit utilization analysis
+    credit['rates']['util_group'].plot(kind='bar', ax=axes[1,0])
+    axes[1,0].set_title('Default Rate by Credit Utilization')
+    axes[1,0].set_ylabel('Default Rate')
+
+    # Correlation heatmap of key financial metrics
+    sns.heatmap(credit['correlation_matrix'], annot=True, cmap='coolwarm', center=0, ax=axes[1,1])
+    axes[1,1].set_title('Correlation Matrix: Financial Metrics')
+
+    return _save(path, render)
+
+
+def render_comprehensive_dashboard(marketing, credit, path, render=None):
+    """Six-panel overview of marketing conversion and credit risk"""
+    fig, axes = plt.subplots(2, 3, figsize=(18, 12))
+
+    # 1. Marketing conversion rates by segment
+    marketing['job_conversion'].plot(kind='bar', ax=axes[0,0])
+    axes[0,0].set_title('Marketing Conversion by Job Type')
+    axes[0,0].tick_params(axis='x', rotation=45)
+
+    # 2. Risk distribution
+    risk_dist = credit['risk_dist']
+    axes[0,1].pie(risk_dist.values, labels=risk_dist.index, autopct='%1.1f%%')
+    axes[0,1].set_title('Customer Risk Distribution')
+
+    # 3. Campaign timing effectiveness
+    marketing['month_conversion'].plot(kind='line', marker='o', ax=axes[0,2])
+    axes[0,2].set_title('Monthly Campaign Effectiveness')
+    axes[0,2].tick_params(axis='x', rotation=45)
+
+    # 4. Age vs risk relationship
+    credit['rates']['age_group'].plot(kind='bar', ax=axes[1,0])
+    axes[1,0].set_title('Default Rate by Age Group')
+    axes[1,0].set_ylabel('Default Rate')
+
+    # 5. Contact method effectiveness
+    marketing['rates']['contact'].plot(kind='bar', ax=axes[1,1])
+    axes[1,1].set_title('Contact Method Effectiveness')
+
+    # 6. Credit utilization vs default
+    credit['rates']['util_group'].plot(kind='bar', ax=axes[1,2])
+    axes[1,2].set_title('Default Rate by Credit Utilization')
+    axes[1,2].set_ylabel('Default Rate')
+
+    return _save(path, render)
+
+
+def render_feature_importance(features, importance, title, path, xlabel='Relative Importance', render=None):
+    """Horizontal bar chart of relative feature importance"""
+    plt.figure(figsize=(12, 8))
+    plt.barh(features, importance)
+    plt.title(title)
+    plt.xlabel(xlabel)
+    return _save(path, render)
+
+
+def render_model_importance(model, title, path, top=15, render=None):
+    """Permutation importance of a trained model's top features, largest on top"""
+    importance = model['importance'].head(top).iloc[::-1]
+    return render_feature_importance(list(importance.index), importance.values, title, path,
+                                     xlabel='Permutation Importance (drop in ROC AUC)', render=render)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Metrics for Banking BI Analysis
+Vectorized group rates shared by the analysis script, report generator and
+dashboard: the outcome is encoded as a uint8 flag and every group rate is a
+single np.bincount over the key's integer codes
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_loader import TARGET_COL
+
+CONVERSION_FLAG = 'converted'
+
+
+def conversion_flag(bank_marketing, column='y', positive='yes'):
+    """uint8 0/1 conversion flag of each marketing row, as a new Series (the frame is left as is)"""
+    return pd.Series((bank_marketing[column] == positive).to_numpy(dtype='uint8'),
+                     index=bank_marketing.index, name=CONVERSION_FLAG)
+
+
+def _key_codes(keys):
+    """Integer codes (-1 for missing) and the distinct values they index"""
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        return keys.cat.codes.to_numpy(), keys.cat.categories
+    return pd.factorize(keys, sort=True)
+
+
+def _observed_index(keys, categories, observed):
+    """Index of the observed keys, keeping the categorical order of keys"""
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        return pd.CategoricalIndex(categories[observed], categories=categories,
+                                   ordered=keys.cat.ordered, name=keys.name)
+    return pd.Index(categories[observed], name=keys.name)
+
+
+def group_totals(keys, values):
+    """Sum and count of values per distinct key.
+
+    Returns (index, sums, counts) with only observed keys; categorical keys
+    keep their category order, other keys are sorted.
+    """
+    keys = keys if isinstance(keys, pd.Series) else pd.Series(keys)
+    codes, categories = _key_codes(keys)
+
+    values = np.asarray(values, dtype='float64')
+    valid = codes >= 0
+    if not valid.all():
+        codes, values = codes[valid], values[valid]
+
+    counts = np.bincount(codes, minlength=len(categories))
+    sums = np.bincount(codes, weights=values, minlength=len(categories))
+
+    observed = counts > 0
+    return _observed_index(keys, categories, observed), sums[observed], counts[observed]
+
+
+def group_rates(df, keys, flag, values=None):
+    """Mean of a 0/1 flag column per group for several keys at once.
+
+    Returns a dict mapping each key to a Series of rates, equivalent to
+    df.groupby(key, observed=True)[flag].mean() for every key. Pass values
+    for a flag that is not a column of df.
+    """
+    values = df[flag].to_numpy() if values is None else np.asarray(values)
+    rates = {}
+    for key in keys:
+        index, sums, counts = group_totals(df[key], values)
+        rates[key] = pd.Series(sums / counts, index=index, name=flag)
+    return rates
+
+
+def segment_group_rates(df, segment, keys, flag, values=None):
+    """group_rates for every segment of df at once.
+
+    Each key is counted with one np.bincount over combined (segment, key)
+    codes, so N segments cost one pass over the data rather than N. Returns
+    {segment value: {key: Series}}, equal to group_rates on each segment's
+    rows. As there, values stands in for a flag that is not a column of df.
+    """
+    segment_codes, segments = _key_codes(df[segment])
+    values = np.asarray(df[flag] if values is None else values, dtype='float64')
+    rates = {value: {} for value in segments}
+    for key in keys:
+        codes, categories = _key_codes(df[key])
+        valid = (segment_codes >= 0) & (codes >= 0)
+        combined = segment_codes[valid].astype('int64') * len(categories) + codes[valid]
+        size = len(segments) * len(categories)
+        counts = np.bincount(combined, minlength=size).reshape(len(segments), -1)
+        sums = np.bincount(combined, weights=values[valid], minlength=size).reshape(len(segments), -1)
+        for i, value in enumerate(segments):
+            observed = counts[i] > 0
+            rates[value][key] = pd.Series(sums[i][observed] / counts[i][observed],
+                                          index=_observed_index(df[key], categories, observed), name=flag)
+    return rates
+
+
+def conversion_rates(bank_marketing, keys):
+    """Conversion rate per group for each marketing key"""
+    return group_rates(bank_marketing, keys, CONVERSION_FLAG, values=conversion_flag(bank_marketing))
+
+
+def default_rates(credit_default, keys):
+    """Default rate per group for each credit key"""
+    return group_rates(credit_default, keys, TARGET_COL)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Predictive Models for Banking BI Analysis
+Trains the campaign propensity and credit default models, scores them on a
+held-out split and ranks features by permutation importance. Fitted models
+are saved as bundles holding everything needed to score new customers
+"""
+
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.inspection import permutation_importance
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from data_loader import BILL_COLS, PAY_AMT_COLS, PAY_STATUS_COLS, TARGET_COL
+from encoding import encode_features, feature_frame, fit_vocabulary
+
+MODEL_DIR = 'models'
+MARKETING_MODEL_PATH = os.path.join(MODEL_DIR, 'marketing_model.joblib')
+CREDIT_MODEL_PATH = os.path.join(MODEL_DIR, 'credit_model.joblib')
+
+# Same inputs as the notebook models, with yes/no columns as 0/1 flags
+MARKETING_FEATURES = ['age', 'job', 'marital', 'education', 'balance', 'housing', 'loan',
+                      'contact', 'duration', 'campaign', 'pdays', 'previous', 'poutcome']
+MARKETING_CATEGORICAL = ['job', 'marital', 'education', 'contact', 'poutcome']
+MARKETING_FLAGS = ['housing', 'loan']
+
+# Raw credit columns plus the engineered ratios used in the risk analysis
+CREDIT_FEATURES = (['LIMIT_BAL', 'SEX', 'EDUCATION', 'MARRIAGE', 'AGE'] + PAY_STATUS_COLS + BILL_COLS
+                   + PAY_AMT_COLS + ['credit_utilization', 'bill_pay_ratio'])
+CREDIT_RAW_FEATURES = CREDIT_FEATURES[:-2]
+# Every raw credit column (int8 status codes, int32 limits, float32 amounts) is exact in float32
+CREDIT_DTYPE = 'float32'
+
+TEST_SIZE = 0.3
+RANDOM_STATE = 42
+
+# Default hyperparameters; tune_models.py searches around them
+MARKETING_PARAMS = {'n_estimators': 200, 'min_samples_leaf': 2}
+CREDIT_PARAMS = {'max_iter': 500, 'learning_rate': 0.05, 'early_stopping': True, 'validation_fraction': 0.1,
+                 'n_iter_no_change': 20}
+
+
+def marketing_categories(bank_marketing):
+    """Vocabulary of every categorical marketing feature, in category order"""
+    return fit_vocabulary(bank_marketing, MARKETING_CATEGORICAL)
+
+
+def marketing_features(bank_marketing, categories=None):
+    """Numeric model inputs for the campaign propensity model.
+
+    Categorical columns become integer codes against a fixed vocabulary
+    (unseen values get -1), so training and scoring encode alike. Without
+    categories the vocabulary is fitted from the same pass. The frame is a
+    view of one float32 matrix (see encoding.py).
+    """
+    X, _ = encode_features(bank_marketing, MARKETING_FEATURES, MARKETING_CATEGORICAL, MARKETING_FLAGS,
+                           vocabulary=categories)
+    return feature_frame(X, MARKETING_FEATURES, index=bank_marketing.index)
+
+
+def marketing_estimator(params=None, n_jobs=-1):
+    """Unfitted random forest for the propensity model; params override MARKETING_PARAMS"""
+    return RandomForestClassifier(**{**MARKETING_PARAMS, **(params or {})}, n_jobs=n_jobs,
+                                  random_state=RANDOM_STATE)
+
+
+def credit_estimator(params=None):
+    """Unfitted gradient boosting default model; params override CREDIT_PARAMS"""
+    return HistGradientBoostingClassifier(**{**CREDIT_PARAMS, **(params or {})}, random_state=RANDOM_STATE)
+
+
+def fill_credit_ratios(X):
+    """Compute the credit_utilization and bill_pay_ratio columns of a credit matrix in place.
+
+    X holds the CREDIT_RAW_FEATURES in its first columns; the ratios are
+    accumulated straight into their own columns, with no temporary arrays
+    the size of the bill block.
+    """
+    column = CREDIT_FEATURES.index
+    utilization = X[:, column('credit_utilization')]
+    utilization[:] = X[:, column(BILL_COLS[0])]
+    for col in BILL_COLS[1:]:
+        utilization += X[:, column(col)]
+    utilization /= len(BILL_COLS)
+    utilization /= X[:, column('LIMIT_BAL')]
+    ratio = X[:, column('bill_pay_ratio')]
+    np.add(X[:, column('PAY_AMT1')], 1, out=ratio)
+    np.divide(X[:, column('BILL_AMT1')], ratio, out=ratio)
+    return X
+
+
+def credit_matrix(credit_default, path=None, dtype=CREDIT_DTYPE):
+    """Model inputs for the credit default model as one C-contiguous array in CREDIT_FEATURES order.
+
+    Each raw column is cast straight from the loaded frame into its slot
+    (no intermediate frame copies) and the ratios are derived in place.
+    With path the array is a memory-mapped .npy file, so the matrix lives in
+    the page cache instead of process memory and can be reopened with
+    np.load(path, mmap_mode='r').
+    """
+    shape = (len(credit_default), len(CREDIT_FEATURES))
+    if path:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        X = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+    else:
+        X = np.empty(shape, dtype=dtype)
+    for j, col in enumerate(CREDIT_RAW_FEATURES):
+        X[:, j] = credit_default[col].to_numpy()
+    fill_credit_ratios(X)
+    if path:
+        X.flush()
+    return X
+
+
+def credit_features(credit_default, path=None):
+    """Numeric model inputs for the credit default model.
+
+    The frame is a view of the float32 credit_matrix (memory-mapped when
+    path is given).
+    """
+    return feature_frame(credit_matrix(credit_default, path), CREDIT_FEATURES, index=credit_default.index)
+
+
+def rank_features(model, X_test, y_test, features, n_jobs=-1, n_repeats=5):
+    """Permutation importance (drop in ROC AUC) of every feature, highest first"""
+    result = permutation_importance(model, X_test, y_test, scoring='roc_auc', n_repeats=n_repeats,
+                                    n_jobs=n_jobs, random_state=RANDOM_STATE)
+    return pd.Series(result.importances_mean, index=features).sort_values(ascending=False)
+
+
+def _evaluate(model, X_test, y_test):
+    probability = model.predict_proba(X_test)[:, 1]
+    return {
+        'roc_auc': roc_auc_score(y_test, probability),
+        'accuracy': accuracy_score(y_test, probability >= 0.5),
+        'test_rows': len(y_test),
+    }
+
+
+def _fit(model, X, y, kind, name, n_jobs):
+    """Fit on a stratified split and bundle the model with its evaluation.
+
+    Models are fitted on plain arrays in bundle['features'] order, so they
+    can score arrays directly without per-call column name checks.
+    """
+    features = list(X.columns)
+    X_train, X_test, y_train, y_test = train_test_split(X.to_numpy(), y, test_size=TEST_SIZE, stratify=y,
+                                                        random_state=RANDOM_STATE)
+    model.fit(X_train, y_train)
+    bundle = {
+        'kind': kind,
+        'name': name,
+        'model': model,
+        'features': features,
+        'metrics': _evaluate(model, X_test, y_test),
+        'importance': rank_features(model, X_test, y_test, features, n_jobs=n_jobs),
+    }
+    print(f"🤖 {name}: ROC AUC {bundle['metrics']['roc_auc']:.3f}, "
+          f"accuracy {bundle['metrics']['accuracy']:.1%} on {len(y_test):,} held-out rows")
+    return bundle
+
+
+def train_marketing_model(bank_marketing, path=MARKETING_MODEL_PATH, n_jobs=-1, n_estimators=200, params=None):
+    """Random forest propensity model for term deposit subscription, trained on all cores.
+
+    params (e.g. the best of a tune_models.py search) override the defaults.
+    """
+    X, categories = encode_features(bank_marketing, MARKETING_FEATURES, MARKETING_CATEGORICAL, MARKETING_FLAGS)
+    X = feature_frame(X, MARKETING_FEATURES)
+    y = (bank_marketing['y'] == 'yes').to_numpy(dtype='int8')
+    model = marketing_estimator({'n_estimators': n_estimators, **(params or {})}, n_jobs=n_jobs)
+    bundle = _fit(model, X, y, 'marketing', 'Marketing propensity model', n_jobs)
+    bundle['categories'] = categories
+    return save_model(bundle, path)
+
+
+def train_credit_model(credit_default, path=CREDIT_MODEL_PATH, n_jobs=-1, max_iter=500, params=None,
+                       features_path=None):
+    """Histogram gradient boosting default model with early stopping.
+
+    The boosting itself is multithreaded over all cores; n_jobs applies to
+    the permutation importance. params override the defaults. With
+    features_path the feature matrix is built as a memory-mapped .npy file
+    there rather than in memory.
+    """
+    X = credit_features(credit_default, features_path)
+    y = credit_default[TARGET_COL].to_numpy()
+    model = credit_estimator({'max_iter': max_iter, **(params or {})})
+    bundle = _fit(model, X, y, 'credit', 'Credit default model', n_jobs)
+    bundle['metrics']['iterations'] = int(model.n_iter_)
+    return save_model(bundle, path)
+
+
+def save_model(bundle, path):
+    """Persist a model bundle with joblib and return it"""
+    if path:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        joblib.dump(bundle, path)
+    return bundle
+
+
+def load_model(path):
+    """Load a model bundle written by save_model"""
+    return joblib.load(path)
+
+
+def predict_proba(bundle, X):
+    """Positive-class probability for rows already passed through the feature builder.
+
+    X is a DataFrame with the bundle's feature columns, or an array whose
+    columns are already in bundle['features'] order.
+    """
+    if isinstance(X, pd.DataFrame):
+        if list(X.columns) != bundle['features']:
+            X = X[bundle['features']]
+        X = X.to_numpy()
+    return bundle['model'].predict_proba(X)[:, 1]
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Headless Notebook Runner for Banking BI Analysis
+Executes a Jupyter notebook without a Jupyter server: code cells run in
+order in one namespace, and printed text, expression results, figures and
+errors are written back as regular notebook outputs.
+
+Each code cell is cached under a key chained from the previous cell's key,
+its own source and the local modules it imports; the first key also hashes
+the notebook's input data files. A rerun replays the outputs of unchanged
+cells and executes every cell from the first changed one onwards, resuming
+from a snapshot of the variables at that point. Parameterized copies
+(papermill style: a cell tagged 'parameters' is followed by the injected
+values) can be run on a pool of worker processes
+"""
+
+import ast
+import base64
+import builtins
+import contextlib
+import copy
+import hashlib
+import io
+import json
+import os
+import pickle
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.artist import Artist
+
+from data_loader import BANK_MARKETING_PATH, CREDIT_DEFAULT_PATH, file_digest
+from pipeline import local_module_files
+
+NOTEBOOK_PATH = os.path.join('notebooks', 'Banking_BI_EPIC_Analysis.ipynb')
+EXECUTED_DIR = os.path.join('notebooks', 'executed')
+NOTEBOOK_CACHE_DIR = os.path.join('.cache', 'notebooks')
+NOTEBOOK_INPUTS = [BANK_MARKETING_PATH, CREDIT_DEFAULT_PATH]
+# Bump when the cache layout changes so old entries are ignored
+CACHE_VERSION = 2
+PARAMETERS_TAG = 'parameters'
+INJECTED_TAG = 'injected-parameters'
+
+
+def read_notebook(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_notebook(notebook, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    _write_atomic(path, json.dumps(notebook, indent=1, ensure_ascii=False) + "\n")
+    return path
+
+
+def _write_atomic(path, content):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    mode = 'wb' if isinstance(content, bytes) else 'w'
+    with open(tmp_path, mode, **({} if mode == 'wb' else {'encoding': 'utf-8'})) as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def cell_source(cell):
+    source = cell.get('source', '')
+    return ''.join(source) if isinstance(source, list) else source
+
+
+def _source_lines(text):
+    return text.splitlines(keepends=True)
+
+
+# Parameters
+
+def parameter_source(parameters):
+    """Source of the cell assigning the injected parameter values"""
+    lines = ["# Injected parameters"]
+    lines += [f"{name} = {value!r}" for name, value in parameters.items()]
+    return "\n".join(lines)
+
+
+def inject_parameters(notebook, parameters):
+    """Copy of notebook with a cell setting parameters after the 'parameters' cell.
+
+    Without a tagged cell the values are set at the top, as papermill does.
+    """
+    notebook = copy.deepcopy(notebook)
+    if not parameters:
+        return notebook
+    cells = [cell for cell in notebook['cells'] if INJECTED_TAG not in cell.get('metadata', {}).get('tags', [])]
+    injected = {
+        'cell_type': 'code', 'execution_count': None, 'outputs': [],
+        'metadata': {'tags': [INJECTED_TAG]}, 'source': _source_lines(parameter_source(parameters)),
+    }
+    position = next((i + 1 for i, cell in enumerate(cells)
+                     if PARAMETERS_TAG in cell.get('metadata', {}).get('tags', [])), 0)
+    cells.insert(position, injected)
+    notebook['cells'] = cells
+    return notebook
+
+
+# Cache keys
+
+def _sha256(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8') if isinstance(part, str) else part)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def cell_keys(cells, inputs=NOTEBOOK_INPUTS):
+    """Chained cache key of each code cell.
+
+    A key changes when the cell, any earlier code cell, a local module it
+    imports or one of the input files changes.
+    """
+    key = _sha256(f"notebook-cache-v{CACHE_VERSION}",
+                  *[f"{path}:{file_digest(path)}" for path in inputs])
+    keys = []
+    for cell in cells:
+        source = cell_source(cell)
+        modules = [f"{path}:{file_digest(path)}" for path in local_module_files(source)]
+        key = _sha256(key, source, *modules)
+        keys.append(key)
+    return keys
+
+
+# Namespace snapshots
+
+def _is_transient(value):
+    """Figures and axes are closed after each cell, so they are not snapshotted"""
+    if isinstance(value, np.ndarray) and value.dtype == object and value.size:
+        value = value.flat[0]
+    return isinstance(value, Artist)
+
+
+def definitions(source):
+    """Source of each top-level function and class a cell defines"""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return {}
+    return {node.name: ast.unparse(node) for node in tree.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))}
+
+
+class NotebookCache:
+    """Per-cell outputs and namespace snapshots, keyed by cell_keys.
+
+    A snapshot pickles every variable in one piece after the cell, so
+    objects shared between names (df2 = df) are restored shared and a
+    mutation through either name is captured. Identical snapshots are
+    stored once. Functions and classes defined in the notebook are kept as
+    their source and redefined on restore. Variables that cannot be pickled
+    make a snapshot incomplete, and an incomplete snapshot is never resumed
+    from. State outside the namespace (files written, module globals) is
+    not snapshotted.
+    """
+
+    def __init__(self, cache_dir=NOTEBOOK_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, 'blobs')
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+    def _path(self, key, suffix):
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def outputs(self, key):
+        try:
+            with open(self._path(key, '.outputs.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_outputs(self, key, outputs):
+        _write_atomic(self._path(key, '.outputs.json'), json.dumps(outputs))
+
+    def discard(self, key):
+        """Forget a cell's outputs and snapshot"""
+        for suffix in ['.outputs.json', '.state.json']:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._path(key, suffix))
+
+    def snapshot(self, key):
+        try:
+            with open(self._path(key, '.state.json'), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return state if state['complete'] else None
+
+    def save_snapshot(self, key, namespace, previous, source):
+        """Snapshot the whole namespace after a cell"""
+        sources = {**(previous or {}).get('definitions', {}), **definitions(source)}
+        modules, defined, variables = {}, {}, {}
+        for name, value in namespace.items():
+            if name.startswith('__'):
+                continue
+            if isinstance(value, type(sys)):
+                modules[name] = value.__name__
+            elif name in sources and getattr(value, '__module__', None) == '__main__':
+                defined[name] = sources[name]
+            elif not _is_transient(value):
+                variables[name] = value
+        try:
+            blob, unpicklable = self._store_blob(pickle.dumps(variables, protocol=pickle.HIGHEST_PROTOCOL)), []
+        except Exception:
+            blob, unpicklable = None, [name for name, value in variables.items() if not _picklable(value)]
+        state = {'variables': blob, 'modules': modules, 'definitions': defined,
+                 'unpicklable': unpicklable, 'complete': blob is not None}
+        _write_atomic(self._path(key, '.state.json'), json.dumps(state))
+        return state
+
+    def _store_blob(self, data):
+        blob = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.blob_dir, blob + '.pkl')
+        if not os.path.exists(path):
+            _write_atomic(path, data)
+        return blob
+
+    def restore(self, state, namespace):
+        """Load a snapshot's variables into namespace"""
+        for name, module in state['modules'].items():
+            namespace[name] = __import__(module, fromlist=['_'])
+        with open(os.path.join(self.blob_dir, state['variables'] + '.pkl'), 'rb') as f:
+            namespace.update(pickle.load(f))
+        for source in state['definitions'].values():
+            exec(compile(source, '<restored definition>', 'exec'), namespace)
+
+
+def _picklable(value):
+    try:
+        pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return False
+    return True
+
+
+# Execution
+
+def _figure_outputs():
+    """Every open figure as a PNG display output; the figures are then closed"""
+    outputs = []
+    for number in plt.get_fignums():
+        figure = plt.figure(number)
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format='png', bbox_inches='tight')
+        outputs.append({
+            'output_type': 'display_data', 'metadata': {},
+            'data': {'image/png': base64.b64encode(buffer.getvalue()).decode('ascii'),
+                     'text/plain': repr(figure)},
+        })
+    plt.close('all')
+    return outputs
+
+
+def _result_output(value, execution_count):
+    data = {'text/plain': repr(value)}
+    html = getattr(value, '_repr_html_', None)
+    if callable(html):
+        with contextlib.suppress(Exception):
+            data['text/html'] = html()
+    return {'output_type': 'execute_result', 'execution_count': execution_count, 'metadata': {}, 'data': data}
+
+
+def execute_cell(source, namespace, execution_count, name='<cell>'):
+    """Run one cell's source in namespace and return (outputs, error).
+
+    Like Jupyter, the value of a final expression is shown as the result.
+    """
+    outputs = []
+    stdout, stderr = io.StringIO(), io.StringIO()
+    error = None
+    try:
+        tree = ast.parse(source, filename=name)
+        last = tree.body.pop() if tree.body and isinstance(tree.body[-1], ast.Expr) else None
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exec(compile(tree, name, 'exec'), namespace)
+            if last is not None:
+                value = eval(compile(ast.Expression(last.value), name, 'eval'), namespace)
+                if value is not None:
+                    outputs.append(_result_output(value, execution_count))
+    except Exception as e:
+        error = {
+            'output_type': 'error', 'ename': type(e).__name__, 'evalue': str(e),
+            'traceback': traceback.format_exception(type(e), e, e.__traceback__),
+        }
+
+    streams = [{'output_type': 'stream', 'name': stream, 'text': text}
+               for stream, text in [('stdout', stdout.getvalue()), ('stderr', stderr.getvalue())] if text]
+    outputs = streams + _figure_outputs() + outputs
+    if error:
+        outputs.append(error)
+    return outputs, error
+
+
+def run_notebook(path, output_path, parameters=None, cache_dir=NOTEBOOK_CACHE_DIR, inputs=NOTEBOOK_INPUTS,
+                 force=False, log=print):
+    """Execute a notebook headlessly, reusing the cached outputs of unchanged cells.
+
+    Writes the executed notebook to output_path and returns a summary with
+    the number of cells cached and executed and any error.
+    """
+    started = time.perf_counter()
+    notebook = inject_parameters(read_notebook(path), parameters)
+    cells = [cell for cell in notebook['cells'] if cell['cell_type'] == 'code']
+    keys = cell_keys(cells, inputs)
+    cache = NotebookCache(cache_dir)
+
+    cached = [None if force else cache.outputs(key) for key in keys]
+    first_stale = next((i for i, outputs in enumerate(cached) if outputs is None), len(cells))
+    # Resume from the latest complete snapshot before the first stale cell
+    resume, state = -1, None
+    for i in range(first_stale - 1, -1, -1) if first_stale < len(cells) else []:
+        state = cache.snapshot(keys[i])
+        if state:
+            resume = i
+            break
+
+    # Every cell from the first one that reruns is invalidated: its effects
+    # cannot be traced, so no later cell may be replayed from the old cache
+    if first_stale < len(cells):
+        for key in keys[resume + 1:]:
+            cache.discard(key)
+
+    namespace = {'__name__': '__main__', '__builtins__': builtins}
+    if state:
+        cache.restore(state, namespace)
+
+    error = None
+    executed = 0
+    for i, (cell, key) in enumerate(zip(cells, keys)):
+        cell['execution_count'] = i + 1
+        if i <= resume or (first_stale == len(cells)):
+            cell['outputs'] = cached[i]
+            continue
+        if error:
+            cell['outputs'] = []
+            continue
+        source = cell_source(cell)
+        outputs, error = execute_cell(source, namespace, i + 1, name=f"<cell {i + 1}>")
+        cell['outputs'] = outputs
+        executed += 1
+        if not error:
+            cache.save_outputs(key, outputs)
+            state = cache.save_snapshot(key, namespace, state, source)
+
+    write_notebook(notebook, output_path)
+    plt.close('all')
+    summary = {
+        'notebook': output_path,
+        'parameters': parameters or {},
+        'cells': len(cells),
+        'cached': len(cells) - executed,
+        'executed': executed,
+        'seconds': time.perf_counter() - started,
+        'error': f"{error['ename']}: {error['evalue']}" if error else None,
+    }
+    status = f"❌ {summary['error']}" if error else "✅"
+    log(f"{status} {output_path}: {summary['executed']} cells executed, {summary['cached']} from cache "
+        f"({summary['seconds']:.1f}s)")
+    return summary
+
+
+# Parameterized copies
+
+def copy_path(path, parameters, out_dir=EXECUTED_DIR):
+    """Output path of an executed copy, named after its parameter values"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    suffix = ''.join(f"__{name}_{value}" for name, value in parameters.items())
+    return os.path.join(out_dir, (stem + suffix).replace(os.sep, '_').replace(' ', '_') + '.ipynb')
+
+
+def run_copies(path, parameter_sets, out_dir=EXECUTED_DIR, cache_dir=NOTEBOOK_CACHE_DIR, inputs=NOTEBOOK_INPUTS,
+               jobs=1, force=False, log=print):
+    """Run one executed copy of the notebook per parameter set.
+
+    With jobs > 1 the copies run on a pool of worker processes that stay
+    warm (libraries imported once) across copies. Returns the summaries in
+    the order of parameter_sets.
+    """
+    tasks = [(path, copy_path(path, parameters, out_dir), parameters, cache_dir, inputs, force)
+             for parameters in parameter_sets]
+    if jobs <= 1 or len(tasks) <= 1:
+        return [run_notebook(*task, log=log) for task in tasks]
+
+    summaries = {}
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+        futures = {pool.submit(run_notebook, *task, log=_quiet): i for i, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            summary = future.result()
+            summaries[futures[future]] = summary
+            status = f"❌ {summary['error']}" if summary['error'] else "✅"
+            log(f"{status} {summary['notebook']}: {summary['executed']} cells executed, "
+                f"{summary['cached']} from cache ({summary['seconds']:.1f}s)")
+    return [summaries[i] for i in range(len(tasks))]
+
+
+def _quiet(message):
+    pass
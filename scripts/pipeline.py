@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Incremental Pipeline for Banking BI Analysis
+A small DAG of named stages. Each stage's result is cached under a key that
+hashes its code, the local scripts/ modules that code depends on, its
+parameters, input files and upstream stage keys, so a rerun only recomputes
+stages whose inputs actually changed
+"""
+
+import ast
+import glob
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from data_loader import file_digest
+from profiling import Profiler
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'pipeline')
+LOCAL_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _imported_names(source):
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return set()
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+    return names
+
+
+def local_module_files(source, module_dir=LOCAL_MODULE_DIR):
+    """Files of the scripts/ modules some source imports, including their own local imports"""
+    pending = sorted(_imported_names(source))
+    files = {}
+    while pending:
+        name = pending.pop()
+        path = os.path.join(module_dir, name + '.py')
+        if name in files or not os.path.exists(path):
+            continue
+        files[name] = path
+        with open(path, 'r', encoding='utf-8') as f:
+            pending.extend(_imported_names(f.read()))
+    return [files[name] for name in sorted(files)]
+
+
+def _referenced_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _referenced_names(const)
+    return names
+
+
+def stage_module_files(func, module_dir=LOCAL_MODULE_DIR):
+    """Files of the local scripts/ modules a stage function's result depends on.
+
+    A function from a scripts/ module depends on that module (its helpers
+    included) and everything it imports locally. A function defined
+    elsewhere, e.g. in a CLI script, depends on the local modules of the
+    globals it refers to.
+    """
+    func = inspect.unwrap(func)
+    module = getattr(func, '__module__', None) or ''
+    if os.path.exists(os.path.join(module_dir, module + '.py')):
+        modules = {module}
+    else:
+        modules = set()
+        code = getattr(func, '__code__', None)
+        for name in _referenced_names(code) if code else ():
+            value = getattr(func, '__globals__', {}).get(name)
+            owner = value.__name__ if inspect.ismodule(value) else getattr(value, '__module__', None)
+            if owner:
+                modules.add(owner.split('.')[0])
+    return local_module_files(''.join(f'import {name}\n' for name in sorted(modules)), module_dir)
+
+
+def _profiled_call(profiler, name, func, args, params):
+    """Run a stage function (possibly in a worker process) and return it with its profile record"""
+    with profiler.measure(name) as record:
+        result = func(*args, **params)
+        shape = getattr(result, 'shape', None)
+        if shape:
+            record['rows'] = shape[0]
+    return result, record
+
+
+class Stage:
+    """A named unit of work in the pipeline"""
+
+    def __init__(self, name, func, inputs=(), params=None, files=(), outputs=(), cache=True):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.params = dict(params or {})
+        self.files = list(files)
+        self.outputs = list(outputs)
+        # Stages with their own cache (e.g. the data loaders) are keyed but not persisted
+        self.cache = cache
+
+
+class Pipeline:
+    """Run stages in dependency order, reusing cached results where possible"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, force=False, log=print, profiler=None,
+                 module_dir=LOCAL_MODULE_DIR):
+        self.cache_dir = cache_dir
+        # Local modules whose content is part of every stage key that depends on them
+        self.module_dir = module_dir
+        self.force = force
+        self.log = log
+        # Stages computed in this run are measured; a disabled profiler only times them
+        self.profiler = profiler or Profiler(enabled=False)
+        self.stages = {}
+        self._keys = {}
+        self._values = {}
+        self._status = {}
+        self._digests = None
+
+    def add(self, name, func, inputs=(), params=None, files=(), outputs=(), cache=True):
+        """Register a stage; its inputs must already be registered"""
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage name: {name}")
+        for upstream in inputs:
+            if upstream not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{upstream}'")
+        self.stages[name] = Stage(name, func, inputs, params, files, outputs, cache)
+        return name
+
+    # Keys
+
+    def _file_digest(self, path):
+        """SHA-256 of an input file, rehashed only when its size or mtime moved"""
+        if self._digests is None:
+            self._digests = self._read_json(self._digest_path(), {})
+        stat = os.stat(path)
+        entry = self._digests.get(os.path.abspath(path))
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+        digest = file_digest(path)
+        self._digests[os.path.abspath(path)] = {
+            'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest,
+        }
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._digest_path(), 'w', encoding='utf-8') as f:
+            json.dump(self._digests, f, indent=2)
+        return digest
+
+    def key(self, name):
+        """Content hash identifying one version of a stage's result"""
+        if name not in self._keys:
+            stage = self.stages[name]
+            try:
+                code = inspect.getsource(stage.func)
+            except (OSError, TypeError):
+                code = getattr(stage.func, '__qualname__', repr(stage.func))
+            modules = stage_module_files(stage.func, self.module_dir)
+            payload = {
+                'stage': name,
+                'code': code,
+                'modules': {os.path.basename(path): self._file_digest(path) for path in modules},
+                'params': stage.params,
+                'files': [self._file_digest(path) for path in stage.files],
+                'outputs': stage.outputs,
+                'inputs': [self.key(upstream) for upstream in stage.inputs],
+            }
+            encoded = json.dumps(payload, sort_keys=True, default=repr).encode('utf-8')
+            self._keys[name] = hashlib.sha256(encoded).hexdigest()
+        return self._keys[name]
+
+    # Cache
+
+    def _digest_path(self):
+        return os.path.join(self.cache_dir, 'file_digests.json')
+
+    def _entry_path(self, name):
+        return os.path.join(self.cache_dir, name, self.key(name) + '.pkl')
+
+    @staticmethod
+    def _read_json(path, default):
+        if not os.path.exists(path):
+            return default
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def is_current(self, name):
+        """True when a cached result for the current key exists with its outputs"""
+        stage = self.stages[name]
+        if self.force or not stage.cache:
+            return False
+        return (os.path.exists(self._entry_path(name))
+                and all(os.path.exists(path) for path in stage.outputs))
+
+    def _store(self, name, value):
+        """Persist a result, replacing older entries of the same stage.
+
+        Only the newest entry is kept: output files on disk always belong to
+        the latest run, so older keys could not be trusted anyway.
+        """
+        entry_path = self._entry_path(name)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        for stale in glob.glob(os.path.join(os.path.dirname(entry_path), '*.pkl')):
+            if stale != entry_path:
+                os.remove(stale)
+        tmp_path = entry_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry_path)
+
+    # Execution
+
+    def value(self, name):
+        """Result of a stage, loaded from cache or computed (with its inputs)"""
+        if name in self._values:
+            return self._values[name]
+
+        stage = self.stages[name]
+        if self.is_current(name):
+            with open(self._entry_path(name), 'rb') as f:
+                result = pickle.load(f)
+            self._status[name] = 'cached'
+        else:
+            args = [self.value(upstream) for upstream in stage.inputs]
+            result, record = _profiled_call(self.profiler, name, stage.func, args, stage.params)
+            self._finish(name, result, record)
+
+        self._values[name] = result
+        return result
+
+    def _finish(self, name, result, record):
+        """Record a freshly computed result and its profile"""
+        self.log(f"✅ {name} ({record['seconds']:.2f}s)")
+        self.profiler.add(record)
+        if self.stages[name].cache:
+            self._store(name, result)
+        self._status[name] = 'ran'
+        self._values[name] = result
+
+    def run(self, targets=None, jobs=1, initializer=None):
+        """Bring the target stages (default: all) up to date.
+
+        Up-to-date targets are skipped without loading anything. With jobs > 1
+        the stale targets that no other target depends on (e.g. figures) are
+        computed in a pool of worker processes once their inputs are ready;
+        initializer runs once in each worker. Returns a dict mapping each
+        target to 'cached' or 'ran'.
+        """
+        targets = targets or list(self.stages)
+        stale = []
+        for name in targets:
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}")
+            if name not in self._values and self.is_current(name):
+                self.log(f"♻️  {name} (cached)")
+                self._status[name] = 'cached'
+            elif name not in self._values:
+                stale.append(name)
+
+        needed = {upstream for name in stale for upstream in self.stages[name].inputs}
+        leaves = [name for name in stale if name not in needed] if jobs > 1 else []
+        for name in stale:
+            if name not in leaves:
+                self.value(name)
+
+        if leaves:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(leaves)), initializer=initializer) as pool:
+                futures = {}
+                for name in leaves:
+                    stage = self.stages[name]
+                    args = [self.value(upstream) for upstream in stage.inputs]
+                    futures[pool.submit(_profiled_call, self.profiler, name, stage.func, args,
+                                        stage.params)] = name
+                for future in as_completed(futures):
+                    result, record = future.result()
+                    self._finish(futures[future], result, record)
+
+        return {name: self._status[name] for name in targets}
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Stage Instrumentation for Banking BI Analysis
+An opt-in profiler that records wall time, CPU time, peak memory and row
+counts per named stage. Results are written as JSON, as a Chrome trace
+(chrome://tracing or https://ui.perfetto.dev) and as a summary table, with an
+optional cProfile dump per stage. A disabled profiler only keeps wall time
+"""
+
+import contextlib
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+
+import psutil
+
+DEFAULT_PROFILE_DIR = 'profiles'
+RSS_SAMPLE_INTERVAL = 0.005
+
+# Only one cProfile can run per process, so nested stages are not dumped
+_cprofile_active = False
+
+
+class PeakRSS:
+    """Track the peak resident set size of this process in a sampler thread"""
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.baseline = self.peak = 0
+        self._done = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def __enter__(self):
+        self.baseline = self.peak = self.process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+        return False
+
+    @property
+    def peak_mb(self):
+        return self.peak / 1e6
+
+    @property
+    def delta_mb(self):
+        return (self.peak - self.baseline) / 1e6
+
+
+def _profile_filename(name):
+    return re.sub(r'[^\w.-]+', '_', name) + '.prof'
+
+
+class Profiler:
+    """Per-stage wall time, CPU time, peak RSS and row counts.
+
+    Use profiler.stage(name) as a context manager; the record it yields can
+    be given a row count (record['rows'] = len(df)). Stages measured in other
+    processes are taken over with add(). With cprofile_dir set, each
+    outermost stage is also run under cProfile and dumped there.
+    """
+
+    def __init__(self, enabled=True, cprofile_dir=None):
+        self.enabled = enabled
+        self.cprofile_dir = cprofile_dir if enabled else None
+        self.origin = time.time()
+        self.records = []
+
+    @contextlib.contextmanager
+    def measure(self, name, rows=None):
+        """Measure the enclosed block and yield its record without keeping it"""
+        global _cprofile_active
+        record = {'name': name, 'rows': rows, 'pid': os.getpid(), 'thread': threading.get_ident(),
+                  'start': time.time()}
+        if not self.enabled:
+            started = time.perf_counter()
+            yield record
+            record['seconds'] = time.perf_counter() - started
+            return
+
+        profile = None
+        if self.cprofile_dir and not _cprofile_active:
+            profile = cProfile.Profile()
+            _cprofile_active = True
+
+        process = psutil.Process()
+        with PeakRSS() as rss:
+            cpu_started = process.cpu_times()
+            started = time.perf_counter()
+            if profile:
+                profile.enable()
+            try:
+                yield record
+            finally:
+                if profile:
+                    profile.disable()
+                    _cprofile_active = False
+                record['seconds'] = time.perf_counter() - started
+                cpu_finished = process.cpu_times()
+
+        record.update({
+            'cpu_seconds': (cpu_finished.user - cpu_started.user) + (cpu_finished.system - cpu_started.system),
+            'peak_rss_mb': rss.peak_mb,
+            'rss_delta_mb': rss.delta_mb,
+        })
+        if profile:
+            os.makedirs(self.cprofile_dir, exist_ok=True)
+            record['cprofile'] = os.path.join(self.cprofile_dir, _profile_filename(name))
+            profile.dump_stats(record['cprofile'])
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        """Measure the enclosed block as one stage"""
+        with self.measure(name, rows) as record:
+            yield record
+        self.add(record)
+
+    def add(self, record):
+        """Keep a stage record (e.g. one measured in a worker process)"""
+        if self.enabled:
+            self.records.append(record)
+
+    # Output
+
+    def to_dict(self):
+        return {
+            'started': self.origin,
+            'wall_seconds': time.time() - self.origin,
+            'stages': self.records,
+        }
+
+    def chrome_trace(self):
+        """The records as Chrome trace 'complete' events (timestamps in microseconds)"""
+        events = []
+        for record in self.records:
+            args = {key: record[key] for key in ('rows', 'cpu_seconds', 'peak_rss_mb', 'rss_delta_mb')
+                    if record.get(key) is not None}
+            events.append({
+                'name': record['name'], 'ph': 'X', 'pid': record['pid'], 'tid': record['thread'],
+                'ts': (record['start'] - self.origin) * 1e6, 'dur': record['seconds'] * 1e6, 'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, out_dir, prefix='profile'):
+        """Write <prefix>.json and <prefix>.trace.json to out_dir; returns both paths"""
+        os.makedirs(out_dir, exist_ok=True)
+        json_path = os.path.join(out_dir, prefix + '.json')
+        trace_path = os.path.join(out_dir, prefix + '.trace.json')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+        return json_path, trace_path
+
+    def report(self, out_dir, prefix='profile', log=print):
+        """Write the profile files and log the summary table"""
+        json_path, trace_path = self.write(out_dir, prefix)
+        log("\n⏱️  STAGE PROFILE")
+        log(self.summary_table())
+        log(f"💾 Profile saved to {json_path} (Chrome trace: {trace_path})")
+        if self.cprofile_dir:
+            log(f"🔬 cProfile dumps in {self.cprofile_dir} (open with python -m pstats)")
+
+    def summary_table(self):
+        """Plain-text table of the stages, slowest first"""
+        wall = time.time() - self.origin
+        lines = [f"{'stage':<36} {'wall':>8} {'cpu':>8} {'peak MB':>9} {'rows':>12} {'share':>6}"]
+        for record in sorted(self.records, key=lambda r: r['seconds'], reverse=True):
+            rows = f"{record['rows']:,}" if record.get('rows') is not None else '-'
+            lines.append(f"{record['name']:<36} {record['seconds']:7.2f}s {record['cpu_seconds']:7.2f}s "
+                         f"{record['peak_rss_mb']:9.1f} {rows:>12} {record['seconds'] / wall:6.1%}")
+        lines.append(f"{'total wall time':<36} {wall:7.2f}s")
+        return "\n".join(lines)
+
+
+def cli_profiler(profile_dir, cprofile=False):
+    """Profiler for a command line run: enabled when a profile directory was given"""
+    if not profile_dir:
+        return Profiler(enabled=False)
+    return Profiler(cprofile_dir=os.path.join(profile_dir, 'cprofile') if cprofile else None)
+
+
+def add_profile_arguments(parser):
+    """Add the shared --profile/--cprofile options to an argparse parser"""
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_PROFILE_DIR, metavar='DIR',
+                        help=f"record per-stage time and memory to DIR (default: {DEFAULT_PROFILE_DIR}/)")
+    parser.add_argument('--cprofile', action='store_true',
+                        help="with --profile, also dump a cProfile of each stage to DIR/cprofile/")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Render Profiles for Banking BI Figures
+How figures are written to disk: file format, resolution and whether the
+saved area is trimmed to the drawn content (bbox_inches='tight', an extra
+layout pass). 'print' keeps the original 300 dpi PNGs, 'draft' is a quick
+low-resolution PNG and 'svg'/'pdf' are vector files that are far smaller
+and scale to any size
+"""
+
+import argparse
+import os
+
+RENDER_PROFILES = {
+    'print': {'format': 'png', 'dpi': 300, 'tight': True},
+    'draft': {'format': 'png', 'dpi': 100, 'tight': False},
+    'svg': {'format': 'svg', 'dpi': 100, 'tight': False},
+    'pdf': {'format': 'pdf', 'dpi': 100, 'tight': False},
+}
+DEFAULT_RENDER_PROFILE = 'print'
+
+# Leave out the creation date so rerendering unchanged data gives identical files
+_REPRODUCIBLE_METADATA = {'svg': {'Date': None}, 'pdf': {'CreationDate': None}}
+
+
+def render_profile(name=DEFAULT_RENDER_PROFILE, dpi=None, tight=None):
+    """A named render profile, optionally with its dpi or tight bounding box overridden"""
+    if name not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile: {name} (choose from {', '.join(RENDER_PROFILES)})")
+    render = dict(RENDER_PROFILES[name])
+    if dpi is not None:
+        render['dpi'] = dpi
+    if tight is not None:
+        render['tight'] = tight
+    return render
+
+
+def figure_path(path, render=None):
+    """path with the file extension of the render profile's format"""
+    render = render or RENDER_PROFILES[DEFAULT_RENDER_PROFILE]
+    return os.path.splitext(path)[0] + '.' + render['format']
+
+
+def save_figure(fig, path, render=None):
+    """Save a figure with a render profile (default: print); returns the written path"""
+    render = render or RENDER_PROFILES[DEFAULT_RENDER_PROFILE]
+    path = figure_path(path, render)
+    fig.savefig(path, format=render['format'], dpi=render['dpi'],
+                bbox_inches='tight' if render['tight'] else None,
+                metadata=_REPRODUCIBLE_METADATA.get(render['format']))
+    return path
+
+
+def add_render_arguments(parser):
+    """Add the shared --render/--dpi/--tight-bbox options to an argparse parser"""
+    parser.add_argument('--render', choices=list(RENDER_PROFILES), default=DEFAULT_RENDER_PROFILE,
+                        help=f"figure render profile (default: {DEFAULT_RENDER_PROFILE}; "
+                             f"draft = fast low-dpi PNG, svg/pdf = vector files)")
+    parser.add_argument('--dpi', type=int, help="override the render profile's resolution")
+    parser.add_argument('--tight-bbox', action=argparse.BooleanOptionalAction, default=None,
+                        help="trim saved figures to their content (extra layout pass; on for print)")
+
+
+def cli_render_profile(args):
+    """Render profile selected by the add_render_arguments options"""
+    return render_profile(args.render, args.dpi, args.tight_bbox)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Report Metrics Snapshot for Banking BI Analysis
+The executive report only needs a few KPIs and per-group rates. The analysis
+pipeline computes them once and writes them to a small JSON snapshot, so the
+report can be regenerated for any audience without rereading the raw data
+"""
+
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from data_loader import TARGET_COL, file_digest
+from metrics import (CONVERSION_FLAG, conversion_flag, conversion_rates, default_rates, group_totals,
+                     segment_group_rates)
+
+SNAPSHOT_PATH = os.path.join('metrics', 'report_metrics.json')
+# Bump when the snapshot layout changes so old snapshots are refused
+SNAPSHOT_VERSION = 2
+
+SERIES_METRICS = {
+    'job_conversion': 'job',
+    'contact_effectiveness': 'contact',
+    'month_conversion': 'month',
+    'age_risk': 'age_group',
+    'limit_risk': 'limit_group',
+    'payment_risk': 'PAY_0',
+    'ratio_risk': 'ratio_group',
+    'util_risk': 'util_group',
+}
+
+
+MARKETING_KEYS = ['job', 'contact', 'month']
+CREDIT_KEYS = ['age_group', 'limit_group', 'PAY_0', 'ratio_group', 'util_group']
+
+
+def _marketing_metrics(records, conversion, rates):
+    return {
+        'marketing_records': records,
+        'marketing_conversion': conversion,
+        'job_conversion': rates['job'].sort_values(ascending=False),
+        'contact_effectiveness': rates['contact'],
+        'month_conversion': rates['month'],
+    }
+
+
+def _credit_metrics(records, default_rate, rates):
+    return {
+        'credit_records': records,
+        'credit_default_rate': default_rate,
+        'age_risk': rates['age_group'],
+        'limit_risk': rates['limit_group'],
+        'payment_risk': rates['PAY_0'],
+        'ratio_risk': rates['ratio_group'],
+        'util_risk': rates['util_group'],
+    }
+
+
+def marketing_metrics(bank_marketing):
+    """Marketing KPIs and conversion rates behind the executive report"""
+    rates = conversion_rates(bank_marketing, MARKETING_KEYS)
+    return _marketing_metrics(len(bank_marketing), conversion_flag(bank_marketing).mean(), rates)
+
+
+def credit_metrics(credit_default):
+    """Credit KPIs and default rates behind the executive report.
+
+    Expects the columns added by features.add_credit_features.
+    """
+    return _credit_metrics(len(credit_default), credit_default[TARGET_COL].mean(),
+                           default_rates(credit_default, CREDIT_KEYS))
+
+
+def report_metrics(bank_marketing, credit_default):
+    """KPIs and group rates behind the executive report.
+
+    Returns the same keys as streaming_metrics.stream_analysis_metrics.
+    """
+    return {**marketing_metrics(bank_marketing), **credit_metrics(credit_default)}
+
+
+def _segment_marketing_metrics(bank_marketing, column):
+    converted = conversion_flag(bank_marketing)
+    index, sums, counts = group_totals(bank_marketing[column], converted)
+    rates = segment_group_rates(bank_marketing, column, MARKETING_KEYS, CONVERSION_FLAG, values=converted)
+    return {value: _marketing_metrics(int(rows), total / rows, rates[value])
+            for value, total, rows in zip(index, sums, counts)}
+
+
+def _segment_credit_metrics(credit_default, column):
+    index, sums, counts = group_totals(credit_default[column], credit_default[TARGET_COL])
+    rates = segment_group_rates(credit_default, column, CREDIT_KEYS, TARGET_COL)
+    return {value: _credit_metrics(int(rows), total / rows, rates[value])
+            for value, total, rows in zip(index, sums, counts)}
+
+
+def variant_metrics(bank_marketing, credit_default, column):
+    """Report metrics per value of one column, from a single grouped pass.
+
+    column may come from either dataset. Its rates are counted per
+    (segment, key) in one bincount per key, so hundreds of segments cost
+    about as much as one report; the other dataset's metrics are shared by
+    every variant. Returns {value: metrics} for the observed values.
+    """
+    if column in bank_marketing.columns:
+        shared, segments = credit_metrics(credit_default), _segment_marketing_metrics(bank_marketing, column)
+    elif column in credit_default.columns:
+        shared, segments = marketing_metrics(bank_marketing), _segment_credit_metrics(credit_default, column)
+    else:
+        raise ValueError(f"Unknown variant column: {column}")
+    return {value: {**shared, **metrics} for value, metrics in segments.items()}
+
+
+def _series_to_json(series):
+    return {'index': [str(label) for label in series.index], 'values': [float(v) for v in series.values]}
+
+
+def save_snapshot(metrics, path=SNAPSHOT_PATH, sources=()):
+    """Write report metrics to a JSON snapshot; sources are the data files they came from"""
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'sources': {source: file_digest(source) for source in sources},
+        'kpis': {key: value.item() if hasattr(value, 'item') else value
+                 for key, value in metrics.items() if key not in SERIES_METRICS},
+        'series': {key: _series_to_json(metrics[key]) for key in SERIES_METRICS if key in metrics},
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def stale_sources(sources):
+    """Source files whose contents no longer match the digests recorded in a snapshot.
+
+    Files that are not present cannot be checked (the snapshot may have been
+    copied without the raw data) and are not reported.
+    """
+    return [source for source, digest in sources.items()
+            if os.path.exists(source) and file_digest(source) != digest]
+
+
+def load_snapshot(path=SNAPSHOT_PATH, allow_stale=False):
+    """Report metrics from a snapshot, with the group rates as Series again.
+
+    The data files the snapshot was computed from are checked against their
+    recorded SHA-256 digests; if any changed since, ValueError is raised
+    unless allow_stale, in which case they are listed in
+    metrics['snapshot']['stale'].
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"{path} was written by another version; rerun run_epic_analysis.py")
+    stale = stale_sources(snapshot['sources'])
+    if stale and not allow_stale:
+        raise ValueError(f"{path} is out of date: {', '.join(stale)} changed since it was written; "
+                         f"rerun run_epic_analysis.py (or pass --allow-stale)")
+
+    metrics = dict(snapshot['kpis'])
+    for key, series in snapshot['series'].items():
+        metrics[key] = pd.Series(series['values'], index=series['index'], name=SERIES_METRICS[key])
+    metrics['snapshot'] = {'path': path, 'created': snapshot['created'], 'sources': snapshot['sources'],
+                           'stale': stale}
+    return metrics
+
+
+def write_report_metrics(bank_marketing, credit_default, path=SNAPSHOT_PATH, sources=()):
+    """Compute the report metrics and write their snapshot (a run_epic_analysis.py stage)"""
+    return save_snapshot(report_metrics(bank_marketing, credit_default), path, sources)
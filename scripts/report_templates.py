@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Report Templates for Banking BI Analysis
+Jinja2 templates (scripts/templates/) for the executive report and the
+dashboard's narrative blocks. Every figure in the text is bound to the
+computed metrics or to the planning assumptions below, so the wording can
+no longer drift from the data. Templates are compiled once per process and
+can be rendered for many report variants from one metrics pass
+"""
+
+import os
+from datetime import datetime
+from functools import lru_cache
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+
+from features import UTILIZATION_CUTOFF
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+# Planning assumptions behind the recommendations: budget levers, targets
+# and financial projections the data cannot measure; fractions are relative
+# changes. Conversion lifts the data can measure are derived in report_context
+PLAN = {
+    'segment_budget_share': 0.40,
+    'targeting_roi_lift': 0.25,
+    'age_screening_default_cut': 0.18,
+    'utilization_default_cut': 0.12,
+    'early_warning_coverage': 0.85,
+    'revenue_gain': 2_300_000,
+    'loss_prevention': 1_800_000,
+    'cost_savings': 900_000,
+    'investment': {
+        'Technology Infrastructure': 800_000,
+        'Staff Training & Development': 200_000,
+        'Process Redesign': 150_000,
+    },
+    'conversion_target': 0.25,
+    'acquisition_cost_cut': 0.20,
+    'campaign_roi_target': 0.35,
+    'default_rate_cut': 0.15,
+    'risk_adjusted_return_target': 0.18,
+}
+
+# Smallest gap in conversion rate between the best and worst contact method
+# that earns a channel recommendation; closer methods are reported as alike
+MIN_CONTACT_GAP = 0.02
+
+
+def pct(value, digits=1):
+    return f"{value:.{digits}%}"
+
+
+def change(value, digits=0):
+    return f"{value:+.{digits}%}"
+
+
+def count(value):
+    return f"{value:,}"
+
+
+def times(value):
+    return f"{value:.1f}x" if value < 10 else f"{value:.0f}x"
+
+
+def points(value, digits=1):
+    return f"{value * 100:.{digits}f} percentage points"
+
+
+def money(value):
+    if abs(value) < 1e6:
+        return f"${value / 1e3:,.0f}K"
+    millions = f"{value / 1e6:.2f}"
+    return f"${millions[:-1] if millions.endswith('0') else millions}M"
+
+
+@lru_cache(maxsize=None)
+def environment():
+    """Jinja2 environment shared by all renders; compiled templates are cached in it"""
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), undefined=StrictUndefined,
+                      keep_trailing_newline=True, auto_reload=False)
+    env.filters.update({'pct': pct, 'change': change, 'count': count, 'times': times, 'points': points,
+                        'money': money})
+    return env
+
+
+def _ratio(numerator, denominator):
+    """numerator / denominator, or None when there is nothing to compare against (a 0% rate).
+
+    Templates leave the comparison out for None rather than printing inf.
+    """
+    return numerator / denominator if denominator else None
+
+
+def _lift(rate, baseline):
+    """Relative improvement of rate over baseline (None for a 0% baseline)"""
+    ratio = _ratio(rate, baseline)
+    return None if ratio is None else ratio - 1
+
+
+def month_name(abbreviation):
+    """'oct' -> 'October'"""
+    return datetime.strptime(abbreviation, '%b').strftime('%B')
+
+
+def report_context(metrics, plan=PLAN, variant=None, generated_on=None, min_contact_gap=MIN_CONTACT_GAP):
+    """Template variables derived from report metrics (see report_metrics.report_metrics).
+
+    The projected segment lift follows from the measured rates: moving
+    plan['segment_budget_share'] of contacts to the best job segment. A
+    contact method is only recommended when its conversion rate beats the
+    worst method's by at least min_contact_gap.
+    """
+    jobs = metrics['job_conversion'].dropna().sort_values(ascending=False)
+    contacts = metrics['contact_effectiveness'].dropna().sort_values(ascending=False)
+    # 'unknown' is missing data, not a contact method to compare against
+    # (unless a segment, such as the contact='unknown' variant, has nothing else)
+    known = contacts.drop('unknown', errors='ignore')
+    contacts = known if len(known) else contacts
+    months = metrics['month_conversion'].dropna()
+    age_risk = metrics['age_risk'].dropna()
+    conversion = metrics['marketing_conversion']
+
+    segment_multiple = _ratio(jobs.iloc[0], conversion)
+    contact_gap = contacts.iloc[0] - contacts.iloc[-1]
+
+    investment = sum(plan['investment'].values())
+    annual_impact = plan['revenue_gain'] + plan['loss_prevention'] + plan['cost_savings']
+    return {
+        'marketing_records': int(metrics['marketing_records']),
+        'credit_records': int(metrics['credit_records']),
+        'marketing_conversion': conversion,
+        'credit_default_rate': metrics['credit_default_rate'],
+        'non_conversion': 1 - conversion,
+        'best_job': str(jobs.index[0]),
+        'best_job_rate': jobs.iloc[0],
+        'segment_multiple': segment_multiple,
+        'segment_conversion_lift': (None if segment_multiple is None
+                                    else plan['segment_budget_share'] * (segment_multiple - 1)),
+        'best_contact': str(contacts.index[0]),
+        'best_contact_rate': contacts.iloc[0],
+        'worst_contact': str(contacts.index[-1]),
+        'worst_contact_rate': contacts.iloc[-1],
+        'contact_lift': _lift(contacts.iloc[0], contacts.iloc[-1]),
+        'contact_gap': contact_gap,
+        'contact_preferred': bool(len(contacts) > 1 and contact_gap >= min_contact_gap),
+        'min_contact_gap': min_contact_gap,
+        'peak_month_name': month_name(str(months.idxmax())),
+        'peak_month_rate': months.max(),
+        'peak_month_multiple': _ratio(months.max(), conversion),
+        'riskiest_age': str(age_risk.idxmax()),
+        'riskiest_age_rate': age_risk.max(),
+        'utilization_cutoff': UTILIZATION_CUTOFF,
+        'plan': plan,
+        'investment': investment,
+        'annual_impact': annual_impact,
+        'roi_multiple': annual_impact / investment,
+        'payback_months': investment / annual_impact * 12,
+        'variant': variant,
+        'generated_on': generated_on or datetime.now().strftime('%B %d, %Y'),
+    }
+
+
+def render(template_name, context):
+    """Render one template with a context from report_context"""
+    return environment().get_template(template_name).render(context)
+
+
+def render_block(template_name, block, context):
+    """Render one macro (e.g. a dashboard HTML block) of a template"""
+    module = environment().get_template(template_name).make_module(context)
+    return str(getattr(module, block)())
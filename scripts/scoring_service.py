@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Online Scoring Service for Banking BI Analysis
+A small Tornado application that keeps the credit model warm in memory and
+scores single customers or micro-batches over HTTP. Concurrent requests are
+coalesced into one vectorized model call, and request latencies are tracked
+for p50/p99 reporting
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+import tornado.web
+
+from features import RISK_LEVELS, risk_codes
+from modeling import CREDIT_DTYPE, CREDIT_FEATURES, CREDIT_RAW_FEATURES, fill_credit_ratios, predict_proba
+from scoring import DEFAULT_THRESHOLD
+
+# Raw columns a request must provide (the ratios are derived from them)
+REQUIRED_COLUMNS = CREDIT_RAW_FEATURES
+_PAY_0 = REQUIRED_COLUMNS.index('PAY_0')
+
+MAX_BATCH_SIZE = 256
+# Larger batches belong with the batch scorer (score_customers.py); a request
+# is parsed and scored on the event loop, so an unbounded one stalls every other
+MAX_REQUEST_ROWS = 1000
+MAX_WAIT_MS = 0.0
+LATENCY_WINDOW = 10_000
+
+
+class LatencyTracker:
+    """Rolling window of request latencies with percentile summaries"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, milliseconds, ok=True):
+        self.latencies.append(milliseconds)
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self):
+        """Request counts and p50/p99/max latency (ms) over the window"""
+        summary = {'requests': self.requests, 'errors': self.errors, 'window': len(self.latencies)}
+        if self.latencies:
+            p50, p99 = np.percentile(np.fromiter(self.latencies, dtype='float64'), [50, 99])
+            summary.update({'p50_ms': round(p50, 3), 'p99_ms': round(p99, 3),
+                            'max_ms': round(max(self.latencies), 3)})
+        return summary
+
+
+class MicroBatcher:
+    """Coalesce concurrent scoring requests into one model call.
+
+    score maps a stacked array of rows to a tuple of row-aligned arrays; each
+    request gets back its own slice of every output. Requests already queued
+    are always taken together; when max_wait_ms is positive the batcher also
+    waits that long for more to arrive, trading a little latency for
+    throughput under load. Batches stop growing at max_batch_size rows.
+    """
+
+    def __init__(self, score, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.score = score
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.rows = 0
+        self._queue = None
+        self._task = None
+
+    async def submit(self, customers):
+        """Score an array of customer rows together with any concurrent requests"""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.ensure_future(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((customers, future))
+        return await future
+
+    async def _collect(self):
+        items = [await self._queue.get()]
+        rows = len(items[0][0])
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while rows < self.max_batch_size:
+            if not self._queue.empty():
+                item = self._queue.get_nowait()
+            else:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            items.append(item)
+            rows += len(item[0])
+        return items
+
+    async def _run(self):
+        while True:
+            items = await self._collect()
+            try:
+                outputs = self.score(np.concatenate([customers for customers, _ in items]))
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.rows += len(outputs[0])
+            offset = 0
+            for customers, future in items:
+                if not future.done():
+                    future.set_result(tuple(output[offset:offset + len(customers)] for output in outputs))
+                offset += len(customers)
+
+    def summary(self):
+        return {'batches': self.batches, 'rows': self.rows,
+                'mean_batch_rows': round(self.rows / self.batches, 2) if self.batches else 0.0}
+
+
+class TooManyCustomers(ValueError):
+    """A request holds more customers than the service scores in one call"""
+
+
+def parse_customers(body, max_rows=MAX_REQUEST_ROWS):
+    """Customer IDs and raw feature rows from a request body.
+
+    Accepts one customer object, a list of them, or {"customers": [...]}.
+    Returns (ids, rows) with rows as a float array in REQUIRED_COLUMNS order;
+    IDs are None where not given. Raises ValueError when the body is
+    malformed, columns are missing or values are not numeric, and
+    TooManyCustomers (a ValueError) when it has more than max_rows customers.
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise ValueError("Request body must be JSON")
+    if isinstance(payload, dict):
+        payload = payload.get('customers', [payload])
+    if not isinstance(payload, list) or not payload or not all(isinstance(row, dict) for row in payload):
+        raise ValueError("Expected a customer object, a list of them or {\"customers\": [...]}")
+    if max_rows is not None and len(payload) > max_rows:
+        raise TooManyCustomers(f"{len(payload):,} customers in one request; the limit is {max_rows:,} "
+                               f"(use score_customers.py for large batches)")
+
+    try:
+        rows = np.array([[row[col] for col in REQUIRED_COLUMNS] for row in payload], dtype='float64')
+    except KeyError:
+        missing = [col for col in REQUIRED_COLUMNS if any(col not in row for row in payload)]
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    except (TypeError, ValueError):
+        raise ValueError("Customer columns must be numeric")
+    return [row.get('ID') for row in payload], rows
+
+
+def feature_matrix(rows):
+    """Model inputs in CREDIT_FEATURES order from raw request rows.
+
+    Fills the same float32 matrix as modeling.credit_matrix, without
+    building a DataFrame per request.
+    """
+    X = np.empty((len(rows), len(CREDIT_FEATURES)), dtype=CREDIT_DTYPE)
+    X[:, :len(REQUIRED_COLUMNS)] = rows
+    return fill_credit_ratios(X)
+
+
+def score_rows(bundle, rows, threshold=DEFAULT_THRESHOLD):
+    """Default probability and risk level code for raw request rows"""
+    X = feature_matrix(rows)
+    probability = predict_proba(bundle, X)
+    codes = risk_codes(rows[:, _PAY_0], X[:, len(REQUIRED_COLUMNS)], probability >= threshold)
+    return probability, codes
+
+
+class _ServiceHandler(tornado.web.RequestHandler):
+
+    def initialize(self, service):
+        self.service = service
+
+    def prepare(self):
+        self._started = time.perf_counter()
+
+    def on_finish(self):
+        if self.request.path == '/score':
+            elapsed_ms = (time.perf_counter() - self._started) * 1000
+            self.service['latency'].record(elapsed_ms, ok=self.get_status() < 400)
+
+
+class ScoreHandler(_ServiceHandler):
+    """POST /score: default probability and risk profile per customer"""
+
+    async def post(self):
+        try:
+            ids, rows = parse_customers(self.request.body, self.service['max_request_rows'])
+        except TooManyCustomers as e:
+            self.set_status(413)
+            self.write({'error': str(e)})
+            return
+        except ValueError as e:
+            self.set_status(400)
+            self.write({'error': str(e)})
+            return
+        probability, codes = await self.service['batcher'].submit(rows)
+        scores = []
+        for customer_id, p, code in zip(ids, probability.tolist(), codes.tolist()):
+            score = {'default_probability': round(p, 6), 'risk_profile': RISK_LEVELS[code]}
+            scores.append(score if customer_id is None else {'ID': customer_id, **score})
+        self.write({'scores': scores})
+
+
+class MetricsHandler(_ServiceHandler):
+    """GET /metrics: latency percentiles and batching statistics"""
+
+    def get(self):
+        self.write({
+            'model': self.service['model'],
+            'latency': self.service['latency'].summary(),
+            'batching': self.service['batcher'].summary(),
+        })
+
+
+class HealthHandler(_ServiceHandler):
+    """GET /health: liveness check"""
+
+    def get(self):
+        self.write({'status': 'ok'})
+
+
+def make_app(bundle, threshold=DEFAULT_THRESHOLD, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS,
+             max_request_rows=MAX_REQUEST_ROWS):
+    """Tornado application serving /score, /metrics and /health for a credit model bundle.
+
+    Requests with more than max_request_rows customers get a 413 response.
+    """
+    if bundle.get('kind') != 'credit' or bundle['features'] != CREDIT_FEATURES:
+        raise ValueError("The scoring API needs a credit model trained on modeling.CREDIT_FEATURES")
+
+    def score(rows):
+        return score_rows(bundle, rows, threshold)
+
+    # Warm up with one synthetic customer so the first request pays no setup cost
+    score(np.ones((1, len(REQUIRED_COLUMNS))))
+
+    service = {
+        'model': {'name': bundle['name'], 'roc_auc': round(bundle['metrics']['roc_auc'], 4),
+                  'threshold': threshold},
+        'batcher': MicroBatcher(score, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms),
+        'latency': LatencyTracker(),
+        'max_request_rows': max_request_rows,
+    }
+    return tornado.web.Application([
+        (r'/score', ScoreHandler, {'service': service}),
+        (r'/metrics', MetricsHandler, {'service': service}),
+        (r'/health', HealthHandler, {'service': service}),
+    ])
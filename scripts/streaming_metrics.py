@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Streaming Metrics for Banking BI Analysis
+Computes the conversion and default-rate KPIs by reading the CSVs in bounded
+chunks and folding each chunk into mergeable (sum, count) accumulators, so the
+nightly report runs with flat memory on extracts larger than RAM
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_loader import (
+    BANK_MARKETING_PATH, BANK_MARKETING_SCHEMA, BILL_COLS,
+    CREDIT_DEFAULT_PATH, CREDIT_DEFAULT_SCHEMA, TARGET_COL, read_csv_typed,
+)
+from metrics import group_totals
+from features import AGE_BINS, AGE_LABELS, LEVEL_LABELS
+
+DEFAULT_CHUNKSIZE = 250_000
+
+MARKETING_KEYS = ['job', 'contact', 'month']
+
+
+class RateAccumulator:
+    """Running (sum, count) totals per group key that can be merged"""
+
+    def __init__(self):
+        self.sums = pd.Series(dtype='float64')
+        self.counts = pd.Series(dtype='int64')
+
+    def update(self, keys, values):
+        """Fold one chunk of (group key, value) pairs into the totals"""
+        index, sums, counts = group_totals(keys, values)
+        index = np.asarray(index)
+        self._add(pd.Series(sums, index=index), pd.Series(counts, index=index))
+
+    def merge(self, other):
+        """Fold another accumulator's totals into this one"""
+        self._add(other.sums, other.counts)
+        return self
+
+    def _add(self, sums, counts):
+        self.sums = self.sums.add(sums.astype('float64'), fill_value=0)
+        self.counts = self.counts.add(counts, fill_value=0).astype('int64')
+
+    def rates(self, order=None):
+        """Mean value per key, optionally arranged in a fixed key order"""
+        result = self.sums / self.counts
+        if order is not None:
+            result = result.reindex(order).dropna()
+            result.index = pd.CategoricalIndex(result.index, categories=order, ordered=True)
+        return result
+
+    def total_rate(self):
+        return self.sums.sum() / self.counts.sum() if self.counts.sum() else float('nan')
+
+    def total_count(self):
+        return int(self.counts.sum())
+
+
+def equal_width_edges(lo, hi, bins):
+    """Bin edges identical to those pd.cut builds for an integer bin count"""
+    if lo == hi:
+        lo -= 0.001 * abs(lo) if lo != 0 else 0.001
+        hi += 0.001 * abs(hi) if hi != 0 else 0.001
+        return np.linspace(lo, hi, bins + 1, endpoint=True)
+    edges = np.linspace(lo, hi, bins + 1, endpoint=True)
+    edges[0] -= (hi - lo) * 0.001
+    return edges
+
+
+def _credit_features(chunk):
+    """Per-chunk derived columns used by the default-rate metrics"""
+    avg_bill = chunk[BILL_COLS].mean(axis=1)
+    return pd.DataFrame({
+        'LIMIT_BAL': chunk['LIMIT_BAL'],
+        'credit_utilization': avg_bill / chunk['LIMIT_BAL'],
+        'bill_pay_ratio': chunk['BILL_AMT1'] / (chunk['PAY_AMT1'] + 1),
+    })
+
+
+def iter_chunks(path, schema, usecols, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield typed DataFrame chunks holding only the requested columns"""
+    return read_csv_typed(path, schema, usecols=usecols, chunksize=chunksize)
+
+
+def stream_marketing_metrics(path=BANK_MARKETING_PATH, keys=MARKETING_KEYS,
+                             chunksize=DEFAULT_CHUNKSIZE):
+    """Conversion rate per key for the marketing dataset in one chunked pass"""
+    accumulators = {key: RateAccumulator() for key in keys}
+    overall = RateAccumulator()
+
+    for chunk in iter_chunks(path, BANK_MARKETING_SCHEMA, list(keys) + ['y'], chunksize):
+        converted = (chunk['y'] == 'yes').to_numpy(dtype='uint8')
+        overall.update(np.zeros(len(chunk), dtype='int8'), converted)
+        for key, accumulator in accumulators.items():
+            accumulator.update(chunk[key], converted)
+
+    return overall, accumulators
+
+
+def scan_credit_ranges(path=CREDIT_DEFAULT_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """First pass: global min/max of the columns binned with pd.cut(bins=5)"""
+    usecols = ['LIMIT_BAL', 'BILL_AMT1', 'PAY_AMT1'] + BILL_COLS[1:]
+    ranges = {}
+    for chunk in iter_chunks(path, CREDIT_DEFAULT_SCHEMA, usecols, chunksize):
+        features = _credit_features(chunk)
+        for col in features.columns:
+            lo, hi = features[col].min(), features[col].max()
+            if col in ranges:
+                lo, hi = min(lo, ranges[col][0]), max(hi, ranges[col][1])
+            ranges[col] = (lo, hi)
+    return ranges
+
+
+def stream_credit_metrics(path=CREDIT_DEFAULT_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """Default rate per age, limit, PAY_0, bill/pay ratio and utilization group.
+
+    Makes two chunked passes: one for the equal-width bin edges, one to fold
+    every chunk into the per-group accumulators.
+    """
+    ranges = scan_credit_ranges(path, chunksize)
+    edges = {col: equal_width_edges(lo, hi, len(LEVEL_LABELS)) for col, (lo, hi) in ranges.items()}
+
+    accumulators = {name: RateAccumulator() for name in
+                    ['age_risk', 'limit_risk', 'payment_risk', 'ratio_risk', 'util_risk']}
+    overall = RateAccumulator()
+
+    usecols = ['LIMIT_BAL', 'AGE', 'PAY_0', 'PAY_AMT1', TARGET_COL] + BILL_COLS
+    for chunk in iter_chunks(path, CREDIT_DEFAULT_SCHEMA, usecols, chunksize):
+        defaulted = chunk[TARGET_COL].to_numpy()
+        features = _credit_features(chunk)
+        overall.update(np.zeros(len(chunk), dtype='int8'), defaulted)
+
+        groups = {
+            'age_risk': pd.cut(chunk['AGE'], bins=AGE_BINS, labels=AGE_LABELS),
+            'limit_risk': pd.cut(features['LIMIT_BAL'], bins=edges['LIMIT_BAL'], labels=LEVEL_LABELS),
+            'payment_risk': chunk['PAY_0'],
+            'ratio_risk': pd.cut(features['bill_pay_ratio'], bins=edges['bill_pay_ratio'], labels=LEVEL_LABELS),
+            'util_risk': pd.cut(features['credit_utilization'], bins=edges['credit_utilization'], labels=LEVEL_LABELS),
+        }
+        for name, keys in groups.items():
+            accumulators[name].update(keys, defaulted)
+
+    return overall, accumulators
+
+
+def stream_analysis_metrics(marketing_path=BANK_MARKETING_PATH, credit_path=CREDIT_DEFAULT_PATH,
+                            chunksize=DEFAULT_CHUNKSIZE):
+    """Streaming counterpart of BankingReportGenerator.load_analysis_data.
+
+    Returns the same KPI keys plus record counts, without the raw DataFrames.
+    """
+    marketing_overall, marketing = stream_marketing_metrics(marketing_path, chunksize=chunksize)
+    credit_overall, credit = stream_credit_metrics(credit_path, chunksize=chunksize)
+
+    return {
+        'marketing_records': marketing_overall.total_count(),
+        'credit_records': credit_overall.total_count(),
+        'marketing_conversion': marketing_overall.total_rate(),
+        'credit_default_rate': credit_overall.total_rate(),
+        'job_conversion': marketing['job'].rates().sort_values(ascending=False),
+        'contact_effectiveness': marketing['contact'].rates(),
+        'month_conversion': marketing['month'].rates(),
+        'age_risk': credit['age_risk'].rates(order=AGE_LABELS),
+        'limit_risk': credit['limit_risk'].rates(order=LEVEL_LABELS),
+        'payment_risk': credit['payment_risk'].rates(),
+        'ratio_risk': credit['ratio_risk'].rates(order=LEVEL_LABELS),
+        'util_risk': credit['util_risk'].rates(order=LEVEL_LABELS),
+    }
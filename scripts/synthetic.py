@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator for Banking BI Analysis
+Learns a compact profile from each shipped dataset and draws any number of
+realistic rows from it. A driver column is sampled from its marginal, the
+target from its rate given the driver (job -> y, PAY_0 -> default), and the
+remaining columns from a real donor row in the same (driver, target) stratum
+with small jitter, so joint structure such as the six-month BILL_AMT/PAY_AMT
+sequences survives. Output is generated in independently seeded chunks on a
+process pool and streamed to CSV or Parquet; a given seed always produces the
+same file, whatever the number of workers
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_loader import (BANK_MARKETING_SCHEMA, BILL_COLS, CREDIT_DEFAULT_SCHEMA, PAY_AMT_COLS, TARGET_COL,
+                         ChunkWriter, load_bank_marketing, load_credit_default)
+
+DEFAULT_SEED = 42
+GENERATOR_CHUNK_SIZE = 250_000
+# Log-normal sigma of the per-row scale applied to monetary amounts
+AMOUNT_JITTER = 0.1
+# Ages move by up to this many years, within the observed range
+AGE_COLUMNS = {'marketing': 'age', 'credit': 'AGE'}
+AGE_JITTER = {'marketing': 2, 'credit': 1}
+
+
+def fit_profile(df, kind, driver, target, positive, schema):
+    """Sampling profile of a dataset: driver marginal, target rate per driver and donor rows.
+
+    Donor rows are sorted by (driver, target) stratum so a stratum is a
+    contiguous slice described by its start and count.
+    """
+    driver_codes, driver_values = pd.factorize(df[driver], sort=True)
+    is_positive = (df[target] == positive).to_numpy()
+    n_drivers = len(driver_values)
+
+    driver_counts = np.bincount(driver_codes, minlength=n_drivers)
+    positives = np.bincount(driver_codes, weights=is_positive, minlength=n_drivers)
+    strata = driver_codes * 2 + is_positive
+    order = np.argsort(strata, kind='stable')
+    counts = np.bincount(strata, minlength=2 * n_drivers)
+
+    return {
+        'kind': kind,
+        'schema': schema,
+        'driver': driver,
+        'driver_p': driver_counts / driver_counts.sum(),
+        'target_rate': positives / driver_counts,
+        'donors': df.iloc[order].reset_index(drop=True),
+        'starts': np.concatenate([[0], np.cumsum(counts)[:-1]]),
+        'counts': counts,
+        'age_range': (int(df[AGE_COLUMNS[kind]].min()), int(df[AGE_COLUMNS[kind]].max())),
+    }
+
+
+def fit_marketing_profile(bank_marketing):
+    """Profile of the bank marketing data: job marginal and subscription rate per job"""
+    return fit_profile(bank_marketing, 'marketing', 'job', 'y', 'yes', BANK_MARKETING_SCHEMA)
+
+
+def fit_credit_profile(credit_default):
+    """Profile of the credit data: PAY_0 marginal and default rate per repayment status"""
+    return fit_profile(credit_default, 'credit', 'PAY_0', TARGET_COL, 1, CREDIT_DEFAULT_SCHEMA)
+
+
+LOADERS = {'marketing': load_bank_marketing, 'credit': load_credit_default}
+PROFILE_BUILDERS = {'marketing': fit_marketing_profile, 'credit': fit_credit_profile}
+
+
+def _scaled(values, factor):
+    return np.round(values * factor)
+
+
+def generate_chunk(profile, rows, seed, start=0):
+    """Draw rows synthetic records; start is the position of the first row in the output"""
+    rng = np.random.default_rng(seed)
+    driver = rng.choice(len(profile['driver_p']), size=rows, p=profile['driver_p'])
+    positive = rng.random(rows) < profile['target_rate'][driver]
+    strata = driver * 2 + positive
+    donors = profile['starts'][strata] + (rng.random(rows) * profile['counts'][strata]).astype('int64')
+    chunk = profile['donors'].iloc[donors].reset_index(drop=True)
+
+    kind = profile['kind']
+    age = AGE_COLUMNS[kind]
+    low, high = profile['age_range']
+    spread = AGE_JITTER[kind]
+    chunk[age] = np.clip(chunk[age].to_numpy(dtype='int64') + rng.integers(-spread, spread + 1, rows), low, high)
+
+    if kind == 'marketing':
+        chunk['balance'] = _scaled(chunk['balance'].to_numpy(dtype='float64'),
+                                   rng.lognormal(0, AMOUNT_JITTER, rows))
+        chunk['duration'] = _scaled(chunk['duration'].to_numpy(dtype='float64'),
+                                    rng.lognormal(0, AMOUNT_JITTER, rows))
+    else:
+        # One factor per customer keeps the shape of the bill and payment history
+        factor = rng.lognormal(0, AMOUNT_JITTER, rows)[:, None]
+        amounts = BILL_COLS + PAY_AMT_COLS
+        chunk[amounts] = _scaled(chunk[amounts].to_numpy(dtype='float64'), factor)
+        chunk['ID'] = np.arange(start + 1, start + rows + 1)
+
+    return chunk.astype(profile['schema'])
+
+
+_worker_profile = None
+
+
+def _init_worker(profile):
+    global _worker_profile
+    _worker_profile = profile
+
+
+def _worker_chunk(rows, seed, start):
+    return generate_chunk(_worker_profile, rows, seed, start)
+
+
+def chunk_plan(rows, seed=DEFAULT_SEED, chunk_size=GENERATOR_CHUNK_SIZE):
+    """(rows, seed, start) per chunk; each chunk gets its own spawned seed"""
+    starts = range(0, rows, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    return [(min(chunk_size, rows - start), child, start) for start, child in zip(starts, seeds)]
+
+
+def iter_synthetic(profile, rows, seed=DEFAULT_SEED, chunk_size=GENERATOR_CHUNK_SIZE, jobs=1):
+    """Yield synthetic chunks in order, generating up to jobs chunks in parallel.
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    by the chunk size rather than the total row count.
+    """
+    plan = chunk_plan(rows, seed, chunk_size)
+    if jobs <= 1:
+        for chunk_rows, chunk_seed, start in plan:
+            yield generate_chunk(profile, chunk_rows, chunk_seed, start)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(profile,)) as executor:
+        pending = deque()
+        for task in plan:
+            pending.append(executor.submit(_worker_chunk, *task))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_synthetic(kind, rows, path, seed=DEFAULT_SEED, chunk_size=GENERATOR_CHUNK_SIZE, jobs=1,
+                    source=None, log=print):
+    """Generate rows synthetic records of a dataset ('marketing' or 'credit') into a CSV or Parquet file.
+
+    The profile is learned from source (default: the shipped dataset).
+    Returns rows, chunks, seconds and rows_per_sec.
+    """
+    data = LOADERS[kind](source) if source else LOADERS[kind]()
+    profile = PROFILE_BUILDERS[kind](data)
+
+    tmp_path = path + '.tmp' + os.path.splitext(path)[1]
+    writer = ChunkWriter(tmp_path)
+    written = chunks = 0
+    started = time.perf_counter()
+    try:
+        for chunk in iter_synthetic(profile, rows, seed, chunk_size, jobs):
+            writer.write(chunk)
+            written += len(chunk)
+            chunks += 1
+            elapsed = time.perf_counter() - started
+            log(f"   chunk {chunks}: {written:,} rows written ({written / elapsed:,.0f} rows/sec)")
+    finally:
+        writer.close()
+    os.replace(tmp_path, path)
+
+    seconds = time.perf_counter() - started
+    return {
+        'rows': written,
+        'chunks': chunks,
+        'seconds': seconds,
+        'rows_per_sec': written / seconds if seconds else float(np.inf),
+    }
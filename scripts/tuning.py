@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter Search for Banking BI Models
+Successive halving over the marketing and credit model search spaces: every
+candidate is cross-validated on a small sample of rows, the best 1/factor of
+them move on to factor times as many rows (HALVING_FACTOR, 3 by default), and
+so on until the survivors are scored on all of the data. Folds run on a pool
+of worker processes that share one memory-mapped copy of the model matrix,
+and every fold's score is cached on disk under its parameters, rows and a
+hash of the data, so an interrupted or widened search only computes the
+folds it has not seen
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+from threadpoolctl import threadpool_limits
+
+from data_loader import TARGET_COL
+from modeling import RANDOM_STATE, credit_estimator, credit_features, marketing_estimator, marketing_features
+
+TUNING_CACHE_DIR = os.path.join('.cache', 'tuning')
+LEADERBOARD_DIR = os.path.join('report', 'tuning')
+
+# Bump when the fold evaluation changes so cached scores are not reused
+CACHE_VERSION = 1
+
+CV_FOLDS = 3
+HALVING_FACTOR = 3
+MIN_ROWS = 500
+
+SEARCH_SPACES = {
+    'marketing': {
+        'n_estimators': [100, 200, 400],
+        'min_samples_leaf': [1, 2, 5],
+        'max_features': ['sqrt', 0.5],
+        'max_depth': [None, 16],
+    },
+    'credit': {
+        'learning_rate': [0.03, 0.05, 0.1],
+        'max_leaf_nodes': [15, 31, 63],
+        'min_samples_leaf': [20, 50, 100],
+        'l2_regularization': [0.0, 1.0],
+    },
+}
+
+
+# Data
+
+def model_data(kind, frame):
+    """Model input matrix and 0/1 target of a marketing or credit frame"""
+    if kind == 'marketing':
+        return marketing_features(frame).to_numpy(), (frame['y'] == 'yes').to_numpy(dtype='int8')
+    if kind == 'credit':
+        return credit_features(frame).to_numpy(), frame[TARGET_COL].to_numpy(dtype='int8')
+    raise ValueError(f"Unknown model kind: {kind}")
+
+
+def data_digest(X, y):
+    """SHA-256 of a model matrix and target, shape and dtype included"""
+    digest = hashlib.sha256()
+    for array in (X, y):
+        digest.update(f'{array.dtype}{array.shape}'.encode('utf-8'))
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def halving_schedule(n_candidates, n_rows, factor=HALVING_FACTOR, min_rows=MIN_ROWS):
+    """Rows used at each rung: growing by factor and ending with every row.
+
+    There are as many rungs as it takes to whittle the candidates down to
+    at most factor, unless the data runs out first (no rung below min_rows).
+    """
+    by_candidates = math.floor(math.log(n_candidates, factor)) if n_candidates > 1 else 0
+    by_rows = math.floor(math.log(n_rows / min_rows, factor)) if n_rows > min_rows else 0
+    rungs = 1 + min(by_candidates, by_rows)
+    return [math.ceil(n_rows / factor ** (rungs - 1 - rung)) for rung in range(rungs)]
+
+
+def _sample(n_rows, rows, seed):
+    """The first rows of a fixed shuffle of the data, in file order"""
+    return np.sort(np.random.default_rng(seed).permutation(n_rows)[:rows])
+
+
+# Fold evaluation (runs in the worker processes)
+
+_DATA = {}
+
+
+def _init_worker(X, y, threads=None):
+    if isinstance(X, str):
+        # Workers map the shared .npy copy of the matrix rather than each unpickling their own
+        X = np.load(X, mmap_mode='r')
+    _DATA['X'], _DATA['y'] = X, y
+    if threads:
+        # One BLAS/OpenMP thread per process, so workers do not oversubscribe the cores
+        threadpool_limits(threads)
+
+
+def _estimator(kind, params):
+    if kind == 'marketing':
+        return marketing_estimator(params, n_jobs=1)
+    return credit_estimator(params)
+
+
+def evaluate_fold(kind, params, rows, fold, folds=CV_FOLDS, seed=RANDOM_STATE):
+    """ROC AUC of one candidate on one cross-validation fold of a row sample"""
+    X, y = _DATA['X'], _DATA['y']
+    sample = _sample(len(y), rows, seed)
+    splits = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed).split(sample, y[sample])
+    train, test = list(splits)[fold]
+    started = time.perf_counter()
+    model = _estimator(kind, params).fit(X[sample[train]], y[sample[train]])
+    seconds = time.perf_counter() - started
+    score = roc_auc_score(y[sample[test]], model.predict_proba(X[sample[test]])[:, 1])
+    return {'params': params, 'rows': rows, 'fold': fold, 'roc_auc': float(score), 'fit_seconds': seconds}
+
+
+# Fold cache
+
+def fold_key(kind, params, digest, rows, fold, folds, seed):
+    """Content hash identifying one fold evaluation"""
+    payload = {'version': CACHE_VERSION, 'kind': kind, 'params': params, 'data': digest, 'rows': rows,
+               'fold': fold, 'folds': folds, 'seed': seed}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _shared_matrix(cache_dir, kind, digest, X):
+    """Path of a .npy copy of the model matrix for the workers to memory-map (written once per data hash)"""
+    path = os.path.join(cache_dir, 'data', f'{kind}_{digest}.npy')
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, X)
+        os.replace(tmp_path, path)
+    return path
+
+
+def _fold_path(cache_dir, kind, key):
+    return os.path.join(cache_dir, kind, key + '.json')
+
+
+def _read_fold(cache_dir, kind, key):
+    path = _fold_path(cache_dir, kind, key)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _store_fold(cache_dir, kind, key, result):
+    """Write a fold result atomically, so an interrupted search never leaves a partial file"""
+    path = _fold_path(cache_dir, kind, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+    os.replace(tmp_path, path)
+
+
+# Search
+
+def _ranked(candidates, scores):
+    """Candidates ordered by mean fold score, best first (ties keep grid order)"""
+    order = sorted(range(len(candidates)), key=lambda i: -np.mean(scores[i]))
+    return [candidates[i] for i in order]
+
+
+def successive_halving(kind, frame, space=None, folds=CV_FOLDS, factor=HALVING_FACTOR, min_rows=MIN_ROWS,
+                       jobs=1, cache_dir=TUNING_CACHE_DIR, seed=RANDOM_STATE, log=print):
+    """Search a model's hyperparameters with successive halving.
+
+    space maps parameter names to the values to try (default: the kind's
+    SEARCH_SPACES entry). Returns the leaderboard (one row per candidate,
+    best first), the best parameters and score, the schedule and how many
+    folds were computed or taken from the cache.
+    """
+    X, y = model_data(kind, frame)
+    digest = data_digest(X, y)
+    candidates = list(ParameterGrid(space or SEARCH_SPACES[kind]))
+    schedule = halving_schedule(len(candidates), len(y), factor, min_rows)
+    log(f"🔎 {kind}: {len(candidates)} candidates, {folds}-fold CV on "
+        f"{' → '.join(f'{rows:,}' for rows in schedule)} rows")
+
+    started = time.perf_counter()
+    computed = cached = 0
+    reached = {}
+    if jobs > 1:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                   initargs=(_shared_matrix(cache_dir, kind, digest, X), y, 1))
+    else:
+        pool = None
+        _init_worker(X, y)
+    try:
+        alive = candidates
+        for rung, rows in enumerate(schedule):
+            results = {}
+            pending = []
+            for index, params in enumerate(alive):
+                for fold in range(folds):
+                    key = fold_key(kind, params, digest, rows, fold, folds, seed)
+                    result = _read_fold(cache_dir, kind, key)
+                    if result is None:
+                        pending.append((index, key, (kind, params, rows, fold, folds, seed)))
+                    else:
+                        results[index, fold] = result
+            cached += len(results)
+
+            if pool is None:
+                finished = ((index, key, evaluate_fold(*task)) for index, key, task in pending)
+            else:
+                futures = {pool.submit(evaluate_fold, *task): (index, key) for index, key, task in pending}
+                finished = (futures[future] + (future.result(),) for future in as_completed(futures))
+            for index, key, result in finished:
+                # Stored as each fold finishes, so an interrupted search keeps its progress
+                _store_fold(cache_dir, kind, key, result)
+                results[index, result['fold']] = result
+                computed += 1
+
+            scores = [[results[index, fold]['roc_auc'] for fold in range(folds)] for index in range(len(alive))]
+            for index, params in enumerate(alive):
+                reached[json.dumps(params, sort_keys=True)] = {
+                    'rung': rung, 'rows': rows, 'scores': scores[index],
+                    'fit_seconds': sum(results[index, fold]['fit_seconds'] for fold in range(folds)),
+                }
+            best = max(np.mean(score) for score in scores)
+            log(f"   rung {rung + 1}/{len(schedule)}: {len(alive)} candidates on {rows:,} rows, "
+                f"best ROC AUC {best:.4f} ({len(pending)} folds computed)")
+            if rung < len(schedule) - 1:
+                alive = _ranked(alive, scores)[:math.ceil(len(alive) / factor)]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    board = leaderboard(candidates, reached)
+    return {
+        'kind': kind,
+        'leaderboard': board,
+        'best_params': candidates[board.index[0]],
+        'best_score': float(board['roc_auc'].iloc[0]),
+        'schedule': schedule,
+        'candidates': len(candidates),
+        'folds': folds,
+        'folds_computed': computed,
+        'folds_cached': cached,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def leaderboard(candidates, reached):
+    """One row per candidate: how far it got and its mean fold score there, best first.
+
+    Indexed by the candidate's position in the grid.
+    """
+    rows = []
+    for params in candidates:
+        entry = reached[json.dumps(params, sort_keys=True)]
+        rows.append({'rung': entry['rung'] + 1, 'rows': entry['rows'], 'roc_auc': np.mean(entry['scores']),
+                     'roc_auc_std': np.std(entry['scores']), 'fit_seconds': entry['fit_seconds'], **params})
+    board = pd.DataFrame(rows).sort_values(['rung', 'roc_auc'], ascending=False, kind='stable')
+    board.insert(0, 'rank', range(1, len(board) + 1))
+    return board
+
+
+# Reports
+
+def _markdown_table(frame):
+    def cell(column, value):
+        if value is None or value != value:
+            return '–'
+        if column in ('roc_auc', 'roc_auc_std'):
+            return f'{value:.4f}'
+        if column == 'fit_seconds':
+            return f'{value:.1f}'
+        if column == 'rows':
+            return f'{value:,}'
+        return f'{value:g}' if isinstance(value, float) else str(value)
+    lines = ['| ' + ' | '.join(frame.columns) + ' |', '|' + '---|' * len(frame.columns)]
+    for row in frame.itertuples(index=False):
+        lines.append('| ' + ' | '.join(cell(column, value) for column, value in zip(frame.columns, row)) + ' |')
+    return '\n'.join(lines)
+
+
+def write_leaderboard(result, out_dir=LEADERBOARD_DIR, top=10):
+    """Write a search's leaderboard as CSV and a Markdown report, and its best parameters as JSON.
+
+    Returns the written paths.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    kind = result['kind']
+    board = result['leaderboard']
+    paths = {
+        'csv': os.path.join(out_dir, f'{kind}_leaderboard.csv'),
+        'markdown': os.path.join(out_dir, f'{kind}_leaderboard.md'),
+        'params': os.path.join(out_dir, f'{kind}_best_params.json'),
+    }
+    result['leaderboard'].to_csv(paths['csv'], index=False)
+
+    schedule = ' → '.join(f'{rows:,}' for rows in result['schedule'])
+    best = ', '.join(f'`{name}={value!r}`' for name, value in result['best_params'].items())
+    report = [
+        f"# {kind.title()} Model Tuning Leaderboard",
+        "",
+        f"Successive halving over {result['candidates']} candidates with {result['folds']}-fold "
+        f"cross-validated ROC AUC; rows per rung: {schedule}.",
+        "",
+        f"**Best:** {best} (ROC AUC {result['best_score']:.4f} on all {result['schedule'][-1]:,} rows)",
+        "",
+        f"## Top {min(top, len(board))} candidates",
+        "",
+        _markdown_table(board.head(top)),
+        "",
+        f"{result['folds_computed']} folds computed, {result['folds_cached']} reused from the cache "
+        f"in {result['seconds']:.1f}s.",
+        "",
+    ]
+    with open(paths['markdown'], 'w', encoding='utf-8') as f:
+        f.write('\n'.join(report))
+    with open(paths['params'], 'w', encoding='utf-8') as f:
+        json.dump(result['best_params'], f, indent=2)
+    return paths
+
+
+def load_best_params(kind, out_dir=LEADERBOARD_DIR):
+    """Best parameters of the last search written by write_leaderboard"""
+    with open(os.path.join(out_dir, f'{kind}_best_params.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Smoke test for the benchmark harness: isolated stage runs and baseline comparison
+"""
+
+import sys
+sys.path.append('scripts')
+
+from benchmarks import STAGES, compare, format_comparison, load_results, run_benchmarks, save_results
+from run_epic_analysis import FIGURE_STAGES
+
+
+def test_every_pipeline_figure_is_benchmarked():
+    """Each figure the analysis pipeline renders has a figure_<name> benchmark stage"""
+    missing = [name for name in FIGURE_STAGES if f"figure_{name[:-len('_figure')]}" not in STAGES]
+    assert not missing
+    assert {'marketing_model', 'credit_model'} <= set(STAGES)
+
+
+def test_benchmark_run_compares_with_its_baseline(tmp_path):
+    """Stages run in isolated children, report their measurements and round-trip through JSON"""
+    stages = ['risk_profile', 'marketing_model', 'figure_credit_importance']
+    results = run_benchmarks(scales=[1], stages=stages, log=lambda message: None)
+    assert [result['stage'] for result in results['results']] == stages
+    for result in results['results']:
+        assert result['scale'] == 1 and result['seconds'] > 0 and result['peak_rss_mb'] > 0
+    assert results['results'][1]['rows'] == 4521
+
+    baseline = load_results(save_results(results, str(tmp_path / 'baseline.json')))
+    rows = compare(results, baseline)
+    assert [row['status'] for row in rows] == ['ok'] * len(stages)
+    assert all(row['ratio'] == 1 for row in rows)
+
+    slower = {**results, 'results': [{**result, 'seconds': result['seconds'] * 2} for result in results['results']]}
+    assert {row['status'] for row in compare(slower, baseline)} == {'regression'}
+    assert 'regression' in format_comparison(compare(slower, baseline))
@@ -55,6 +55,36 @@ def test_dashboard():
         print(f"❌ Test failed: {e}")
         return False
 
+def test_cached_cube_functions_match_uncached():
+    """The Streamlit-cached cubes, context and filter lookups equal fresh uncached computations"""
+    import pandas as pd
+    import interactive_dashboard as dashboard
+    from dashboard_data import age_bin_edges, cube_metrics, load_cubes, risk_grid, rollup
+    from report_templates import report_context
+
+    marketing_cube, credit_cube = load_cubes()
+    cached_marketing, cached_credit = dashboard.load_dashboard_cubes()
+    pd.testing.assert_frame_equal(cached_marketing, marketing_cube)
+    pd.testing.assert_frame_equal(cached_credit, credit_cube)
+
+    context = dashboard.dashboard_context()
+    assert context == report_context(cube_metrics(marketing_cube, credit_cube), generated_on=context['generated_on'])
+
+    jobs = ['admin.', 'student', 'technician']
+    selected = marketing_cube[marketing_cube['job'].isin(jobs)]
+    expected_rates = rollup(selected, ['job', 'marital'], 'conversions', name='conversion_rate')
+    for _ in range(2):  # a miss, then a cache hit
+        rates = dashboard.segment_conversion(jobs)
+        pd.testing.assert_frame_equal(rates.reset_index(drop=True), expected_rates.reset_index(drop=True))
+        rates['conversion_rate'] = 0.0  # cached values are copies, so this must not leak into the cache
+
+    expected_grid = risk_grid(credit_cube[credit_cube['AGE'].between(30, 45)], age_bin_edges(30, 45))
+    for _ in range(2):
+        grid = dashboard.risk_grid_for_ages(30, 45)
+        for part, expected_part in zip(grid, expected_grid):
+            pd.testing.assert_frame_equal(part, expected_part)
+        grid[0].iloc[:, :] = 0.0
+
 if __name__ == "__main__":
     success = test_dashboard()
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for the typed data loader and its binary sidecar cache
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+sys.path.append('scripts')
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+from data_loader import (
+    BANK_MARKETING_PATH, BANK_MARKETING_SCHEMA, CREDIT_DEFAULT_PATH, TARGET_COL,
+    load_bank_marketing, load_credit_default, load_dataset, open_column_store, write_column_store,
+)
+from synthetic import fit_credit_profile, fit_marketing_profile, iter_synthetic, write_synthetic
+
+
+def test_schemas_applied():
+    """Both datasets load with the declared compact dtypes"""
+    bank_marketing = load_bank_marketing(use_cache=False)
+    credit_default = load_credit_default(use_cache=False)
+
+    assert str(bank_marketing['y'].dtype) == 'category'
+    assert str(bank_marketing['job'].dtype) == 'category'
+    assert credit_default['PAY_0'].dtype == 'int8'
+    assert credit_default['AGE'].dtype == 'int8'
+    assert credit_default['BILL_AMT1'].dtype == 'float32'
+
+
+def test_values_match_raw_csv():
+    """Narrower dtypes must not change any value"""
+    raw = pd.read_csv(CREDIT_DEFAULT_PATH)
+    typed = load_credit_default(use_cache=False)
+    assert (typed.astype('int64') == raw).all().all()
+
+    raw = pd.read_csv(BANK_MARKETING_PATH)
+    typed = load_bank_marketing(use_cache=False)
+    assert (typed['y'].astype(str) == raw['y']).all()
+
+
+def test_sidecar_reused_until_csv_changes(tmp_path):
+    """The sidecar is written once and rebuilt when the CSV content changes"""
+    csv_path = tmp_path / 'bank.csv'
+    pd.read_csv(BANK_MARKETING_PATH, nrows=50).to_csv(csv_path, index=False)
+
+    first = load_dataset(str(csv_path), BANK_MARKETING_SCHEMA)
+    feather_path = tmp_path / '.cache' / 'bank.feather'
+    assert feather_path.exists()
+    built_at = feather_path.stat().st_mtime_ns
+
+    # Touching the file without changing content keeps the sidecar
+    os.utime(csv_path)
+    second = load_dataset(str(csv_path), BANK_MARKETING_SCHEMA)
+    assert feather_path.stat().st_mtime_ns == built_at
+    pd.testing.assert_frame_equal(first, second)
+
+    pd.read_csv(BANK_MARKETING_PATH, nrows=60).to_csv(csv_path, index=False)
+    third = load_dataset(str(csv_path), BANK_MARKETING_SCHEMA)
+    assert len(third) == 60
+
+
+def test_failed_sidecar_write_keeps_the_previous_sidecar(tmp_path, monkeypatch):
+    """Sidecars are written to temp files and moved into place, so a failed write leaves no partial file"""
+    csv_path = tmp_path / 'bank.csv'
+    pd.read_csv(BANK_MARKETING_PATH, nrows=50).to_csv(csv_path, index=False)
+    load_dataset(str(csv_path), BANK_MARKETING_SCHEMA)
+    cache_dir = tmp_path / '.cache'
+    assert sorted(os.listdir(cache_dir)) == ['bank.feather', 'bank.meta.json']
+    before = {name: (cache_dir / name).read_bytes() for name in os.listdir(cache_dir)}
+
+    def fail_halfway(df, path):
+        with open(path, 'wb') as f:
+            f.write(b'ARROW1 partial')
+        raise OSError('disk full')
+
+    monkeypatch.setattr(pd.DataFrame, 'to_feather', fail_halfway)
+    pd.read_csv(BANK_MARKETING_PATH, nrows=60).to_csv(csv_path, index=False)
+    assert len(load_dataset(str(csv_path), BANK_MARKETING_SCHEMA)) == 60
+    assert {name: (cache_dir / name).read_bytes() for name in os.listdir(cache_dir)} == before
+
+    monkeypatch.undo()
+    assert len(load_dataset(str(csv_path), BANK_MARKETING_SCHEMA)) == 60
+    assert sorted(os.listdir(cache_dir)) == ['bank.feather', 'bank.meta.json']
+
+
+def test_column_store_is_memory_mapped(tmp_path):
+    """The mapped frame equals the loaded one, shares the store's pages and follows CSV changes"""
+    csv_path = tmp_path / 'bank.csv'
+    pd.read_csv(BANK_MARKETING_PATH, nrows=50).to_csv(csv_path, index=False)
+
+    loaded = load_dataset(str(csv_path), BANK_MARKETING_SCHEMA)
+    mapped = load_dataset(str(csv_path), BANK_MARKETING_SCHEMA, mmap=True)
+    pd.testing.assert_frame_equal(mapped, loaded)
+
+    assert (tmp_path / '.cache' / 'bank.columns' / 'meta.json').exists()
+    balance = mapped['balance'].to_numpy()
+    assert not balance.flags.writeable
+    assert isinstance(balance.base.base, np.memmap)
+
+    pd.read_csv(BANK_MARKETING_PATH, nrows=60).to_csv(csv_path, index=False)
+    assert len(load_dataset(str(csv_path), BANK_MARKETING_SCHEMA, mmap=True)) == 60
+
+
+def test_store_swapped_out_after_the_freshness_check_is_rebuilt(tmp_path, monkeypatch):
+    """A store that disappears between the freshness check and opening it is rebuilt, not an error"""
+    csv_path = tmp_path / 'bank.csv'
+    pd.read_csv(BANK_MARKETING_PATH, nrows=50).to_csv(csv_path, index=False)
+    expected = load_dataset(str(csv_path), BANK_MARKETING_SCHEMA, mmap=True)
+
+    opened = []
+    def raced(store_dir):
+        opened.append(store_dir)
+        if len(opened) == 1:
+            raise FileNotFoundError(store_dir)
+        return open_column_store(store_dir)
+    monkeypatch.setattr(data_loader, 'open_column_store', raced)
+    pd.testing.assert_frame_equal(load_dataset(str(csv_path), BANK_MARKETING_SCHEMA, mmap=True), expected)
+    assert len(opened) == 2
+
+    # A touched CSV rewrites the store's meta in place through a temp file
+    os.utime(csv_path, ns=(0, 0))
+    pd.testing.assert_frame_equal(load_dataset(str(csv_path), BANK_MARKETING_SCHEMA, mmap=True), expected)
+    with open(tmp_path / '.cache' / 'bank.columns' / 'meta.json', encoding='utf-8') as f:
+        assert json.load(f)['mtime_ns'] == 0
+    assert sorted(os.listdir(tmp_path / '.cache' / 'bank.columns')) == sorted(
+        ['meta.json'] + [f'{i}.npy' for i in range(len(expected.columns))])
+
+
+def test_concurrent_column_store_writers_all_succeed(tmp_path, monkeypatch):
+    """Writers racing on one store each succeed, leave one complete store and no temporary directories"""
+    df = load_bank_marketing().head(200)
+    store_dir = str(tmp_path / 'bank.columns')
+
+    fork = multiprocessing.get_context('fork')
+    writers = [fork.Process(target=write_column_store, args=(df, store_dir)) for _ in range(4)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    assert [writer.exitcode for writer in writers] == [0] * 4
+    pd.testing.assert_frame_equal(open_column_store(store_dir), df)
+
+    # Losing the race: another writer moves the store aside and swaps its own in first
+    mapped = open_column_store(store_dir)
+    rename = os.rename
+    def raced(src, dst):
+        if src == store_dir:
+            raise FileNotFoundError(src)
+        return rename(src, dst)
+    monkeypatch.setattr(os, 'rename', raced)
+    write_column_store(df.head(10), store_dir)
+    pd.testing.assert_frame_equal(open_column_store(store_dir), df)
+    monkeypatch.undo()
+
+    write_column_store(df.head(10), store_dir)
+    pd.testing.assert_frame_equal(open_column_store(store_dir), df.head(10))
+    pd.testing.assert_frame_equal(mapped, df)  # the replaced store stays readable while mapped
+    assert os.listdir(tmp_path) == ['bank.columns']
+
+def test_synthetic_data_is_deterministic(tmp_path):
+    """A seed produces the same file however many workers generate it, in either format"""
+    serial = tmp_path / 'serial.csv'
+    parallel = tmp_path / 'parallel.csv'
+    write_synthetic('credit', 5000, str(serial), chunk_size=1500, jobs=1, log=lambda message: None)
+    write_synthetic('credit', 5000, str(parallel), chunk_size=1500, jobs=2, log=lambda message: None)
+    assert serial.read_bytes() == parallel.read_bytes()
+
+    parquet = tmp_path / 'credit.parquet'
+    write_synthetic('credit', 5000, str(parquet), chunk_size=1500, log=lambda message: None)
+    from_csv = load_credit_default(str(serial), use_cache=False)
+    pd.testing.assert_frame_equal(from_csv, pd.read_parquet(parquet))
+    assert (from_csv['ID'] == range(1, 5001)).all()
+
+
+def test_synthetic_data_keeps_conditional_rates():
+    """Subscription rate per job and default rate per PAY_0 follow the source data"""
+    bank_marketing = load_bank_marketing()
+    synthetic = pd.concat(iter_synthetic(fit_marketing_profile(bank_marketing), 200_000))
+    assert synthetic.dtypes.equals(bank_marketing.dtypes)
+    observed = (bank_marketing['y'] == 'yes').groupby(bank_marketing['job'], observed=True).mean()
+    generated = (synthetic['y'] == 'yes').groupby(synthetic['job'], observed=True).mean()
+    assert (generated - observed).abs().max() < 0.02
+
+    credit_default = load_credit_default()
+    synthetic = pd.concat(iter_synthetic(fit_credit_profile(credit_default), 200_000))
+    observed = credit_default.groupby('PAY_0')[TARGET_COL].mean()
+    generated = synthetic.groupby('PAY_0')[TARGET_COL].mean()
+    common = observed.index[credit_default['PAY_0'].value_counts()[observed.index] >= 1000]
+    assert (generated[common] - observed[common]).abs().max() < 0.02
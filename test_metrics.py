@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared metrics API, distribution summaries and the streaming
+aggregation engine
+"""
+
+import glob
+import re
+import sys
+sys.path.append('scripts')
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.cbook import boxplot_stats
+
+from dashboard_data import (UTIL_BUCKET_LABELS, UTIL_EDGES, SortedIndex, age_bin_edges, build_credit_cube,
+                            build_marketing_cube, risk_grid, rollup, with_age_groups)
+from data_loader import load_bank_marketing, load_credit_default
+from distributions import box_stats_by_group, histogram_counts, value_counts_by_group
+from features import add_credit_features, credit_utilization, risk_profile
+from metrics import conversion_flag, conversion_rates, default_rates, segment_group_rates
+from report_metrics import load_snapshot, report_metrics, save_snapshot, variant_metrics
+from report_templates import MIN_CONTACT_GAP, TEMPLATE_DIR, render, render_block, report_context, times
+from rendering import render_profile
+from report_utils import BankingReportGenerator, DashboardTemplate, render_dashboard
+from streaming_metrics import RateAccumulator, equal_width_edges, stream_analysis_metrics
+
+MARKETING_KEYS = ['job', 'education', 'contact', 'month', 'poutcome']
+
+
+def test_conversion_rates_match_groupby():
+    """Vectorized rates equal the per-group lambda they replace"""
+    bank_marketing = load_bank_marketing()
+    columns = list(bank_marketing.columns)
+    rates = conversion_rates(bank_marketing, MARKETING_KEYS)
+    assert list(bank_marketing.columns) == columns  # the caller's frame is not modified
+
+    for key in MARKETING_KEYS:
+        expected = bank_marketing.groupby(key, observed=True)['y'].apply(lambda x: (x == 'yes').mean())
+        pd.testing.assert_series_equal(rates[key], expected, check_names=False)
+
+
+def test_default_rates_keep_bin_order():
+    """Binned keys keep their category order and drop empty bins"""
+    credit_default = load_credit_default()
+    credit_default['age_group'] = pd.cut(credit_default['AGE'], bins=[0, 30, 40, 50, 60, 100],
+                                         labels=['<30', '30-40', '40-50', '50-60', '60+'])
+    rates = default_rates(credit_default, ['age_group', 'PAY_0'])
+
+    for key in ['age_group', 'PAY_0']:
+        expected = credit_default.groupby(key, observed=True)['default payment next month'].mean()
+        pd.testing.assert_series_equal(rates[key], expected, check_names=False)
+
+
+def create_risk_profile(row):
+    """The notebook's original row-wise rule"""
+    if row['default payment next month'] == 1:
+        return 'High Risk'
+    elif row['PAY_0'] > 1 or row['credit_utilization'] > 0.8:
+        return 'Medium Risk'
+    else:
+        return 'Low Risk'
+
+
+def test_risk_profile_matches_row_wise_rule():
+    """The vectorized rule classifies every row like create_risk_profile, edge cases included"""
+    credit_default = add_credit_features(load_credit_default())
+    edges = pd.DataFrame({
+        'PAY_0': [1, 2, 1, 2, 0, 0, 0, 0, 1, 2, -1, 1],
+        'credit_utilization': [0.5, 0.5, 0.8, 0.8, 0.80001, np.nan, np.inf, -np.inf, np.nan, np.inf, 0.8, 0.9],
+        'default payment next month': [0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1, 0],
+    })
+
+    for frame in [credit_default, edges]:
+        expected = frame.apply(create_risk_profile, axis=1)
+        assert (risk_profile(frame).astype(str) == expected).all()
+    assert list(risk_profile(edges).astype(str)) == [
+        'Low Risk', 'Medium Risk', 'Low Risk', 'Medium Risk', 'Medium Risk', 'Low Risk',
+        'Medium Risk', 'Low Risk', 'High Risk', 'Medium Risk', 'High Risk', 'Medium Risk']
+
+
+def test_segment_rates_match_each_segment():
+    """One grouped pass gives every segment the rates of its own rows"""
+    bank_marketing = load_bank_marketing()
+    keys = ['job', 'contact', 'poutcome']
+    segments = segment_group_rates(bank_marketing.assign(flag=(bank_marketing['y'] == 'yes').astype('uint8')),
+                                   'month', keys, 'flag')
+
+    for month, rates in segments.items():
+        expected = conversion_rates(bank_marketing[bank_marketing['month'] == month].copy(), keys)
+        for key in keys:
+            pd.testing.assert_series_equal(rates[key], expected[key], check_names=False)
+
+
+def test_distribution_summaries_match_raw_data():
+    """Histogram counts and box statistics equal those drawn from the raw rows"""
+    bank_marketing = load_bank_marketing()
+
+    edges, counts = histogram_counts(value_counts_by_group(bank_marketing['age'], bank_marketing['y']), bins=20)
+    expected_edges = np.histogram_bin_edges(bank_marketing['age'], bins=20)
+    assert np.allclose(edges, expected_edges)
+    for label, values in counts.items():
+        expected = np.histogram(bank_marketing.loc[bank_marketing['y'] == label, 'age'], bins=expected_edges)[0]
+        assert (values == expected).all()
+
+    for column in ['duration', 'campaign']:
+        for stats in box_stats_by_group(bank_marketing[column], bank_marketing['y']):
+            expected = boxplot_stats(bank_marketing.loc[bank_marketing['y'] == stats['label'], column].to_numpy())[0]
+            for key in ['q1', 'med', 'q3', 'whislo', 'whishi', 'mean']:
+                assert np.isclose(stats[key], expected[key])
+            assert set(stats['fliers']) == set(expected['fliers'])
+
+
+def test_dashboard_cubes_roll_up_to_raw_rates():
+    """Rates rolled up from the dashboard cubes equal those of the raw rows"""
+    bank_marketing = load_bank_marketing()
+    marketing_cube = build_marketing_cube(bank_marketing)
+    rolled = rollup(marketing_cube, ['job', 'marital'], 'conversions').set_index(['job', 'marital'])['rate']
+    expected = conversion_flag(bank_marketing).groupby([bank_marketing['job'], bank_marketing['marital']],
+                                                       observed=True).mean()
+    assert np.allclose(rolled.values, expected.values)
+
+    credit_default = load_credit_default()
+    credit_cube = with_age_groups(build_credit_cube(credit_default))
+    assert credit_cube['customers'].sum() == len(credit_default)
+    rolled = rollup(credit_cube, ['age_group'], 'defaults')['rate']
+    credit_default['age_group'] = pd.cut(credit_default['AGE'], bins=[0, 30, 40, 50, 60, 100],
+                                         labels=['<30', '30-40', '40-50', '50-60', '60+'])
+    expected = credit_default.groupby('age_group', observed=True)['default payment next month'].mean()
+    assert np.allclose(rolled.values, expected.values)
+
+
+def test_risk_grid_matches_binned_groupby():
+    """Grid cells hold the counts and default rates of pd.cut + groupby over the raw rows, empty cells too"""
+    credit_default = load_credit_default()
+    credit_cube = build_credit_cube(credit_default)
+    empty_cells = 0
+
+    for age_min, age_max in [(21, 79), (60, 79), (35, 35)]:
+        edges = age_bin_edges(age_min, age_max)
+        rates, customers = risk_grid(credit_cube[credit_cube['AGE'].between(age_min, age_max)], edges)
+
+        rows = credit_default[credit_default['AGE'].between(age_min, age_max)]
+        age_bin = pd.cut(rows['AGE'], bins=edges, right=False, labels=list(customers.columns))
+        util_bin = pd.cut(credit_utilization(rows), bins=UTIL_EDGES, labels=UTIL_BUCKET_LABELS)
+        grouped = rows.groupby([util_bin, age_bin], observed=False)['default payment next month']
+        expected_customers = grouped.count().unstack()
+        expected_rates = grouped.mean().unstack()
+
+        assert (customers.to_numpy() == expected_customers.to_numpy()).all()
+        assert np.allclose(rates.to_numpy(), expected_rates.to_numpy(), equal_nan=True)
+        assert customers.to_numpy().sum() == len(rows)
+        assert (rates.isna() == (customers == 0)).to_numpy().all()
+        empty_cells += (customers == 0).to_numpy().sum()
+    assert empty_cells
+
+
+def test_sorted_index_matches_masks():
+    """Range and set lookups select the same rows as boolean masks"""
+    credit_default = load_credit_default()
+    ages = SortedIndex(credit_default, 'AGE').range(25, 40)
+    assert sorted(ages['ID']) == sorted(credit_default.loc[credit_default['AGE'].between(25, 40), 'ID'])
+
+    marketing_cube = build_marketing_cube(load_bank_marketing())
+    jobs = SortedIndex(marketing_cube, 'job').isin(['retired', 'student'])
+    assert jobs['customers'].sum() == marketing_cube.loc[marketing_cube['job'].isin(['retired', 'student']), 'customers'].sum()
+
+
+def test_streaming_matches_in_memory():
+    """Chunked aggregation gives the same KPIs for any chunk size"""
+    data = BankingReportGenerator().load_analysis_data()
+
+    for chunksize in (4_000, 1_000_000):
+        streamed = stream_analysis_metrics(chunksize=chunksize)
+        assert streamed['marketing_records'] == data['marketing_records']
+        assert streamed['credit_records'] == data['credit_records']
+        assert np.isclose(streamed['credit_default_rate'], data['credit_default_rate'])
+        for key in ['job_conversion', 'contact_effectiveness', 'month_conversion', 'age_risk', 'util_risk']:
+            assert list(map(str, streamed[key].index)) == list(map(str, data[key].index))
+            assert np.allclose(streamed[key].values, data[key].values)
+
+
+def test_rate_accumulators_merge_like_one_groupby():
+    """Totals folded chunk by chunk, or merged from separate accumulators, equal one groupby"""
+    rng = np.random.default_rng(0)
+    keys = rng.choice(['a', 'b', 'c', 'd'], size=1000)
+    values = rng.integers(0, 2, size=1000)
+    expected = pd.Series(values).groupby(keys).mean()
+
+    chunked = RateAccumulator()
+    for start in range(0, 1000, 137):
+        chunked.update(keys[start:start + 137], values[start:start + 137])
+    first, second = RateAccumulator(), RateAccumulator()
+    first.update(keys[:400], values[:400])
+    second.update(keys[400:], values[400:])
+
+    for accumulator in (chunked, first.merge(second)):
+        assert np.allclose(accumulator.rates().sort_index().values, expected.values)
+        assert accumulator.total_count() == 1000
+        assert np.isclose(accumulator.total_rate(), values.mean())
+    assert list(chunked.rates(order=['d', 'b', 'z']).index) == ['d', 'b']
+
+
+def test_equal_width_edges_match_pd_cut():
+    """Edges from a column's global min/max are the ones pd.cut(bins=5) builds from all its values"""
+    rng = np.random.default_rng(1)
+    for values in (rng.normal(size=500), rng.integers(-50, 50, size=500).astype(float), np.full(10, 3.0),
+                   np.zeros(10)):
+        expected = pd.cut(values, bins=5, retbins=True)[1]
+        assert np.array_equal(equal_width_edges(values.min(), values.max(), 5), expected)
+
+
+def test_report_from_snapshot_matches_raw_data(tmp_path):
+    """A report built from the metrics snapshot reads the same as one built from the CSVs"""
+    generator = BankingReportGenerator(output_dir=str(tmp_path))
+    data = generator.load_analysis_data()
+    snapshot_path = save_snapshot({key: value for key, value in data.items()
+                                   if key not in ('bank_marketing', 'credit_default')},
+                                  str(tmp_path / 'metrics.json'))
+
+    snapshot = load_snapshot(snapshot_path)
+    for key in ['job_conversion', 'month_conversion', 'age_risk', 'util_risk']:
+        assert list(snapshot[key].index) == list(map(str, data[key].index))
+        assert np.allclose(snapshot[key].values, data[key].values)
+
+    from_snapshot = BankingReportGenerator(output_dir=str(tmp_path), snapshot_path=snapshot_path)
+    assert (from_snapshot.generate_executive_summary(from_snapshot.load_analysis_data())
+            == generator.generate_executive_summary(data))
+
+
+def test_stale_snapshot_is_refused_unless_allowed(tmp_path):
+    """Changing a source file after the snapshot was written makes loading it fail, or warn when allowed"""
+    source = tmp_path / 'source.csv'
+    source.write_text("a,b\n1,2\n")
+    metrics = {'marketing_conversion': 0.1, 'job_conversion': pd.Series([0.2], index=['admin.'])}
+    snapshot_path = save_snapshot(metrics, str(tmp_path / 'metrics.json'), sources=[str(source)])
+    assert load_snapshot(snapshot_path)['snapshot']['stale'] == []
+
+    source.write_text("a,b\n1,3\n")
+    with pytest.raises(ValueError, match='out of date'):
+        load_snapshot(snapshot_path)
+    assert load_snapshot(snapshot_path, allow_stale=True)['snapshot']['stale'] == [str(source)]
+    assert BankingReportGenerator(output_dir=str(tmp_path), snapshot_path=snapshot_path).load_analysis_data() is None
+    allowed = BankingReportGenerator(output_dir=str(tmp_path), snapshot_path=snapshot_path, allow_stale=True)
+    assert allowed.load_analysis_data()['marketing_conversion'] == 0.1
+
+    source.unlink()
+    assert load_snapshot(snapshot_path)['snapshot']['stale'] == []
+
+
+def test_report_templates_bind_every_number():
+    """Templates hold no literal figures and variants report their own slice of the data"""
+    for path in glob.glob(f'{TEMPLATE_DIR}/*.j2'):
+        with open(path, encoding='utf-8') as f:
+            assert not re.search(r'\d+(\.\d+)?%|\$\d', f.read()), path
+
+    data = BankingReportGenerator().load_analysis_data()
+    variants = variant_metrics(data['bank_marketing'], data['credit_default'], 'month')
+    assert sum(metrics['marketing_records'] for metrics in variants.values()) == data['marketing_records']
+
+    october = variants['oct']
+    summary = render('executive_summary.md.j2', report_context(october, variant='month = oct'))
+    assert f"**Overall Conversion Rate**: {data['month_conversion']['oct']:.1%}" in summary
+    assert f"**Total Campaign Records**: {october['marketing_records']:,}" in summary
+    assert f"**Overall Default Rate**: {data['credit_default_rate']:.1%}" in summary
+
+
+def test_report_fan_out_renders_every_segment(tmp_path):
+    """Variants of several columns are rendered in workers from the grouped metrics"""
+    generator = BankingReportGenerator(output_dir=str(tmp_path))
+    paths = generator.generate_report_variants(['age_group', 'contact'], jobs=2, dashboards=False)
+    assert len(paths) == 5 + 3
+    assert (tmp_path / 'variants' / 'age_group_60_.md').exists()
+
+    data = generator.load_analysis_data()
+    credit_default = data['credit_default']
+    variants = variant_metrics(data['bank_marketing'], credit_default, 'age_group')
+    expected = report_metrics(data['bank_marketing'], credit_default[credit_default['age_group'] == '60+'])
+    assert variants['60+']['credit_default_rate'] == expected['credit_default_rate']
+    pd.testing.assert_series_equal(variants['60+']['util_risk'], expected['util_risk'], check_names=False)
+
+
+def test_segments_without_conversions_have_no_ratio_text(tmp_path):
+    """A 0% segment leaves out the 'x higher than average' comparisons instead of printing inf"""
+    generator = BankingReportGenerator(output_dir=str(tmp_path))
+    data = generator.load_analysis_data()
+    variants = variant_metrics(data['bank_marketing'], data['credit_default'], 'age')
+    silent = [value for value, metrics in variants.items() if metrics['marketing_conversion'] == 0]
+    assert silent
+
+    paths = generator.generate_report_variants(['age'], dashboards=False, data=data)
+    for value in silent:
+        with open(tmp_path / 'variants' / f'age_{value}.md', encoding='utf-8') as f:
+            text = f.read()
+        assert 'infx' not in text and 'no contacts converted' in text
+    assert len(paths) == len(variants)
+
+
+def test_unknown_contact_is_not_compared(tmp_path):
+    """The worst contact method and the contact lift only compare known methods"""
+    data = BankingReportGenerator(output_dir=str(tmp_path)).load_analysis_data()
+    metrics = report_metrics(data['bank_marketing'], data['credit_default'])
+    contacts = metrics['contact_effectiveness'].drop('unknown')
+    assert 'unknown' in metrics['contact_effectiveness'].index
+    context = report_context(metrics)
+    assert context['worst_contact'] == contacts.idxmin() != 'unknown'
+    assert context['contact_lift'] == contacts.max() / contacts.min() - 1
+
+
+def test_contact_recommendation_needs_a_meaningful_gap(tmp_path):
+    """A contact-first strategy is only recommended when the best method leads by MIN_CONTACT_GAP"""
+    data = BankingReportGenerator(output_dir=str(tmp_path)).load_analysis_data()
+    metrics = report_metrics(data['bank_marketing'], data['credit_default'])
+    contacts = metrics['contact_effectiveness'].drop('unknown')
+    assert contacts.max() - contacts.min() < MIN_CONTACT_GAP
+
+    for contact_effectiveness, preferred in [(metrics['contact_effectiveness'], False),
+                                             (contacts.mul([1, 1.5]), True)]:
+        context = report_context({**metrics, 'contact_effectiveness': contact_effectiveness})
+        assert context['contact_preferred'] == preferred
+        texts = [render('executive_summary.md.j2', context), render('strategic_recommendations.md.j2', context),
+                 render_block('dashboard_blocks.html.j2', 'immediate_actions', context)]
+        for text in texts:
+            assert (f"{context['best_contact']}-first" in text) == preferred
+            assert ('-first' in text) == preferred
+
+
+def test_times_keeps_a_decimal_below_ten():
+    """Multiples under 10x keep one decimal so a 1.04x lift does not read as 1x"""
+    assert [times(value) for value in (0.04, 1.04, 4.02, 9.96, 12.3)] == ['0.0x', '1.0x', '4.0x', '10.0x', '12x']
+
+
+def test_reused_dashboard_matches_fresh_render(tmp_path):
+    """Swapping metrics into one dashboard figure draws exactly what a new figure would"""
+    data = BankingReportGenerator(output_dir=str(tmp_path)).load_analysis_data()
+    variants = variant_metrics(data['bank_marketing'], data['credit_default'], 'job')
+    svg = render_profile('svg')
+
+    with matplotlib.rc_context({'svg.hashsalt': 'test'}):
+        fresh = render_dashboard(variants['student'], str(tmp_path / 'fresh.png'), 'student', svg)
+        template = DashboardTemplate()
+        template.draw(data).save(str(tmp_path / 'full.png'), svg)
+        reused = template.draw(variants['student'], 'student').save(str(tmp_path / 'reused.png'), svg)
+
+    assert fresh.endswith('.svg') and reused.endswith('.svg')
+    with open(fresh, encoding='utf-8') as f, open(reused, encoding='utf-8') as g:
+        assert f.read() == g.read()
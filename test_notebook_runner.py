@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the headless notebook runner: cached cell outputs, resuming from
+namespace snapshots and parameterized copies
+"""
+
+import json
+import sys
+sys.path.append('scripts')
+
+from notebook_runner import read_notebook, run_copies, run_notebook
+
+
+def _notebook(path, *sources):
+    cells = [{'cell_type': 'markdown', 'metadata': {}, 'source': ["# Test notebook"]}]
+    for source in sources:
+        tags = ['parameters'] if source.startswith('# Parameters') else []
+        cells.append({'cell_type': 'code', 'execution_count': None, 'metadata': {'tags': tags},
+                      'outputs': [], 'source': source.splitlines(keepends=True)})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'cells': cells, 'metadata': {}, 'nbformat': 4, 'nbformat_minor': 4}, f)
+    return str(path)
+
+
+CELLS = [
+    "# Parameters\nscale = 1",
+    "import pandas as pd\nframe = pd.DataFrame({'x': range(5)})\nframe['y'] = frame['x'] * scale",
+    "def total(df):\n    return int(df['y'].sum())",
+    "print(total(frame))\nframe.shape",
+]
+
+
+def _texts(notebook):
+    return [''.join(output.get('text', '')) + output.get('data', {}).get('text/plain', '')
+            for cell in notebook['cells'] if cell['cell_type'] == 'code' for output in cell['outputs']]
+
+
+def test_unchanged_cells_are_replayed_and_changes_resume_from_snapshot(tmp_path):
+    """A rerun executes nothing; an edited last cell runs alone against the restored variables"""
+    cache_dir = str(tmp_path / 'cache')
+    path = _notebook(tmp_path / 'analysis.ipynb', *CELLS)
+    output = str(tmp_path / 'executed.ipynb')
+
+    first = run_notebook(path, output, cache_dir=cache_dir, inputs=[], log=print)
+    assert (first['executed'], first['error']) == (4, None)
+    assert _texts(read_notebook(output)) == ['10\n', '(5, 2)']
+
+    again = run_notebook(path, output, cache_dir=cache_dir, inputs=[], log=print)
+    assert (again['executed'], again['cached']) == (0, 4)
+    assert _texts(read_notebook(output)) == ['10\n', '(5, 2)']
+
+    _notebook(path, *CELLS[:-1], "print(total(frame) * 2)")
+    edited = run_notebook(path, output, cache_dir=cache_dir, inputs=[], log=print)
+    assert (edited['executed'], edited['error']) == (1, None)
+    assert _texts(read_notebook(output)) == ['20\n']
+
+
+def test_mutation_through_an_alias_survives_resuming(tmp_path):
+    """A frame changed through another name is restored changed, and still shared by both names"""
+    cache_dir = str(tmp_path / 'cache')
+    cells = ["import pandas as pd\nframe = pd.DataFrame({'x': range(3)})",
+             "alias = frame\nalias['y'] = alias['x'] * 2"]
+    path = _notebook(tmp_path / 'analysis.ipynb', *cells, "print(list(frame.columns))")
+    output = str(tmp_path / 'executed.ipynb')
+    assert run_notebook(path, output, cache_dir=cache_dir, inputs=[], log=print)['executed'] == 3
+
+    _notebook(path, *cells, "frame['z'] = 0\nprint(list(frame.columns), list(alias.columns))")
+    resumed = run_notebook(path, output, cache_dir=cache_dir, inputs=[], log=print)
+    assert (resumed['executed'], resumed['error']) == (1, None)
+    assert _texts(read_notebook(output)) == ["['x', 'y', 'z'] ['x', 'y', 'z']\n"]
+
+
+def test_parameterized_copies_run_on_a_worker_pool(tmp_path):
+    """Each copy gets its injected parameters and its own executed notebook"""
+    path = _notebook(tmp_path / 'analysis.ipynb', *CELLS)
+    summaries = run_copies(path, [{'scale': 2}, {'scale': 3}], out_dir=str(tmp_path / 'copies'),
+                           cache_dir=str(tmp_path / 'cache'), inputs=[], jobs=2, log=print)
+
+    assert [summary['error'] for summary in summaries] == [None, None]
+    for summary, expected in zip(summaries, ['20\n', '30\n']):
+        notebook = read_notebook(summary['notebook'])
+        assert 'injected-parameters' in notebook['cells'][2]['metadata']['tags']
+        assert _texts(notebook)[0] == expected
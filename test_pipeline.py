@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental pipeline: cache hits and what invalidates a stage
+"""
+
+import importlib
+import sys
+sys.path.append('scripts')
+
+from pipeline import Pipeline
+
+STAGES = ("def read_numbers(path):\n    with open(path) as f:\n        return [int(line) for line in f]\n\n"
+          "def total(values, offset=0):\n    return sum(values) + offset\n\n"
+          "def count(values):\n    return len(values)\n\n"
+          "def report(total, path):\n    with open(path, 'w') as f:\n        f.write(str(total))\n    return total\n")
+
+HELPER = "SCALE = {scale}\n\ndef scaled(values):\n    return [value * SCALE for value in values]\n"
+HELPER_STAGES = ("from stage_helpers import scaled\n\n"
+                 "def read_numbers(path):\n    with open(path) as f:\n        return [int(line) for line in f]\n\n"
+                 "def total(values, offset=0):\n    return sum(scaled(values)) + offset\n")
+
+
+def _pipeline(tmp_path, offset=0, cache='cache'):
+    """A fresh pipeline over the freshly imported stage module (like a new process)"""
+    importlib.invalidate_caches()
+    sys.modules.pop('pipeline_stages', None)
+    import pipeline_stages
+    pipeline = Pipeline(cache_dir=str(tmp_path / cache), log=lambda message: None)
+    pipeline.add('numbers', pipeline_stages.read_numbers, params={'path': str(tmp_path / 'numbers.txt')},
+                 files=[str(tmp_path / 'numbers.txt')])
+    pipeline.add('total', pipeline_stages.total, inputs=['numbers'], params={'offset': offset})
+    pipeline.add('count', pipeline_stages.count, inputs=['numbers'])
+    pipeline.add('report', pipeline_stages.report, inputs=['total'], params={'path': str(tmp_path / 'total.txt')},
+                 outputs=[str(tmp_path / 'total.txt')])
+    return pipeline
+
+
+def _run(tmp_path, offset=0):
+    pipeline = _pipeline(tmp_path, offset)
+    status = pipeline.run(['report', 'count'])
+    return status, pipeline.value('report'), pipeline.value('count')
+
+
+def _run_total(tmp_path, offset=0):
+    """A fresh pipeline over the helper-importing stage module, run to completion"""
+    importlib.invalidate_caches()
+    for name in ('stage_helpers', 'stage_funcs'):
+        sys.modules.pop(name, None)
+    import stage_funcs
+    pipeline = Pipeline(cache_dir=str(tmp_path / 'cache'), log=lambda message: None, module_dir=str(tmp_path))
+    pipeline.add('numbers', stage_funcs.read_numbers, params={'path': str(tmp_path / 'numbers.txt')},
+                 files=[str(tmp_path / 'numbers.txt')])
+    pipeline.add('total', stage_funcs.total, inputs=['numbers'], params={'offset': offset})
+    status = pipeline.run(['total'])
+    return status['total'], pipeline.value('total')
+
+
+def test_stages_rerun_only_when_params_files_code_or_outputs_change(tmp_path, monkeypatch):
+    """A rerun is a cache hit; parameters, input files, stage code and missing outputs invalidate it"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / 'pipeline_stages.py').write_text(STAGES)
+    (tmp_path / 'numbers.txt').write_text("1\n2\n3\n")
+
+    assert _run(tmp_path) == ({'report': 'ran', 'count': 'ran'}, 6, 3)
+    assert _run(tmp_path) == ({'report': 'cached', 'count': 'cached'}, 6, 3)
+
+    # A parameter only invalidates its stage and what depends on it
+    assert _run(tmp_path, offset=10) == ({'report': 'ran', 'count': 'cached'}, 16, 3)
+
+    (tmp_path / 'numbers.txt').write_text("1\n2\n3\n4\n")
+    assert _run(tmp_path, offset=10) == ({'report': 'ran', 'count': 'ran'}, 20, 4)
+
+    (tmp_path / 'pipeline_stages.py').write_text(STAGES.replace('return len(values)', 'return len(values) * 2'))
+    assert _run(tmp_path, offset=10) == ({'report': 'cached', 'count': 'ran'}, 20, 8)
+
+    (tmp_path / 'total.txt').unlink()
+    assert _run(tmp_path, offset=10)[0] == {'report': 'ran', 'count': 'cached'}
+    assert (tmp_path / 'total.txt').read_text() == '20'
+
+    forced = _pipeline(tmp_path, offset=10)
+    forced.force = True
+    assert forced.run(['count']) == {'count': 'ran'}
+
+
+def test_worker_processes_match_a_serial_run(tmp_path, monkeypatch):
+    """Leaf stages computed in a process pool give the serial values, statuses and cache"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / 'pipeline_stages.py').write_text(STAGES)
+    (tmp_path / 'numbers.txt').write_text("1\n2\n3\n")
+    targets = ['numbers', 'report', 'count']
+
+    runs = {}
+    for jobs in (1, 2):
+        pipeline = _pipeline(tmp_path, cache=f'cache_{jobs}')
+        status = pipeline.run(targets, jobs=jobs)
+        runs[jobs] = status, [pipeline.value(name) for name in targets + ['total']]
+        assert (tmp_path / 'total.txt').read_text() == '6'
+        (tmp_path / 'total.txt').unlink()
+    assert runs[1] == runs[2] == ({'numbers': 'ran', 'report': 'ran', 'count': 'ran'}, [[1, 2, 3], 6, 3, 6])
+
+    (tmp_path / 'total.txt').write_text('6')
+    for jobs in (1, 2):
+        assert _pipeline(tmp_path, cache=f'cache_{jobs}').run(targets, jobs=jobs) == dict.fromkeys(targets, 'cached')
+
+
+def test_helper_module_changes_invalidate_stages(tmp_path, monkeypatch):
+    """Editing a local module a stage imports reruns the stage even though its own code is unchanged"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / 'stage_helpers.py').write_text(HELPER.format(scale=1))
+    (tmp_path / 'stage_funcs.py').write_text(HELPER_STAGES)
+    (tmp_path / 'numbers.txt').write_text("1\n2\n3\n")
+
+    assert _run_total(tmp_path, offset=10) == ('ran', 16)
+    assert _run_total(tmp_path, offset=10) == ('cached', 16)
+
+    (tmp_path / 'stage_helpers.py').write_text(HELPER.format(scale=100))
+    assert _run_total(tmp_path, offset=10) == ('ran', 610)
+    assert _run_total(tmp_path, offset=10) == ('cached', 610)
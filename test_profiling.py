@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the stage profiler: nested stage records, Chrome trace and summary table
+"""
+
+import json
+import sys
+import time
+sys.path.append('scripts')
+
+import numpy as np
+
+from profiling import Profiler
+
+
+def test_nested_stages_are_recorded_traced_and_summarized(tmp_path):
+    """An inner stage lies within its outer stage in the records, the trace and the summary"""
+    profiler = Profiler(cprofile_dir=str(tmp_path / 'cprofile'))
+    with profiler.stage('outer', rows=10) as outer:
+        time.sleep(0.02)
+        with profiler.stage('inner') as inner:
+            block = np.ones(1_000_000)
+            time.sleep(0.02)
+            inner['rows'] = len(block)
+    del block
+
+    assert [record['name'] for record in profiler.records] == ['inner', 'outer']
+    assert outer['start'] <= inner['start']
+    assert inner['start'] + inner['seconds'] <= outer['start'] + outer['seconds']
+    assert outer['seconds'] >= inner['seconds'] + 0.02
+    assert inner['rows'] == 1_000_000 and outer['rows'] == 10
+    # The outer stage's peak covers its inner stage, whatever the absolute sizes
+    assert inner['rss_delta_mb'] >= 0 and outer['rss_delta_mb'] >= 0
+    assert outer['peak_rss_mb'] >= inner['peak_rss_mb'] > 0
+    # Only the outermost stage runs under cProfile
+    assert 'cprofile' in outer and 'cprofile' not in inner
+
+    json_path, trace_path = profiler.write(str(tmp_path), prefix='run')
+    with open(json_path, encoding='utf-8') as f:
+        assert [stage['name'] for stage in json.load(f)['stages']] == ['inner', 'outer']
+    with open(trace_path, encoding='utf-8') as f:
+        events = {event['name']: event for event in json.load(f)['traceEvents']}
+    for event in events.values():
+        assert event['ph'] == 'X' and {'pid', 'tid', 'ts', 'dur', 'args'} <= set(event)
+        assert event['ts'] >= 0 and event['dur'] >= 0
+    for name, record in [('inner', inner), ('outer', outer)]:
+        assert np.isclose(events[name]['ts'], (record['start'] - profiler.origin) * 1e6)
+        assert np.isclose(events[name]['dur'], record['seconds'] * 1e6)
+    assert events['outer']['ts'] <= events['inner']['ts']
+    assert events['inner']['ts'] + events['inner']['dur'] <= events['outer']['ts'] + events['outer']['dur']
+    assert events['inner']['args']['rows'] == 1_000_000
+
+    lines = profiler.summary_table().splitlines()
+    assert [line.split()[0] for line in lines[1:]] == ['outer', 'inner', 'total']
+    assert '1,000,000' in lines[2]
+
+
+def test_disabled_profiler_keeps_no_records():
+    """A disabled profiler still times the block but records nothing"""
+    profiler = Profiler(enabled=False)
+    with profiler.stage('quiet') as record:
+        time.sleep(0.01)
+    assert record['seconds'] >= 0.01 and profiler.records == []
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for model persistence, batch scoring and the online scoring API
+"""
+
+import sys
+sys.path.append('scripts')
+
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.testing import bind_unused_port
+
+from data_loader import BANK_MARKETING_PATH, CREDIT_DEFAULT_PATH, TARGET_COL, load_bank_marketing, load_credit_default
+from modeling import (CREDIT_FEATURES, CREDIT_RAW_FEATURES, MARKETING_CATEGORICAL, MARKETING_FEATURES, credit_features,
+                      credit_matrix, load_model, marketing_features, predict_proba, train_credit_model,
+                      train_marketing_model)
+from scoring import score_file
+from scoring_service import feature_matrix, make_app
+
+
+@pytest.fixture(scope='module')
+def credit_bundle(tmp_path_factory):
+    """A small credit model trained and reloaded from disk"""
+    model_path = tmp_path_factory.mktemp('models') / 'credit_model.joblib'
+    train_credit_model(load_credit_default().head(3000), path=str(model_path), max_iter=20)
+    return load_model(model_path)
+
+
+def test_trained_bundle_round_trips_through_joblib(tmp_path):
+    """A saved model bundle reloads with the same predictions, metrics, vocabulary and importances"""
+    bank_marketing = load_bank_marketing()
+    path = tmp_path / 'marketing_model.joblib'
+    bundle = train_marketing_model(bank_marketing, path=str(path), n_estimators=10, n_jobs=1)
+    reloaded = load_model(path)
+    X = marketing_features(bank_marketing, reloaded['categories'])
+    assert reloaded['features'] == MARKETING_FEATURES == list(X.columns)
+    assert np.array_equal(predict_proba(reloaded, X), predict_proba(bundle, X))
+    assert reloaded['metrics'] == bundle['metrics'] and 0.5 < reloaded['metrics']['roc_auc'] <= 1
+    assert reloaded['categories'] == bundle['categories']
+    importance = reloaded['importance']
+    pd.testing.assert_series_equal(importance, bundle['importance'])
+    assert sorted(importance.index) == sorted(MARKETING_FEATURES)
+    assert np.isfinite(importance).all() and importance.is_monotonic_decreasing
+    assert importance.iloc[0] > 0
+
+
+def test_batch_scoring_matches_in_memory(credit_bundle, tmp_path):
+    """Scores streamed in small CSV or Parquet batches equal one in-memory prediction"""
+    bundle = credit_bundle
+    credit_default = load_credit_default()
+    expected = predict_proba(bundle, credit_features(credit_default))
+
+    parquet_path = tmp_path / 'customers.parquet'
+    pd.read_csv(CREDIT_DEFAULT_PATH).to_parquet(parquet_path)
+
+    for input_path, output_name in [(CREDIT_DEFAULT_PATH, 'scores.csv'), (str(parquet_path), 'scores.parquet')]:
+        output_path = tmp_path / output_name
+        stats = score_file(bundle, input_path, str(output_path), batch_size=7_000, log=lambda message: None)
+        scores = pd.read_parquet(output_path) if output_name.endswith('.parquet') else pd.read_csv(output_path)
+
+        assert stats['rows'] == len(credit_default) and stats['batches'] == 5
+        assert (scores['ID'].to_numpy() == credit_default['ID'].to_numpy()).all()
+        assert np.allclose(scores['default_probability'], expected, atol=1e-6)
+        assert set(scores['risk_profile']) <= {'Low Risk', 'Medium Risk', 'High Risk'}
+
+
+def test_scoring_api_micro_batches(credit_bundle):
+    """Concurrent requests are batched and scored like the batch scorer; oversized ones are refused"""
+    customers = pd.read_csv(CREDIT_DEFAULT_PATH, nrows=40).drop(columns=[TARGET_COL])
+    expected = predict_proba(credit_bundle, credit_features(load_credit_default().head(40)))
+
+    async def scenario():
+        sock, port = bind_unused_port()
+        server = HTTPServer(make_app(credit_bundle, max_wait_ms=5, max_request_rows=20))
+        server.add_sockets([sock])
+        client = AsyncHTTPClient()
+        url = f'http://127.0.0.1:{port}'
+        try:
+            responses = await asyncio.gather(*[
+                client.fetch(url + '/score', method='POST', body=json.dumps(row))
+                for row in customers.to_dict(orient='records')
+            ])
+            bad = await client.fetch(url + '/score', method='POST', body='{"AGE": 30}', raise_error=False)
+            too_many = await client.fetch(url + '/score', method='POST', raise_error=False,
+                                          body=json.dumps({'customers': customers.head(21).to_dict(orient='records')}))
+            metrics = json.loads((await client.fetch(url + '/metrics')).body)
+        finally:
+            server.stop()
+        return [json.loads(response.body)['scores'][0] for response in responses], bad, too_many, metrics
+
+    scores, bad, too_many, metrics = asyncio.run(scenario())
+    assert [score['ID'] for score in scores] == customers['ID'].tolist()
+    assert np.allclose([score['default_probability'] for score in scores], expected, atol=1e-5)
+    assert bad.code == 400 and 'LIMIT_BAL' in json.loads(bad.body)['error']
+    assert too_many.code == 413 and 'limit is 20' in json.loads(too_many.body)['error']
+    assert metrics['latency']['requests'] == 42 and metrics['latency']['errors'] == 2
+    assert metrics['batching']['rows'] == 40 and metrics['batching']['batches'] < 40
+    assert metrics['latency']['p99_ms'] >= metrics['latency']['p50_ms'] > 0
+
+
+def test_marketing_encoding_is_one_matrix_with_a_fixed_vocabulary():
+    """Categorical and string columns encode alike, unseen values get -1 and no copy is made"""
+    bank_marketing = load_bank_marketing()
+    X = marketing_features(bank_marketing)
+    matrix = X.to_numpy()
+    assert matrix.dtype == np.float32 and matrix.flags['C_CONTIGUOUS']
+    assert np.shares_memory(matrix, X.to_numpy())
+
+    raw = pd.read_csv(BANK_MARKETING_PATH)
+    vocabulary = {col: sorted(raw[col].unique()) for col in MARKETING_CATEGORICAL}
+    assert np.array_equal(marketing_features(raw, vocabulary).to_numpy(), matrix)
+
+    vocabulary['job'] = [job for job in vocabulary['job'] if job != 'student']
+    codes = marketing_features(raw, vocabulary)['job']
+    assert (codes[raw['job'] == 'student'] == -1).all() and (codes[raw['job'] != 'student'] >= 0).all()
+
+
+def test_credit_matrix_is_compact_and_consistent(tmp_path):
+    """One float32 matrix, equal in memory, on disk and in the scoring service, with the float64 ratios"""
+    credit_default = load_credit_default()
+    X = credit_matrix(credit_default)
+    assert X.dtype == np.float32 and X.flags['C_CONTIGUOUS'] and X.shape == (len(credit_default), len(CREDIT_FEATURES))
+
+    bills = credit_default[['BILL_AMT1', 'BILL_AMT2', 'BILL_AMT3', 'BILL_AMT4', 'BILL_AMT5', 'BILL_AMT6']]
+    utilization = bills.to_numpy('float64').mean(axis=1) / credit_default['LIMIT_BAL'].to_numpy()
+    assert np.allclose(X[:, CREDIT_FEATURES.index('credit_utilization')], utilization, rtol=1e-6)
+
+    path = tmp_path / 'credit_features.npy'
+    credit_matrix(credit_default, path=str(path))
+    assert np.array_equal(np.load(path, mmap_mode='r'), X)
+
+    rows = credit_default[CREDIT_RAW_FEATURES].head(50).to_numpy('float64')
+    assert np.array_equal(feature_matrix(rows), X[:50])
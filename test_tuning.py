@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for the successive halving hyperparameter search and its fold cache
+"""
+
+import sys
+sys.path.append('scripts')
+
+from data_loader import load_credit_default
+from tuning import halving_schedule, successive_halving, write_leaderboard
+
+
+def test_halving_schedule_ends_on_all_rows():
+    """Rungs grow by the factor, stop at a few candidates and never drop below min_rows"""
+    assert halving_schedule(36, 4521, factor=3, min_rows=500) == [503, 1507, 4521]
+    assert halving_schedule(54, 30000, factor=3, min_rows=500) == [1112, 3334, 10000, 30000]
+    assert halving_schedule(2, 30000) == [30000]
+    assert halving_schedule(54, 400, min_rows=500) == [400]
+
+
+def test_search_resumes_from_cached_folds(tmp_path):
+    """A repeated search computes nothing and a widened one only the new candidates' folds"""
+    credit_default = load_credit_default().head(3000)
+    space = {'max_iter': [20], 'learning_rate': [0.05, 0.1], 'max_leaf_nodes': [7, 15]}
+    options = {'folds': 2, 'factor': 2, 'min_rows': 500, 'cache_dir': str(tmp_path / 'cache'),
+               'log': lambda message: None}
+
+    first = successive_halving('credit', credit_default, space, **options)
+    assert first['schedule'] == [750, 1500, 3000]
+    assert first['folds_computed'] == 2 * (4 + 2 + 1) and first['folds_cached'] == 0
+    board = first['leaderboard']
+    assert list(board['rung']) == [3, 2, 1, 1] and board['roc_auc'].iloc[0] == first['best_score']
+
+    again = successive_halving('credit', credit_default, space, **options)
+    assert (again['folds_computed'], again['folds_cached']) == (0, first['folds_computed'])
+    assert again['best_params'] == first['best_params']
+
+    wider = successive_halving('credit', credit_default, {**space, 'learning_rate': [0.05, 0.1, 0.2]}, **options)
+    assert wider['folds_computed'] < first['folds_computed'] + 2 * 2
+
+    paths = write_leaderboard(first, str(tmp_path / 'report'))
+    with open(paths['markdown'], encoding='utf-8') as f:
+        assert f"ROC AUC {first['best_score']:.4f}" in f.read()
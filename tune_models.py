@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter Tuning for the Banking Models
+Searches the marketing propensity and credit default model parameters with
+cross-validated successive halving on a pool of worker processes, writes a
+leaderboard report per model and can retrain the models with the winners.
+Fold scores are cached, so rerunning after an interruption (or with more
+candidates) only computes what is new
+"""
+
+import argparse
+import os
+import sys
+sys.path.append('scripts')
+
+from data_loader import load_bank_marketing, load_credit_default
+from modeling import CREDIT_MODEL_PATH, MARKETING_MODEL_PATH, train_credit_model, train_marketing_model
+from tuning import (CV_FOLDS, HALVING_FACTOR, LEADERBOARD_DIR, MIN_ROWS, SEARCH_SPACES, TUNING_CACHE_DIR,
+                    successive_halving, write_leaderboard)
+
+LOADERS = {'marketing': load_bank_marketing, 'credit': load_credit_default}
+TRAINERS = {'marketing': (train_marketing_model, MARKETING_MODEL_PATH),
+            'credit': (train_credit_model, CREDIT_MODEL_PATH)}
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Tune the banking models with successive halving")
+    parser.add_argument('models', nargs='*', choices=sorted(SEARCH_SPACES), default=sorted(SEARCH_SPACES),
+                        help="models to tune (default: all)")
+    parser.add_argument('--folds', type=int, default=CV_FOLDS, help=f"cross-validation folds (default: {CV_FOLDS})")
+    parser.add_argument('--factor', type=int, default=HALVING_FACTOR,
+                        help=f"keep 1/factor of the candidates per rung, with factor times the rows "
+                             f"(default: {HALVING_FACTOR})")
+    parser.add_argument('--min-rows', type=int, default=MIN_ROWS,
+                        help=f"fewest rows any rung is trained on (default: {MIN_ROWS})")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="worker processes fitting folds (0 = one per CPU)")
+    parser.add_argument('--cache-dir', default=TUNING_CACHE_DIR, help="where fold scores are cached")
+    parser.add_argument('--output-dir', default=LEADERBOARD_DIR, help="where leaderboards are written")
+    parser.add_argument('--refit', action='store_true',
+                        help="retrain each model with its best parameters and save it to models/")
+    return parser.parse_args()
+
+
+def main():
+    """Tune each requested model and write its leaderboard"""
+    args = parse_args()
+    jobs = args.jobs or os.cpu_count()
+    for kind in args.models:
+        try:
+            frame = LOADERS[kind]()
+            result = successive_halving(kind, frame, folds=args.folds, factor=args.factor, min_rows=args.min_rows,
+                                        jobs=jobs, cache_dir=args.cache_dir)
+            paths = write_leaderboard(result, args.output_dir)
+        except Exception as e:
+            print(f"❌ Tuning the {kind} model failed: {e}")
+            return 1
+
+        print(f"✅ {kind}: best ROC AUC {result['best_score']:.4f} with {result['best_params']} "
+              f"({result['folds_computed']} folds computed, {result['folds_cached']} cached, "
+              f"{result['seconds']:.1f}s)")
+        print(f"   📄 {paths['markdown']}")
+
+        if args.refit:
+            train, path = TRAINERS[kind]
+            train(frame, path=path, params=result['best_params'])
+            print(f"   💾 {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())